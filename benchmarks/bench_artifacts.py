@@ -0,0 +1,94 @@
+"""
+Save time, size, load time and resident memory of the model artifact per compression setting.
+
+Each load runs in a fresh interpreter so its RSS is not polluted by the benchmark process;
+with `mmap` the arrays are mapped, not read, and only the pages touched by scoring count.
+
+    python -m benchmarks.bench_artifacts --n_features 200000 --levels 1 3 9
+"""
+from __future__ import annotations
+from src.io_utils import save_model
+import numpy as np
+import subprocess
+import argparse
+import tempfile
+import json
+import sys
+import os
+
+
+_LOAD_SCRIPT = """
+import json, os, sys, time
+import joblib, sklearn.linear_model
+from src.io_utils import load_model
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024**2
+
+before = rss_mb()
+start = time.perf_counter()
+model = load_model(sys.argv[1], mmap_mode = sys.argv[2] or None)
+seconds = time.perf_counter() - start
+print(json.dumps({"load_seconds": seconds, "rss_mb": rss_mb() - before}))
+"""
+
+
+def make_model(n_features: int):
+    """
+    Fits a logistic regression with a wide coefficient matrix, so the artifact is dominated by arrays.
+
+    :param n_features: Number of features
+    :return: Fitted model
+    """
+    from sklearn.linear_model import LogisticRegression
+
+    rng = np.random.default_rng(42)
+    X = rng.normal(size = (64, n_features))
+    y = np.arange(64) % 4
+
+    return LogisticRegression(max_iter = 20).fit(X, y)
+
+
+def measure_load(path: str, mmap_mode: str | None) -> dict:
+    """
+    Loads the artifact in a fresh interpreter.
+
+    :param path: Path to the artifact
+    :param mmap_mode: Memory-map mode passed to `load_model`
+    :return: Dictionary with `load_seconds` and `rss_mb`
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", _LOAD_SCRIPT, path, mmap_mode or ""], cwd = root,
+                         capture_output = True, text = True, check = True)
+
+    return json.loads(out.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark del formato de los artefactos del modelo")
+    parser.add_argument("--n_features", type = int, default = 200_000)
+    parser.add_argument("--levels", type = int, nargs = "+", default = [1, 3, 9])
+    args = parser.parse_args()
+
+    model = make_model(args.n_features)
+    settings = [("none", 0, None), ("none", 0, "r")] + [("zlib", level, None) for level in args.levels]
+    try:
+        import lz4  # noqa: F401
+        settings += [("lz4", level, None) for level in args.levels]
+    except ImportError:
+        print("lz4 no esta instalado; se omite.")
+
+    print(f"{'format':>10} {'mmap':>5} {'size_mb':>8} {'save_s':>7} {'load_s':>7} {'rss_mb':>7}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for compress, level, mmap_mode in settings:
+            path = os.path.join(temp_dir, f"model_{compress}_{level}.joblib")
+            manifest = save_model(model, path, compress = compress, level = level, measure_load = False)
+            load = measure_load(path, mmap_mode)
+            name = compress if compress == "none" else f"{compress}-{level}"
+            print(f"{name:>10} {str(mmap_mode == 'r'):>5} {manifest['size_bytes'] / 1024**2:>8.1f} "
+                  f"{manifest['save_seconds']:>7.3f} {load['load_seconds']:>7.3f} {load['rss_mb']:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Peak traced memory and time of load -> normalize -> remove outliers with float64 frames versus
+the compact dtypes of `load_data(compact=True)`.
+
+    python -m benchmarks.bench_dtypes --sizes 1000000 5000000
+"""
+from __future__ import annotations
+from benchmarks.common import tile_boston
+from src.data import load_data, write_data_cache, fit_normalize, remove_outliers
+import tracemalloc
+import argparse
+import tempfile
+import time
+
+
+def run_pipeline(cache_dir: str, compact: bool, outlier_method: str) -> dict:
+    """
+    Loads the cached dataset, normalizes it and removes outliers under `tracemalloc`.
+
+    :param cache_dir: Dataset cache holding the synthetic dataset
+    :param compact: Use compact dtypes
+    :param outlier_method: Backend of `remove_outliers`
+    :return: Dictionary with `seconds`, `peak_mb` and the feature `frame_mb`
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    X, y = load_data(source = "cache", cache_dir = cache_dir, compact = compact)
+    frame_mb = X.memory_usage(index = False).sum() / 1024**2
+    X_norm, _ = fit_normalize(X)
+    remove_outliers(X_norm, y, method = outlier_method)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {"seconds": seconds, "peak_mb": peak / 1024**2, "frame_mb": frame_mb}
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark de memoria con tipos compactos")
+    parser.add_argument("--sizes", type = int, nargs = "+", default = [1_000_000, 5_000_000])
+    parser.add_argument("--outlier_method", type = str, default = "robust")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'dtypes':>8} {'frame_mb':>9} {'peak_mb':>9} {'seconds':>8} {'saved':>7}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            write_data_cache(tile_boston(n), "sample", cache_dir)
+            wide = run_pipeline(cache_dir, False, args.outlier_method)
+            compact = run_pipeline(cache_dir, True, args.outlier_method)
+        for name, r in (("float64", wide), ("compact", compact)):
+            saved = 1 - r["peak_mb"] / wide["peak_mb"]
+            print(f"{n:>10} {name:>8} {r['frame_mb']:>9.1f} {r['peak_mb']:>9.1f} {r['seconds']:>8.2f} {saved:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
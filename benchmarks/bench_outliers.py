@@ -0,0 +1,36 @@
+"""
+Time and peak traced memory of the `remove_outliers` backends from 500 to 10M rows.
+
+    python -m benchmarks.bench_outliers --sizes 500 10000 100000 1000000 10000000
+"""
+from __future__ import annotations
+from benchmarks.common import tile_boston_xy
+from src.data import normalize_data, remove_outliers, OUTLIER_METHODS
+import numpy as np
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark de los metodos de remove_outliers")
+    parser.add_argument("--sizes", type = int, nargs = "+", default = [500, 10_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--methods", type = str, nargs = "+", default = list(OUTLIER_METHODS))
+    parser.add_argument("--mcd_max_rows", type = int, default = 100_000,
+                        help = "El MCD exacto se omite por encima de este tamano")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'rows':>10} {'method':>14} {'seconds':>9} {'peak_mb':>9} {'removed':>9}")
+    for n in args.sizes:
+        X, y = tile_boston_xy(n)
+        X = normalize_data(X + rng.normal(0, 0.01, size = X.shape))
+        for method in args.methods:
+            if method == "mcd" and n > args.mcd_max_rows:
+                print(f"{n:>10} {method:>14} {'skipped':>9}")
+                continue
+            stats = {}
+            remove_outliers(X, y, contamination = 0.05, method = method, stats = stats)
+            print(f"{n:>10} {method:>14} {stats['seconds']:>9.2f} {stats['peak_memory_mb']:>9.1f} {stats['n_removed']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Time, throughput and peak traced memory of every pipeline stage on synthetic data tiled from
+`data/sample/Boston.csv`, checked against the JSON baseline `benchmarks/baseline.json`.
+
+    python -m benchmarks.bench_pipeline --sizes 1000 100000 10000000
+    python -m benchmarks.bench_pipeline --check              # make bench
+    python -m benchmarks.bench_pipeline --update_baseline    # make bench-baseline
+
+Stages whose cost does not depend on the number of rows (saving and loading the model) only run
+at the smallest size.
+"""
+from __future__ import annotations
+from benchmarks.common import tile_boston
+from src.data import load_data, write_data_cache, fit_normalize, remove_outliers, TARGET
+from src.io_utils import save_model, load_model
+from src.metrics import classification_metrics
+from src.modeling import ModelBuilder, PreprocessedModel
+from src.predict import load_predictor, predict_chunks, iter_chunks
+from typing import Callable, Dict, List
+import contextlib
+import tracemalloc
+import argparse
+import tempfile
+import time
+import json
+import sys
+import os
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SIZES = [1_000, 100_000]
+DEFAULT_TOLERANCE = 0.5
+ROW_INDEPENDENT = ("save_model", "load_model")
+# Regressions smaller than this are timer noise, whatever their relative size
+MIN_SECONDS = 0.005
+MIN_PEAK_MB = 1.0
+
+
+def measure(fn: Callable, repeat: int = 3) -> Dict[str, float]:
+    """
+    Times `fn` (best of `repeat` runs) and measures its peak traced memory in one extra run.
+
+    :param fn: Stage to measure, called without arguments
+    :param repeat: Number of timed runs
+    :return: Dictionary with `seconds` and `peak_mb`
+    """
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        seconds = min(seconds, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": seconds, "peak_mb": peak / 1024**2}
+
+
+def stage_runners(n_rows: int, work_dir: str, outlier_method: str) -> Dict[str, Callable]:
+    """
+    Prepares the inputs of every stage for `n_rows` rows and returns one callable per stage.
+
+    :param n_rows: Number of rows of the synthetic dataset
+    :param work_dir: Scratch directory for the cache, the model and the prediction files
+    :param outlier_method: Backend of `remove_outliers`
+    :return: Dictionary stage name -> callable
+    """
+    df = tile_boston(n_rows)
+    cache_dir = os.path.join(work_dir, "cache")
+    write_data_cache(df, "sample", cache_dir)
+    X, y = load_data(source = "cache", cache_dir = cache_dir)
+    X_norm, scaler = fit_normalize(X)
+    builder = ModelBuilder(random_state = 42, params = {"max_iter": 1000, "solver": "liblinear"})
+    builder.train_model(X_norm.to_numpy(), y.to_numpy())
+    y_pred = builder.predict(X_norm.to_numpy())
+
+    model_path = os.path.join(work_dir, "model.joblib")
+    save_model(PreprocessedModel(builder.model, scaler), model_path, measure_load = False)
+    samples_csv = os.path.join(work_dir, "samples.csv")
+    df.drop(columns = [TARGET]).to_csv(samples_csv, index = False)
+    output_csv = os.path.join(work_dir, "predictions.csv")
+
+    def predict_end_to_end():
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            predict_chunks(load_predictor(model_path), iter_chunks(samples_csv, 100_000), output_csv)
+
+    return {
+        "load_data": lambda: load_data(source = "cache", cache_dir = cache_dir),
+        "normalize_data": lambda: fit_normalize(X),
+        "remove_outliers": lambda: remove_outliers(X_norm, y, method = outlier_method),
+        "train_model": lambda: ModelBuilder(random_state = 42, params = {"max_iter": 1000, "solver": "liblinear"})
+                                   .train_model(X_norm.to_numpy(), y.to_numpy()),
+        "predict": lambda: builder.predict(X_norm.to_numpy()),
+        "classification_metrics": lambda: classification_metrics(y.to_numpy(), y_pred),
+        "save_model": lambda: save_model(builder.model, os.path.join(work_dir, "bench.joblib"), measure_load = False),
+        "load_model": lambda: load_model(model_path),
+        "predict_end_to_end": predict_end_to_end,
+    }
+
+
+def run_suite(sizes: List[int], outlier_method: str = "robust", repeat: int = 3) -> Dict[str, Dict[str, float]]:
+    """
+    Measures every stage at every size.
+
+    :param sizes: Numbers of rows
+    :param outlier_method: Backend of `remove_outliers`
+    :param repeat: Number of timed runs per stage
+    :return: Dictionary `<stage>@<rows>` -> seconds, rows_per_s and peak_mb
+    """
+    results = {}
+    for i, n_rows in enumerate(sorted(sizes)):
+        with tempfile.TemporaryDirectory() as work_dir:
+            for stage, fn in stage_runners(n_rows, work_dir, outlier_method).items():
+                if stage in ROW_INDEPENDENT and i > 0:
+                    continue
+                result = measure(fn, repeat = repeat)
+                result["rows_per_s"] = n_rows / max(result["seconds"], 1e-9)
+                results[f"{stage}@{n_rows}"] = result
+                print(f"{stage:>24} {n_rows:>10} {result['seconds']:>9.4f} {result['rows_per_s']:>12.0f} "
+                      f"{result['peak_mb']:>9.1f}", flush = True)
+
+    return results
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                        tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Lists the stages that got slower or use more memory than the baseline beyond `tolerance`.
+
+    Stages missing from the baseline are not checked.
+
+    :param results: Results of `run_suite`
+    :param baseline: Results stored as baseline
+    :param tolerance: Allowed relative increase, e.g. 0.5 for +50%
+    :return: List of regressions; empty if every stage is within tolerance
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        if result["seconds"] > base["seconds"] * (1 + tolerance) and result["seconds"] - base["seconds"] > MIN_SECONDS:
+            regressions.append(f"{name}: {result['seconds']:.4f} s > {base['seconds']:.4f} s")
+        if result["peak_mb"] > base["peak_mb"] * (1 + tolerance) and result["peak_mb"] - base["peak_mb"] > MIN_PEAK_MB:
+            regressions.append(f"{name}: {result['peak_mb']:.1f} MB > {base['peak_mb']:.1f} MB")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark de las etapas del pipeline")
+    parser.add_argument("--sizes", type = int, nargs = "+", default = None)
+    parser.add_argument("--outlier_method", type = str, default = "robust")
+    parser.add_argument("--repeat", type = int, default = 3)
+    parser.add_argument("--baseline", type = str, default = BASELINE_PATH)
+    parser.add_argument("--tolerance", type = float, default = None,
+                        help = "Aumento relativo permitido; por defecto el de la linea base")
+    parser.add_argument("--check", action = "store_true", help = "Falla si alguna etapa empeora respecto a la linea base")
+    parser.add_argument("--update_baseline", action = "store_true", help = "Guarda los resultados como linea base")
+    args = parser.parse_args()
+
+    stored = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding = "utf-8") as f:
+            stored = json.load(f)
+    sizes = args.sizes or stored.get("sizes", DEFAULT_SIZES)
+    tolerance = args.tolerance if args.tolerance is not None else stored.get("tolerance", DEFAULT_TOLERANCE)
+
+    print(f"{'stage':>24} {'rows':>10} {'seconds':>9} {'rows_per_s':>12} {'peak_mb':>9}")
+    results = run_suite(sizes, outlier_method = args.outlier_method, repeat = args.repeat)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding = "utf-8") as f:
+            json.dump({"sizes": sorted(sizes), "tolerance": tolerance, "results": results}, f, indent = 2)
+        print(f"Linea base guardada en {args.baseline}")
+
+    if args.check:
+        regressions = compare_to_baseline(results, stored.get("results", {}), tolerance)
+        for r in regressions:
+            print(f"REGRESION: {r}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
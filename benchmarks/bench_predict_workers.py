@@ -0,0 +1,56 @@
+"""
+Throughput of `src.predict` parallel scoring from 1 to N worker processes.
+
+    python -m benchmarks.bench_predict_workers --rows 2000000 --max_workers 8
+"""
+from __future__ import annotations
+from benchmarks.common import tile_boston_xy, fit_sample_model
+from src.predict import predict_chunks, predict_parallel, iter_chunks
+from src.io_utils import save_model
+from contextlib import redirect_stdout
+import argparse
+import tempfile
+import time
+import io
+import os
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark de inferencia en paralelo")
+    parser.add_argument("--rows", type = int, default = 1_000_000)
+    parser.add_argument("--chunksize", type = int, default = 50_000)
+    parser.add_argument("--max_workers", type = int, default = os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model = fit_sample_model()
+        model_path = os.path.join(temp_dir, "model.joblib")
+        save_model(model, model_path)
+
+        X, _ = tile_boston_xy(args.rows)
+        samples_path = os.path.join(temp_dir, "samples.csv")
+        X.to_csv(samples_path, index = False)
+        output_path = os.path.join(temp_dir, "predictions.csv")
+
+        workers = [1]
+        while workers[-1] * 2 <= args.max_workers:
+            workers.append(workers[-1] * 2)
+        if workers[-1] != args.max_workers:
+            workers.append(args.max_workers)
+
+        print(f"{'workers':>8} {'seconds':>9} {'rows/s':>12} {'speedup':>8}")
+        base = None
+        for n in workers:
+            start = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                if n == 1:
+                    predict_chunks(model, iter_chunks(samples_path, args.chunksize), output_path)
+                else:
+                    predict_parallel(model_path, samples_path, output_path, args.chunksize, n)
+            elapsed = time.perf_counter() - start
+            base = base or elapsed
+            print(f"{n:>8} {elapsed:>9.2f} {args.rows / elapsed:>12.0f} {base / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Write throughput and file size of the prediction output formats (CSV, Parquet, Arrow IPC, `.npy`)
+for a streamed table of row ids, predictions and class probabilities.
+
+    python -m benchmarks.bench_prediction_output --rows 1000000 10000000 --chunksize 100000
+"""
+from __future__ import annotations
+from src.io_utils import PredictionWriter, prediction_frame, PREDICTION_FORMATS, PREDICTION_EXTENSIONS
+import numpy as np
+import argparse
+import tempfile
+import time
+import os
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark de los formatos de salida de predicciones")
+    parser.add_argument("--rows", type = int, nargs = "+", default = [1_000_000, 10_000_000])
+    parser.add_argument("--chunksize", type = int, default = 100_000)
+    parser.add_argument("--formats", type = str, nargs = "+", default = list(PREDICTION_FORMATS))
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    positive = rng.random(args.chunksize)
+    proba = np.column_stack([1 - positive, positive])
+    preds = (positive > 0.5).astype(np.int64)
+
+    print(f"{'rows':>10} {'format':>8} {'seconds':>8} {'rows_per_s':>12} {'size_mb':>8}")
+    for n_rows in args.rows:
+        for output_format in args.formats:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                path = os.path.join(temp_dir, "predictions" + PREDICTION_EXTENSIONS[output_format])
+                start = time.perf_counter()
+                with PredictionWriter(path, output_format) as writer:
+                    for first in range(0, n_rows, args.chunksize):
+                        size = min(args.chunksize, n_rows - first)
+                        writer.write(prediction_frame(preds[:size], proba[:size], [0, 1],
+                                                      np.arange(first, first + size)))
+                seconds = time.perf_counter() - start
+                size_mb = os.path.getsize(path) / 1024**2
+            print(f"{n_rows:>10} {output_format:>8} {seconds:>8.2f} {n_rows / seconds:>12.0f} {size_mb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
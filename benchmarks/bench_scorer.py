@@ -0,0 +1,39 @@
+"""
+Per-call latency of the sklearn artifact versus the exported NumPy scorer across batch sizes.
+
+    python -m benchmarks.bench_scorer --batch_sizes 1 10 100 1000 10000
+"""
+from __future__ import annotations
+from benchmarks.common import tile_boston_xy
+from src.data import FittedScaler
+from src.modeling import ModelBuilder, PreprocessedModel
+from src.scorer import LinearScorer
+import argparse
+import timeit
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark del scorer NumPy frente a sklearn")
+    parser.add_argument("--batch_sizes", type = int, nargs = "+", default = [1, 10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type = int, default = 200)
+    args = parser.parse_args()
+
+    X, y = tile_boston_xy(max(args.batch_sizes))
+    scaler = FittedScaler.fit(X)
+    builder = ModelBuilder(random_state = 42, params = {"max_iter": 1000, "solver": "liblinear"})
+    builder.train_model(scaler.transform(X), y.to_numpy())
+    artifact = PreprocessedModel(builder.model, scaler)
+    scorer = LinearScorer.from_model(artifact)
+
+    print(f"{'batch':>7} {'sklearn_us':>11} {'numpy_us':>10} {'speedup':>8}")
+    for n in args.batch_sizes:
+        frame = X.iloc[:n]
+        array = frame[scorer.feature_names].to_numpy()
+        repeat = max(args.repeat * 100 // max(n, 100), 5)
+        sk = min(timeit.repeat(lambda: artifact.predict_proba(frame), number = repeat, repeat = 3)) / repeat
+        fast = min(timeit.repeat(lambda: scorer.predict_proba(array), number = repeat, repeat = 3)) / repeat
+        print(f"{n:>7} {sk * 1e6:>11.1f} {fast * 1e6:>10.1f} {sk / fast:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Import-time profile of the CLI entry points (`python -X importtime`) checked against
+`benchmarks/startup_budget.json`.
+
+    python -m benchmarks.bench_startup
+"""
+from __future__ import annotations
+from typing import Dict, List, Tuple
+import subprocess
+import argparse
+import json
+import sys
+import os
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(ROOT_DIR, "benchmarks", "startup_budget.json")
+
+
+def import_profile(module: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Imports `module` in a fresh interpreter with `-X importtime`.
+
+    :param module: Dotted module name
+    :return: Tuple of the module's cumulative import time (ms) and the cumulative time of every imported module (ms)
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd = ROOT_DIR,
+                            capture_output = True, text = True, check = True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative) / 1000
+
+    return modules[module], modules
+
+
+def check_budget(budget_path: str = BUDGET_PATH) -> List[str]:
+    """
+    Checks every entry point against its time budget and forbidden imports.
+
+    :param budget_path: Path to the JSON budget
+    :return: List of violations; empty if every entry point is within budget
+    """
+    with open(budget_path, "r", encoding = "utf-8") as f:
+        budget = json.load(f)
+
+    violations = []
+    for module, limits in budget.items():
+        total_ms, modules = import_profile(module)
+        if total_ms > limits["max_ms"]:
+            violations.append(f"{module}: {total_ms:.0f} ms > {limits['max_ms']} ms")
+        for name in limits.get("forbidden", []):
+            if name in modules:
+                violations.append(f"{module}: importa {name}")
+
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Tiempo de arranque de los puntos de entrada")
+    parser.add_argument("--top", type = int, default = 10)
+    args = parser.parse_args()
+
+    with open(BUDGET_PATH, "r", encoding = "utf-8") as f:
+        budget = json.load(f)
+    for module, limits in budget.items():
+        total_ms, modules = import_profile(module)
+        print(f"\n{module}: {total_ms:.0f} ms (presupuesto {limits['max_ms']} ms)")
+        for name, ms in sorted(modules.items(), key = lambda kv: -kv[1])[:args.top]:
+            print(f"  {ms:>8.1f} ms  {name}")
+
+    violations = check_budget()
+    for v in violations:
+        print(f"FUERA DE PRESUPUESTO: {v}")
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
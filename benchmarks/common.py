@@ -0,0 +1,43 @@
+from __future__ import annotations
+from sklearn.linear_model import LogisticRegression
+from src.data import SAMPLE_CSV, TARGET, _read_sample_csv
+import pandas as pd
+import numpy as np
+
+
+def tile_boston(n_rows: int) -> pd.DataFrame:
+    """
+    Builds a synthetic dataset of `n_rows` rows by tiling `data/sample/Boston.csv`.
+
+    :param n_rows: Number of rows of the synthetic dataset
+    :return: DataFrame with the features and the `MEDV` target
+    """
+    df = _read_sample_csv(SAMPLE_CSV)
+    reps = int(np.ceil(n_rows / len(df)))
+    tiled = pd.DataFrame({c: np.tile(df[c].to_numpy(), reps)[:n_rows] for c in df.columns})
+
+    return tiled
+
+
+def tile_boston_xy(n_rows: int):
+    """
+    Same as `tile_boston` but split into features and the binary target used in training.
+
+    :param n_rows: Number of rows of the synthetic dataset
+    :return: Tuple of features (X) and target (y)
+    """
+    df = tile_boston(n_rows)
+    y = (df[TARGET] > df[TARGET].median()).astype(int)
+
+    return df.drop(columns = [TARGET]), y
+
+
+def fit_sample_model() -> LogisticRegression:
+    """
+    Fits the default classifier on the bundled sample, enough to exercise the inference path.
+
+    :return: Fitted model
+    """
+    X, y = tile_boston_xy(506)
+
+    return LogisticRegression(max_iter = 1000, solver = "liblinear").fit(X, y)
@@ -1,29 +1,258 @@
 from __future__ import annotations
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from sklearn.covariance import EllipticEnvelope
-from sklearn.datasets import fetch_openml
-from typing import Tuple
+from src.io_utils import save_columns, load_columns
+from typing import Iterator, Sequence, Tuple
 import pandas as pd
+import numpy as np
+import tracemalloc
 import warnings
+import shutil
+import glob
+import time
+import os
 
 
-def load_data() -> Tuple[pd.DataFrame, pd.Series]:
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_CSV = os.path.join(ROOT_DIR, "data", "sample", "Boston.csv")
+CACHE_DIR = os.path.join(ROOT_DIR, "data", "cache")
+DATA_SOURCES = ("auto", "cache", "openml", "csv")
+OUTLIER_METHODS = ("mcd", "mcd_subsample", "robust")
+DATASET_NAME = "boston"
+OPENML_VERSION = 1
+TARGET = "MEDV"
+
+
+def _fetch_openml_frame() -> pd.DataFrame:
+    """
+    Downloads Boston Housing from OpenML as a numeric DataFrame including the `MEDV` target.
+
+    :return: DataFrame with the features and the regression target
+    """
+    from sklearn.datasets import fetch_openml
+
+    boston = fetch_openml(name = DATASET_NAME, version = OPENML_VERSION, as_frame = True)
+    df = boston.data.apply(lambda col: pd.to_numeric(col.astype(str)) if col.dtype.name == "category" else col)
+    df[TARGET] = boston.target.astype(float)
+
+    return df
+
+
+def _read_sample_csv(path: str = SAMPLE_CSV) -> pd.DataFrame:
+    """
+    Reads the bundled Boston Housing sample, upper-casing its headers to match OpenML.
+
+    :param path: Path to the CSV file
+    :return: DataFrame with the features and the regression target
+    """
+    df = pd.read_csv(path, index_col = 0)
+    df.columns = [c.upper() for c in df.columns]
+
+    return df.reset_index(drop = True)
+
+
+def _find_cached(cache_dir: str, version) -> str | None:
+    """
+    Finds the most recent cache entry for the given dataset version.
+
+    :param cache_dir: Directory holding the cache entries
+    :param version: Dataset version label
+    :return: Path to the cache entry, or None if there is none
+    """
+    entries = glob.glob(os.path.join(cache_dir, f"{DATASET_NAME}-v{version}-*", "columns.json"))
+    if not entries:
+        return None
+
+    return os.path.dirname(max(entries, key = os.path.getmtime))
+
+
+def write_data_cache(df: pd.DataFrame, version, cache_dir: str = CACHE_DIR) -> str:
+    """
+    Stores a parsed dataset in the columnar cache under `<name>-v<version>-<content hash>`.
+
+    :param df: DataFrame with the features and the regression target
+    :param version: Dataset version label
+    :param cache_dir: Directory holding the cache entries
+    :return: Path to the cache entry
+    """
+    tmp_dir = os.path.join(cache_dir, f".tmp-{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors = True)
+    digest = save_columns(df, tmp_dir)
+    path = os.path.join(cache_dir, f"{DATASET_NAME}-v{version}-{digest[:12]}")
+    if os.path.exists(path):
+        shutil.rmtree(tmp_dir)
+        os.utime(os.path.join(path, "columns.json"))
+    else:
+        os.replace(tmp_dir, path)
+
+    return path
+
+
+def clear_data_cache(cache_dir: str = CACHE_DIR, version = None) -> int:
+    """
+    Invalidates the dataset cache.
+
+    :param cache_dir: Directory holding the cache entries
+    :param version: Only remove entries of this version; if None, removes all of them
+    :return: Number of removed entries
+    """
+    pattern = f"{DATASET_NAME}-v{'*' if version is None else version}-*"
+    entries = glob.glob(os.path.join(cache_dir, pattern))
+    for path in entries:
+        shutil.rmtree(path, ignore_errors = True)
+
+    return len(entries)
+
+
+def optimize_dtypes(df: pd.DataFrame, float_dtype = np.float32, rtol: float = 1e-6,
+                    exclude: Sequence[str] = (TARGET,)) -> pd.DataFrame:
+    """
+    Stores every column in the narrowest dtype that keeps its values.
+
+    Integer-valued columns (e.g. `CHAS`, `RAD`, `TAX`) become the smallest integer type that fits
+    them; other float columns become `float_dtype` when the round trip stays within `rtol`.
+
+    :param df: DataFrame to compact
+    :param float_dtype: Target type for non-integer columns
+    :param rtol: Largest relative error accepted when downcasting floats
+    :param exclude: Columns left untouched
+    :return: DataFrame with compact dtypes
+    """
+    columns = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if col in exclude or not np.issubdtype(values.dtype, np.number):
+            columns[col] = values
+        elif np.issubdtype(values.dtype, np.integer) or (np.isfinite(values).all() and (values == np.round(values)).all()):
+            columns[col] = pd.to_numeric(values.astype(np.int64), downcast = "integer")
+        else:
+            narrow = values.astype(float_dtype)
+            close = np.allclose(narrow, values, rtol = rtol, atol = 0, equal_nan = True)
+            columns[col] = narrow if close else values
+
+    return pd.DataFrame(columns, index = df.index, copy = False)
+
+
+def load_data(source: str = "auto", cache_dir: str = CACHE_DIR, refresh: bool = False,
+              compact: bool = False) -> Tuple[pd.DataFrame, pd.Series]:
     """
     Loads Boston Housing as a binary classification problem: 1 if MEDV > median, 0 otherwise.
 
-    :param seed: random seed for reproducibility
+    With `source="auto"` the local cache is tried first, then OpenML and finally the bundled
+    `data/sample/Boston.csv`; whatever is parsed is stored in the cache so later loads are
+    memory-mapped reads.
+
+    :param source: One of "auto", "cache", "openml" or "csv"
+    :param cache_dir: Directory holding the columnar dataset cache
+    :param refresh: Drop the cached entries and parse the dataset again
+    :param compact: Return the features with the dtypes chosen by `optimize_dtypes`
     :return: Tuple of features (X) and target (y)
+    :raises ValueError: If the source is unknown
     :raises RuntimeError: If the dataset cannot be loaded
     """
-    try:    
-        boston = fetch_openml(name="boston", version=1, as_frame=True)
-        X = boston.data
-        y_reg = boston.target.astype(float)
-        y = (y_reg > y_reg.median()).astype(int)
-        return X, y
-    except Exception as e:
-        raise RuntimeError("No se pudo cargar Boston Housing desde OpenML.") from e
+    if source not in DATA_SOURCES:
+        raise ValueError(f"Fuente de datos desconocida: {source}. Opciones: {DATA_SOURCES}")
+
+    if refresh:
+        clear_data_cache(cache_dir)
+
+    df = None
+    if source in ("auto", "cache"):
+        for version in (OPENML_VERSION, "sample"):
+            path = _find_cached(cache_dir, version)
+            if path is not None:
+                df = load_columns(path)
+                break
+        if df is None and source == "cache":
+            raise RuntimeError(f"No hay una copia de Boston Housing en la cache {cache_dir}.")
+
+    if df is None and source in ("auto", "openml"):
+        try:
+            df = _fetch_openml_frame()
+            write_data_cache(df, OPENML_VERSION, cache_dir)
+        except Exception as e:
+            if source == "openml":
+                raise RuntimeError("No se pudo cargar Boston Housing desde OpenML.") from e
+            warnings.warn(f"OpenML no disponible ({e}); se usa {SAMPLE_CSV}.")
+
+    if df is None:
+        try:
+            df = _read_sample_csv()
+            write_data_cache(df, "sample", cache_dir)
+        except Exception as e:
+            raise RuntimeError(f"No se pudo cargar Boston Housing desde {SAMPLE_CSV}.") from e
+
+    X = df.drop(columns = [TARGET])
+    if compact:
+        X = optimize_dtypes(X)
+    y_reg = df[TARGET].astype(float)
+    y = (y_reg > y_reg.median()).astype(np.int8 if compact else int)
+
+    return X, y
+
+
+def iter_csv_chunks(path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Streams a Boston-style CSV from disk in chunks, upper-casing headers and dropping unnamed index columns.
+
+    The index of each chunk is the global row number.
+
+    :param path: Path to the CSV file
+    :param chunksize: Number of rows per chunk
+    :return: Iterator over the chunks
+    """
+    with pd.read_csv(path, chunksize = chunksize) as reader:
+        for chunk in reader:
+            chunk.columns = [str(c).upper() for c in chunk.columns]
+            yield chunk.drop(columns = [c for c in chunk.columns if c.startswith("UNNAMED")])
+
+
+def streaming_target_threshold(path: str, chunksize: int, max_samples: int = 100_000, seed: int = 42) -> float:
+    """
+    Median of `MEDV` over a streamed file, using a bounded reservoir sample (exact up to `max_samples` rows).
+
+    :param path: Path to the CSV file
+    :param chunksize: Number of rows per chunk
+    :param max_samples: Size of the reservoir
+    :param seed: Random seed for the reservoir
+    :return: Threshold used to binarize the target
+    """
+    rng = np.random.default_rng(seed)
+    reservoir = np.empty(max_samples)
+    seen = 0
+    for chunk in iter_csv_chunks(path, chunksize):
+        values = chunk[TARGET].to_numpy(dtype = np.float64)
+        n_fill = min(max(max_samples - seen, 0), len(values))
+        reservoir[seen:seen + n_fill] = values[:n_fill]
+        rest = values[n_fill:]
+        if len(rest):
+            slots = rng.integers(0, np.arange(seen + n_fill, seen + len(values)) + 1)
+            keep = slots < max_samples
+            reservoir[slots[keep]] = rest[keep]
+        seen += len(values)
+
+    return float(np.median(reservoir[:min(seen, max_samples)]))
+
+
+def iter_xy_chunks(path: str, chunksize: int, threshold: float, split: str = "train",
+                   test_size: float = 0.2) -> Iterator[Tuple[pd.DataFrame, pd.Series]]:
+    """
+    Streams (features, binary target) chunks of one split of a file.
+
+    Rows are assigned to the test split by position (every `round(1 / test_size)`-th row), so
+    both splits can be streamed independently and deterministically.
+
+    :param path: Path to the CSV file
+    :param chunksize: Number of rows per chunk
+    :param threshold: `MEDV` value above which the target is 1
+    :param split: "train" or "test"
+    :param test_size: Approximate proportion of the test split
+    :return: Iterator of (X, y) chunks
+    """
+    every = max(int(round(1 / test_size)), 2)
+    for chunk in iter_csv_chunks(path, chunksize):
+        in_test = chunk.index.to_numpy() % every == 0
+        chunk = chunk[in_test if split == "test" else ~in_test]
+        if len(chunk):
+            yield chunk.drop(columns = [TARGET]), (chunk[TARGET] > threshold).astype(int)
 
 
 def train_test_split_xy(X: pd.DataFrame, y: pd.Series, test_size: float = 0.2, seed: int = 42):
@@ -36,40 +265,210 @@ def train_test_split_xy(X: pd.DataFrame, y: pd.Series, test_size: float = 0.2, s
     :param seed: Random seed for reproducibility
     :return: Tuple of X_train, X_test, y_train, y_test
     """
+    from sklearn.model_selection import train_test_split
+
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size = test_size, random_state = seed, shuffle = True)
 
     return X_train, X_test, y_train, y_test
 
 
-def normalize_data(X: pd.DataFrame) -> pd.DataFrame:
+class FittedScaler:
+    """
+    Standardization fitted once and applied as a single vectorized NumPy pass.
+
+    Keeps the fitted `mean_`/`scale_` as contiguous arrays in a fixed feature order, so
+    transforming a batch costs one column selection, one copy and two in-place operations.
+    """
+    def __init__(self, feature_names: Sequence[str], mean: np.ndarray, scale: np.ndarray):
+        self.feature_names = [str(c) for c in feature_names]
+        self.mean_ = np.ascontiguousarray(mean, dtype = np.float64)
+        self.scale_ = np.ascontiguousarray(scale, dtype = np.float64)
+
+
+    @classmethod
+    def fit(cls, X: pd.DataFrame) -> "FittedScaler":
+        """"
+        Fits the Standard Scaler on the given data.
+
+        Statistics are accumulated in float64 one column at a time, so compact frames are never
+        widened to a full float64 copy. Constant columns get a scale of 1, as in `StandardScaler`.
+
+        :param X: Data used to compute the mean and scale, usually the training split
+        :return: Fitted scaler
+        """
+        mean = np.empty(X.shape[1])
+        scale = np.empty(X.shape[1])
+        for i, col in enumerate(X.columns):
+            values = X[col].to_numpy(dtype = np.float64)
+            mean[i] = values.mean()
+            scale[i] = values.std()
+        scale[scale < 10 * np.finfo(np.float64).eps * np.maximum(np.abs(mean), 1.0)] = 1.0
+
+        return cls(X.columns, mean, scale)
+
+
+    def transform(self, X, dtype = np.float64) -> np.ndarray:
+        """"
+        Standardizes a batch into one new contiguous buffer, scaled in place.
+
+        :param X: DataFrame containing at least `feature_names`, or an array already in that column order
+        :param dtype: Floating point type of the result
+        :return: Standardized array
+        :raises ValueError: If the number of features does not match
+        """
+        if isinstance(X, pd.DataFrame):
+            values = X[self.feature_names].to_numpy(dtype = dtype, copy = True)
+        else:
+            values = np.array(X, dtype = dtype, ndmin = 2)
+            if values.shape[1] != len(self.feature_names):
+                raise ValueError(f"Se esperaban {len(self.feature_names)} variables y llegaron {values.shape[1]}.")
+        values -= self.mean_
+        values /= self.scale_
+
+        return values
+
+
+def normalize_data(X: pd.DataFrame, scaler: FittedScaler | None = None) -> pd.DataFrame:
     """"
     Normalizes data using the Standard Scaler.
 
+    The result keeps float32 precision when every input column fits in float32 (see
+    `optimize_dtypes`) and wraps the scaled buffer without copying it.
+
     :param X: Data to be normalized
+    :param scaler: Already fitted scaler; if None, a new one is fitted on X
     :return X_norm: Normalized data
     """
+    scaler = scaler or FittedScaler.fit(X)
+    X_norm = pd.DataFrame(scaler.transform(X, dtype = _float_dtype(X)), columns = scaler.feature_names, index = X.index,
+                          copy = False)
+
+    return X_norm
+
+
+def _float_dtype(X: pd.DataFrame) -> np.dtype:
+    """
+    float32 if every column is float32 or a small integer, float64 otherwise.
+    """
+    small = all(dt == np.float32 or (np.issubdtype(dt, np.integer) and dt.itemsize <= 2) for dt in X.dtypes)
+
+    return np.dtype(np.float32 if small else np.float64)
+
+
+def fit_normalize(X: pd.DataFrame) -> Tuple[pd.DataFrame, FittedScaler]:
+    """"
+    Fits the Standard Scaler on X and normalizes it.
+
+    :param X: Data to be normalized, usually the training split
+    :return: Tuple of normalized data and the fitted scaler
+    """
+    scaler = FittedScaler.fit(X)
+
+    return normalize_data(X, scaler), scaler
+
+
+def _robust_scores(values: np.ndarray, sample: np.ndarray, chunksize: int) -> np.ndarray:
+    """
+    Computes each row's largest robust z-score, |x - median| / (IQR / 1.349), chunk by chunk.
+
+    :param values: Feature matrix
+    :param sample: Rows used to estimate the per-feature median and IQR
+    :param chunksize: Number of rows scored at a time
+    :return: Array with one score per row
+    """
+    median = np.median(sample, axis = 0)
+    q1, q3 = np.percentile(sample, [25, 75], axis = 0)
+    scale = (q3 - q1) / 1.349
+    scale = np.where(scale > 0, scale, sample.std(axis = 0))
+    scale = np.where(scale > 0, scale, 1.0)
 
-    scaler = StandardScaler()
-    X_norm = scaler.fit_transform(X)
-    X_norm = pd.DataFrame(X_norm, columns = X.columns, index = X.index)
-    
-    return X_norm 
+    scores = np.empty(len(values))
+    for start in range(0, len(values), chunksize):
+        chunk = np.abs(values[start:start + chunksize] - median)
+        chunk /= scale
+        scores[start:start + chunksize] = chunk.max(axis = 1)
 
+    return scores
 
-def remove_outliers(X: pd.DataFrame, y: pd.Series, contamination: float = 0.05) -> Tuple[pd.DataFrame, pd.Series]:
+
+def _outlier_mask(values: np.ndarray, contamination: float, method: str, max_samples: int, chunksize: int,
+                  seed: int) -> np.ndarray:
+    """
+    Flags the rows to keep with the selected backend.
+
+    :param values: Feature matrix
+    :param contamination: Proportion of outliers in the data
+    :param method: One of `OUTLIER_METHODS`
+    :param max_samples: Rows used to fit the MCD in "mcd_subsample" and the median/IQR in "robust"
+    :param chunksize: Number of rows scored at a time in "mcd_subsample" and "robust"
+    :param seed: Random seed for the MCD and the subsample
+    :return: Boolean mask, True for inliers
+    """
+    if method == "mcd":
+        from sklearn.covariance import EllipticEnvelope
+        return EllipticEnvelope(contamination = contamination, random_state = seed).fit_predict(values) != -1
+
+    rng = np.random.default_rng(seed)
+    sample = values if len(values) <= max_samples else values[rng.choice(len(values), max_samples, replace = False)]
+    if method == "robust":
+        scores = _robust_scores(values, sample, chunksize)
+        return scores <= np.quantile(scores, 1 - contamination)
+
+    from sklearn.covariance import EllipticEnvelope
+    ee = EllipticEnvelope(contamination = contamination, random_state = seed).fit(sample)
+    mask = np.empty(len(values), dtype = bool)
+    for start in range(0, len(values), chunksize):
+        mask[start:start + chunksize] = ee.predict(values[start:start + chunksize]) != -1
+
+    return mask
+
+
+def remove_outliers(X: pd.DataFrame, y: pd.Series, contamination: float = 0.05, method: str = "mcd",
+                    max_samples: int = 10_000, chunksize: int = 100_000, seed: int = 42,
+                    stats: dict | None = None) -> Tuple[pd.DataFrame, pd.Series]:
     """
     Removes outliers from the dataset using the Elliptic Envelope method.
 
+    Backends:
+    - "mcd": exact Minimum Covariance Determinant fitted on every row.
+    - "mcd_subsample": MCD fitted on at most `max_samples` random rows, then applied to all rows in chunks.
+    - "robust": per-feature median/IQR z-scores (estimated on at most `max_samples` rows); the
+      `contamination` share of rows with the largest score is removed.
+
     :param X: Features DataFrame
     :param y: Target Series
+    :param contamination: Proportion of outliers in the data
+    :param method: Outlier detection backend
+    :param max_samples: Rows used to fit the MCD in "mcd_subsample" and the median/IQR in "robust"
+    :param chunksize: Number of rows scored at a time
+    :param seed: Random seed for reproducibility
+    :param stats: If given, filled with the backend's time (s) and peak traced memory (MB)
     :return: Tuple of cleaned features (X_clean) and target (y_clean)
+    :raises ValueError: If the method is unknown
     """
+    if method not in OUTLIER_METHODS:
+        raise ValueError(f"Metodo de outliers desconocido: {method}. Opciones: {OUTLIER_METHODS}")
 
-    ee = EllipticEnvelope(contamination = contamination, random_state = 42)
-    preds = ee.fit_predict(X)
-    
-    mask = preds != -1
+    tracing = stats is not None and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    if stats is not None:
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+
+    # A view, not a copy, when X is a single float block (e.g. the output of `normalize_data`)
+    values = X.to_numpy(dtype = _float_dtype(X))
+    mask = _outlier_mask(values, contamination, method, max_samples, chunksize, seed)
     X_clean = X[mask]
     y_clean = y[mask]
-    
-    return X_clean, y_clean
\ No newline at end of file
+
+    if stats is not None:
+        stats.update({"method": method,
+                      "seconds": time.perf_counter() - start,
+                      "peak_memory_mb": tracemalloc.get_traced_memory()[1] / 2**20,
+                      "n_rows": int(len(X)),
+                      "n_removed": int((~mask).sum())})
+    if tracing:
+        tracemalloc.stop()
+
+    return X_clean, y_clean
@@ -0,0 +1,255 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Sequence
+import pandas as pd
+import numpy as np
+import json
+import os
+
+
+REFERENCE_FILENAME = "drift_reference.json"
+PSI_THRESHOLD = 0.2
+
+
+def reference_path(model_path: str) -> str:
+    """
+    Path of the drift reference stored next to a model or scorer artifact.
+
+    :param model_path: Path to `model.joblib` or `scorer.npz`
+    :return: Path to `drift_reference.json` in the same directory
+    """
+    return os.path.join(os.path.dirname(model_path), REFERENCE_FILENAME)
+
+
+class DriftReference:
+    """
+    Per-feature histograms of the training data over quantile bin edges.
+
+    The inner edges of feature `j` split the real line into `len(edges[j]) + 1` bins, so values
+    outside the training range still land in the first or last bin.
+    """
+    def __init__(self, feature_names: Sequence[str], edges: Sequence[np.ndarray], counts: np.ndarray):
+        self.feature_names = [str(c) for c in feature_names]
+        self.edges = [np.asarray(e, dtype = np.float64) for e in edges]
+        self.offsets = np.cumsum([0] + [len(e) + 1 for e in self.edges])
+        self.counts = np.asarray(counts, dtype = np.int64)
+
+
+    @classmethod
+    def from_frame(cls, X: pd.DataFrame, n_bins: int = 10) -> "DriftReference":
+        """"
+        Builds the reference from the training features.
+
+        :param X: Raw training features
+        :param n_bins: Number of quantile bins per feature (fewer for features with repeated values)
+        :return: Reference with the training histograms
+        """
+        quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+        edges = []
+        for col in X.columns:
+            values = X[col].to_numpy(dtype = np.float64)
+            values = values[~np.isnan(values)]
+            if not len(values):
+                edges.append(np.empty(0))
+                continue
+            # Edges sit halfway between distinct values, so repeated values (and their float32
+            # roundings) always fall in the same bin
+            distinct = np.unique(values)
+            upper = np.unique(np.searchsorted(distinct, np.quantile(values, quantiles), side = "right"))
+            upper = upper[(upper > 0) & (upper < len(distinct))]
+            edges.append((distinct[upper - 1] + distinct[upper]) / 2)
+
+        reference = cls(X.columns, edges, np.zeros(0))
+        sketch = DriftSketch(reference)
+        sketch.update(X)
+        reference.counts = sketch.binned_counts()
+
+        return reference
+
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame], n_bins: int = 10,
+                    sample_rows: int = 100_000) -> "DriftReference":
+        """"
+        Builds the reference from training features streamed in chunks: the bin edges come from the
+        first `sample_rows` rows, the histograms from every row.
+
+        :param chunks: Iterable of raw training feature DataFrames with the same columns
+        :param n_bins: Number of quantile bins per feature
+        :param sample_rows: Rows used to place the bin edges
+        :return: Reference with the training histograms
+        :raises ValueError: If there are no chunks
+        """
+        chunks, head, n_rows = iter(chunks), [], 0
+        for X in chunks:
+            head.append(X)
+            n_rows += len(X)
+            if n_rows >= sample_rows:
+                break
+        if not head:
+            raise ValueError("No hay datos para construir la referencia de deriva.")
+
+        reference = cls.from_frame(pd.concat(head), n_bins)
+        sketch = DriftSketch(reference)
+        for X in chunks:
+            sketch.update(X)
+        reference.counts += sketch.binned_counts()
+
+        return reference
+
+
+    def save(self, path: str):
+        """"
+        Saves the reference as JSON.
+
+        :param path: Destination file path
+        """
+        payload = {"feature_names": self.feature_names,
+                   "edges": [e.tolist() for e in self.edges],
+                   "counts": self.counts.tolist()}
+        with open(path, "w", encoding = "utf-8") as f:
+            json.dump(payload, f)
+
+
+    @classmethod
+    def load(cls, path: str) -> "DriftReference":
+        """"
+        Loads a reference written by `save`.
+
+        :param path: Path to the JSON file
+        :return: Loaded reference
+        """
+        with open(path, "r", encoding = "utf-8") as f:
+            payload = json.load(f)
+
+        return cls(payload["feature_names"], payload["edges"], payload["counts"])
+
+
+class DriftSketch:
+    """
+    Streaming histograms of incoming features over the reference bins.
+
+    Memory is one counter per bin and feature, whatever the number of rows. Sketches built on
+    disjoint chunks (e.g. in different worker processes) are combined by adding their `counts`.
+    The last counter of each feature counts missing values.
+    """
+    def __init__(self, reference: DriftReference):
+        self.reference = reference
+        n_bins = int(reference.offsets[-1])
+        self.counts = np.zeros(n_bins + len(reference.feature_names), dtype = np.int64)
+
+
+    def _slice(self, j: int) -> slice:
+        start = int(self.reference.offsets[j]) + j
+        return slice(start, start + len(self.reference.edges[j]) + 2)
+
+
+    def update(self, X: pd.DataFrame):
+        """"
+        Adds one chunk of raw features to the histograms.
+
+        :param X: DataFrame containing the reference features
+        """
+        for j, col in enumerate(self.reference.feature_names):
+            values = X[col].to_numpy(dtype = np.float64)
+            edges = self.reference.edges[j]
+            missing = np.isnan(values)
+            bins = np.searchsorted(edges, values[~missing], side = "right")
+            counts = self.counts[self._slice(j)]
+            counts[:-1] += np.bincount(bins, minlength = len(edges) + 1)
+            counts[-1] += int(missing.sum())
+
+
+    def binned_counts(self) -> np.ndarray:
+        """"
+        Histogram counts without the missing-value counters, in the layout of `DriftReference.counts`.
+
+        :return: Array of counts
+        """
+        return np.concatenate([self.counts[self._slice(j)][:-1] for j in range(len(self.reference.edges))])
+
+
+    def merge(self, other: "DriftSketch | np.ndarray") -> "DriftSketch":
+        """"
+        Adds the counts of another sketch over the same reference.
+
+        :param other: Sketch or its `counts` array
+        :return: This sketch
+        """
+        self.counts += other.counts if isinstance(other, DriftSketch) else np.asarray(other, dtype = np.int64)
+        return self
+
+
+    def report(self, threshold: float = PSI_THRESHOLD) -> Dict[str, Any]:
+        """"
+        Compares the streamed histograms with the reference.
+
+        PSI is computed over the bins with a small floor on empty bins; KS is the largest gap
+        between both binned cumulative distributions.
+
+        :param threshold: PSI above which a feature is reported as drifted
+        :return: Dictionary with per-feature `psi`, `ks`, `n` and `missing`, and the `drifted` features;
+            `psi` and `ks` are None for features without observed values, so the report stays valid JSON
+        """
+        features = {}
+        for j, col in enumerate(self.reference.feature_names):
+            current = self.counts[self._slice(j)]
+            reference = self.reference.counts[int(self.reference.offsets[j]):int(self.reference.offsets[j + 1])]
+            n = int(current[:-1].sum())
+            features[col] = {"psi": psi(reference, current[:-1]) if n else None,
+                             "ks": ks_statistic(reference, current[:-1]) if n else None,
+                             "n": n,
+                             "missing": int(current[-1])}
+
+        drifted = sorted((c for c, f in features.items() if f["psi"] is not None and f["psi"] > threshold),
+                         key = lambda c: -features[c]["psi"])
+
+        return {"features": features, "drifted": drifted, "threshold": threshold}
+
+
+def psi(expected: np.ndarray, actual: np.ndarray, eps: float = 1e-4) -> float:
+    """
+    Population Stability Index between two histograms over the same bins.
+
+    :param expected: Reference counts
+    :param actual: Current counts
+    :param eps: Floor for empty bins
+    :return: PSI
+    """
+    e = np.maximum(np.asarray(expected, dtype = np.float64) / max(np.sum(expected), 1), eps)
+    a = np.maximum(np.asarray(actual, dtype = np.float64) / max(np.sum(actual), 1), eps)
+
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def ks_statistic(expected: np.ndarray, actual: np.ndarray) -> float:
+    """
+    Kolmogorov-Smirnov statistic between two histograms over the same bins.
+
+    :param expected: Reference counts
+    :param actual: Current counts
+    :return: Largest absolute gap between the cumulative distributions
+    """
+    e = np.cumsum(expected) / max(np.sum(expected), 1)
+    a = np.cumsum(actual) / max(np.sum(actual), 1)
+
+    return float(np.max(np.abs(a - e)))
+
+
+def _fmt(value: float | None) -> str:
+    return "-" if value is None else f"{value:.3f}"
+
+
+def format_report(report: Dict[str, Any], top: int = 5) -> List[str]:
+    """
+    Summarizes a drift report as printable lines, most drifted features first.
+
+    :param report: Report returned by `DriftSketch.report`
+    :param top: Number of features listed
+    :return: Lines of text
+    """
+    ranked = sorted(report["features"].items(), key = lambda kv: -(kv[1]["psi"] or 0.0))
+    lines = [f"{'feature':>10} {'psi':>8} {'ks':>8}"]
+    lines += [f"{c:>10} {_fmt(f['psi']):>8} {_fmt(f['ks']):>8}" for c, f in ranked[:top]]
+    lines.append(f"Variables con deriva (PSI > {report['threshold']}): {', '.join(report['drifted']) or 'ninguna'}")
+
+    return lines
@@ -1,6 +1,8 @@
 from __future__ import annotations
 import pandas as pd
-import joblib
+import numpy as np
+import hashlib
+import json
 import time
 import os
 
@@ -9,67 +11,347 @@ def timestamped_dir(base_dir: str) -> str:
     """"
     Creates a timestamped directory inside the specified base directory.
 
+    The directory is created with `os.mkdir`, which fails if it exists, so runs started in the
+    same second get `_01`, `_02`, ... suffixes instead of sharing a directory.
+
     :param base_dir: Base directory where the timestamped directory will be created
     :return: Path to the created timestamped directory
     """
     ts = time.strftime("%Y%m%d_%H%M%S")
-    path = os.path.join(base_dir, ts)
-    os.makedirs(path, exist_ok = True)
-
-    return path
+    os.makedirs(base_dir, exist_ok = True)
+    path, suffix = os.path.join(base_dir, ts), 0
+    while True:
+        try:
+            os.mkdir(path)
+            return path
+        except FileExistsError:
+            suffix += 1
+            path = os.path.join(base_dir, f"{ts}_{suffix:02d}")
 
 
 def ensure_latest_symlink(base_dir: str, latest_name: str = "latest", target_dir: str | None = None) -> str:
     """"
     Ensures a symlink named `latest_name` points to the most recent directory in `base_dir`.
 
+    The link is replaced atomically (a temporary link renamed over the old one), so readers
+    never observe a missing `latest`.
+
     :param base_dir: Base directory containing timestamped directories
     :param latest_name: Name of the symlink to create or update
     :param target_dir: Specific directory to point the symlink to; if None, points to the latest
     :return: Path to the symlink
     """
     latest_path = os.path.join(base_dir, latest_name)
-    if os.path.islink(latest_path) or os.path.exists(latest_path):
-        try:
-            os.remove(latest_path)
-        except OSError:
-            pass
     if target_dir is None:
-        candidates = sorted([d for d in os.listdir(base_dir) if os.path.isdir(os.path.join(base_dir, d))])
+        candidates = sorted([d for d in os.listdir(base_dir)
+                             if d != latest_name and os.path.isdir(os.path.join(base_dir, d))])
         if not candidates:
             return latest_path
         target_dir = os.path.join(base_dir, candidates[-1])
-        os.symlink(os.path.abspath(target_dir), latest_path)
-        return latest_path
+
+    tmp_path = f"{latest_path}.tmp-{os.getpid()}"
+    if os.path.lexists(tmp_path):
+        os.remove(tmp_path)
+    os.symlink(os.path.abspath(target_dir), tmp_path)
+    if os.path.isdir(latest_path) and not os.path.islink(latest_path):
+        os.rmdir(latest_path)
+    os.replace(tmp_path, latest_path)
+
+    return latest_path
+
+
+MODEL_COMPRESSION = ("none", "zlib", "lz4")
+
+
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    """
+    Computes the SHA-256 checksum of a file, reading it in blocks.
+
+    :param path: Path to the file
+    :param block_size: Bytes read at a time
+    :return: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def manifest_path(path: str) -> str:
+    """
+    Path of the sidecar manifest written next to a model artifact.
+
+    :param path: Path to the model artifact
+    :return: Path to `<artifact>.manifest.json`
+    """
+    return f"{path}.manifest.json"
 
 
-def save_model(model, path: str):
+def read_manifest(path: str) -> dict | None:
+    """
+    Reads the sidecar manifest of a model artifact.
+
+    :param path: Path to the model artifact
+    :return: Manifest dictionary, or None if the artifact has no manifest
+    """
+    try:
+        with open(manifest_path(path), "r", encoding = "utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_model(model, path: str, compress: str = "none", level: int = 3, measure_load: bool = True) -> dict:
     """"
     Saves a machine learning model to the specified path using joblib.
-    
+
+    Uncompressed artifacts can be loaded with `mmap_mode="r"`, so processes share the pages of
+    their large arrays instead of each holding a copy. A `<path>.manifest.json` sidecar records
+    the format, size, checksum and save/load times.
+
     :param model: The machine learning model to save
     :param path: The file path where the model will be saved
+    :param compress: One of "none", "zlib" or "lz4"
+    :param level: Compression level (1-9) for "zlib" and "lz4"
+    :param measure_load: Load the artifact once to record its load time in the manifest
+    :return: The manifest
+    :raises ValueError: If the compression is unknown or its library is not installed
     """
-    joblib.dump(model, path)
+    import joblib
+
+    if compress not in MODEL_COMPRESSION:
+        raise ValueError(f"Compresion desconocida: {compress}. Opciones: {MODEL_COMPRESSION}")
+    if compress == "lz4":
+        try:
+            import lz4  # noqa: F401
+        except ImportError as e:
+            raise ValueError("La compresion lz4 requiere el paquete 'lz4'.") from e
+
+    start = time.perf_counter()
+    joblib.dump(model, path, compress = 0 if compress == "none" else (compress, level))
+    manifest = {"format": "joblib",
+                "compress": compress,
+                "level": None if compress == "none" else level,
+                "mmap_compatible": compress == "none",
+                "size_bytes": os.path.getsize(path),
+                "sha256": file_sha256(path),
+                "save_seconds": time.perf_counter() - start}
 
+    if measure_load:
+        start = time.perf_counter()
+        joblib.load(path, mmap_mode = "r" if compress == "none" else None)
+        manifest["load_seconds"] = time.perf_counter() - start
 
-def load_model(path: str):
+    with open(manifest_path(path), "w", encoding = "utf-8") as f:
+        json.dump(manifest, f, indent = 2)
+
+    return manifest
+
+
+def load_model(path: str, mmap_mode: str | None = None):
     """"
     Loads a machine learning model from the specified path using joblib.
 
     :param path: The file path from which the model will be loaded
+    :param mmap_mode: "r" memory-maps the arrays of uncompressed artifacts (ignored for compressed ones)
     :return: The loaded machine learning model
     """
-    return joblib.load(path)
+    import joblib
+
+    if mmap_mode is not None and (read_manifest(path) or {}).get("mmap_compatible") is False:
+        mmap_mode = None
+
+    return joblib.load(path, mmap_mode = mmap_mode)
+
+
+PREDICTION_FORMATS = ("csv", "parquet", "arrow", "npy")
+PREDICTION_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow", "npy": ".npy"}
+
+
+class PredictionWriter:
+    """
+    Appends chunks of predictions to a CSV, Parquet, Arrow IPC or `.npy` file.
 
+    Every `write` call becomes one appended CSV block, one Parquet row group, one Arrow record
+    batch or one run of `.npy` records, so streaming inference never holds more than a chunk.
+    The `.npy` file stores a structured array; its header has a fixed size and is rewritten with
+    the final row count on `close`. Parquet and Arrow need `pyarrow`.
+    """
+    def __init__(self, path: str, output_format: str = "csv"):
+        if output_format not in PREDICTION_FORMATS:
+            raise ValueError(f"Formato de salida desconocido: {output_format}. Opciones: {PREDICTION_FORMATS}")
+        if output_format in ("parquet", "arrow"):
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError as e:
+                raise ValueError(f"El formato {output_format} requiere el paquete 'pyarrow'.") from e
+
+        self.path = path
+        self.output_format = output_format
+        self.n_rows = 0
+        self._writer = None
+        self._schema = None
+        self._file = None
+        self._dtype = None
+        self._header_len = 0
+
+
+    def write(self, df: pd.DataFrame):
+        """"
+        Appends one chunk.
+
+        :param df: Predictions chunk; every chunk must have the same columns
+        """
+        if self.output_format == "csv":
+            df.to_csv(self.path, mode = "w" if self.n_rows == 0 else "a", header = self.n_rows == 0, index = False)
+        elif self.output_format == "npy":
+            self._write_npy(df)
+        else:
+            self._write_arrow(df)
+        self.n_rows += len(df)
+
+
+    def _write_arrow(self, df: pd.DataFrame):
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, schema = self._schema, preserve_index = False)
+        if self._writer is None:
+            self._schema = table.schema
+            if self.output_format == "parquet":
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            else:
+                self._writer = pa.ipc.new_file(self.path, self._schema)
+        self._writer.write_table(table)
+
+
+    def _npy_header(self, n_rows: int) -> bytes:
+        header = repr({"descr": np.lib.format.dtype_to_descr(self._dtype), "fortran_order": False, "shape": (n_rows,)})
+        if self._header_len == 0:
+            # Room for any row count, aligned to 64 bytes like numpy's own writer
+            widest = len(header) + 20 + 1
+            self._header_len = -(-(10 + widest) // 64) * 64 - 10
+        header = header.ljust(self._header_len - 1) + "\n"
+
+        return b"\x93NUMPY\x01\x00" + self._header_len.to_bytes(2, "little") + header.encode("latin1")
 
-def save_predictions(preds, path_csv: str, index: bool = False):
+
+    def _write_npy(self, df: pd.DataFrame):
+        if self._file is None:
+            if any(dt == object for dt in df.dtypes):
+                raise ValueError("El formato npy solo admite columnas numericas.")
+            self._dtype = np.dtype([(str(c), df[c].dtype) for c in df.columns])
+            self._file = open(self.path, "wb")
+            self._file.write(self._npy_header(0))
+        records = np.empty(len(df), dtype = self._dtype)
+        for c in df.columns:
+            records[str(c)] = df[c].to_numpy()
+        self._file.write(records.tobytes())
+
+
+    def close(self):
+        """"
+        Finishes the file (Parquet footer, Arrow footer or final `.npy` header).
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._file is not None:
+            self._file.seek(0)
+            self._file.write(self._npy_header(self.n_rows))
+            self._file.close()
+            self._file = None
+
+
+    def __enter__(self) -> "PredictionWriter":
+        return self
+
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def prediction_frame(preds, proba: np.ndarray | None = None, classes = None, row_ids = None,
+                     id_name: str = "row_id") -> pd.DataFrame:
     """
-    Saves the model predictions to a CSV file.
+    Builds the predictions table: row ids, predicted class and one `proba_<class>` column per class.
+
+    :param preds: Predicted classes
+    :param proba: Class probabilities of shape (n_samples, n_classes), optional
+    :param classes: Class labels in the column order of `proba`; defaults to 0..n_classes-1
+    :param row_ids: Source row ids, optional
+    :param id_name: Name of the id column
+    :return: DataFrame with the predictions
+    """
+    columns = {} if row_ids is None else {id_name: np.asarray(row_ids)}
+    columns["prediction"] = np.asarray(preds)
+    if proba is not None:
+        classes = range(proba.shape[1]) if classes is None else classes
+        for j, c in enumerate(classes):
+            columns[f"proba_{c}"] = proba[:, j]
+
+    return pd.DataFrame(columns)
+
+
+def save_predictions(preds, path_csv: str, index: bool = False, output_format: str = "csv",
+                     proba: np.ndarray | None = None, classes = None, row_ids = None, id_name: str = "row_id"):
+    """
+    Saves the model predictions to a CSV file, or to Parquet, Arrow IPC or `.npy`.
 
     :param preds: The predictions to save
     :param path_csv: The file path where the predictions will be saved
-    :param index: Whether to include the index in the CSV file
+    :param index: Whether to include the row number as `row_id` (ignored if `row_ids` is given)
+    :param output_format: One of `PREDICTION_FORMATS`
+    :param proba: Class probabilities, optional
+    :param classes: Class labels in the column order of `proba`
+    :param row_ids: Source row ids, optional
+    :param id_name: Name of the id column
+    """
+    if row_ids is None and index:
+        row_ids = np.arange(len(preds))
+    with PredictionWriter(path_csv, output_format) as writer:
+        writer.write(prediction_frame(preds, proba, classes, row_ids, id_name))
+
+
+def save_columns(df: pd.DataFrame, path: str) -> str:
+    """
+    Saves every column of a DataFrame as its own `.npy` file plus a `columns.json` manifest.
+
+    :param df: DataFrame to save; columns must be numeric
+    :param path: Directory where the column files will be written
+    :return: SHA-256 digest of the column contents
     """
-    df = pd.DataFrame({"prediction": preds})
-    df.to_csv(path_csv, index = index)
\ No newline at end of file
+    os.makedirs(path, exist_ok = True)
+    digest = hashlib.sha256()
+    columns = []
+    for i, col in enumerate(df.columns):
+        values = np.ascontiguousarray(df[col].to_numpy())
+        np.save(os.path.join(path, f"{i:04d}.npy"), values)
+        digest.update(str(col).encode("utf-8"))
+        digest.update(values.dtype.str.encode("utf-8"))
+        digest.update(values.tobytes())
+        columns.append({"name": str(col), "file": f"{i:04d}.npy", "dtype": values.dtype.str})
+
+    manifest = {"columns": columns, "n_rows": int(len(df)), "sha256": digest.hexdigest()}
+    with open(os.path.join(path, "columns.json"), "w", encoding = "utf-8") as f:
+        json.dump(manifest, f, indent = 2)
+
+    return manifest["sha256"]
+
+
+def load_columns(path: str, mmap_mode: str | None = "r") -> pd.DataFrame:
+    """
+    Loads a DataFrame written by `save_columns`, memory-mapping each column by default.
+
+    :param path: Directory containing the column files
+    :param mmap_mode: Memory-map mode passed to `numpy.load`; None reads the columns into memory
+    :return: DataFrame backed by the column files
+    """
+    with open(os.path.join(path, "columns.json"), "r", encoding = "utf-8") as f:
+        manifest = json.load(f)
+
+    data = {c["name"]: np.load(os.path.join(path, c["file"]), mmap_mode = mmap_mode) for c in manifest["columns"]}
+
+    return pd.DataFrame(data, copy = False)
@@ -1,20 +1,143 @@
 from __future__ import annotations
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-from typing import Dict
+from typing import Dict, List
 import numpy as np
 
 
-def classification_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, float]:
+def confusion_counts(y_true: np.ndarray, y_pred: np.ndarray, labels = None) -> np.ndarray:
+    """"
+    Computes the confusion matrix with a single `np.bincount` pass.
+
+    Labels are first encoded to their positions, so any values work (e.g. {-1, 1}, {1, 2} or floats).
+
+    :param y_true: True target values
+    :param y_pred: Predicted target values
+    :param labels: Class labels in row/column order; defaults to the sorted union of both arrays
+    :return: Array of shape (n_labels, n_labels); rows are true classes, columns predicted ones
+    :raise ValueError: If `labels` is given and a value is not among them
+    """
+    y_true = np.ravel(y_true)
+    values = np.concatenate([y_true, np.ravel(y_pred)])
+    if labels is None:
+        labels, codes = np.unique(values, return_inverse = True)
+    else:
+        labels = np.asarray(labels)
+        order = np.argsort(labels, kind = "stable")
+        positions = np.searchsorted(labels[order], values).clip(max = max(len(labels) - 1, 0))
+        if not len(labels) or not (labels[order][positions] == values).all():
+            raise ValueError(f"Etiquetas fuera de {labels.tolist()}: {np.setdiff1d(values, labels).tolist()}")
+        codes = order[positions]
+    n_labels = len(labels)
+    counts = np.bincount(codes[:len(y_true)] * n_labels + codes[len(y_true):], minlength = n_labels * n_labels)
+
+    return counts.reshape(n_labels, n_labels)
+
+
+def binary_counts(y_true: np.ndarray, y_pred: np.ndarray, pos_label = 1) -> np.ndarray:
+    """"
+    Computes the 2x2 confusion matrix of a binary problem, negative class first.
+
+    The layout does not depend on which classes a batch happens to contain, so the matrices of
+    several batches can be summed.
+
+    :param y_true: True target values
+    :param y_pred: Predicted target values
+    :param pos_label: Label of the positive class; any other single label is the negative one
+    :return: Array of shape (2, 2) as expected by `metrics_from_counts`
+    :raise ValueError: If there are more than two labels, or two without `pos_label`
+    """
+    y_true, y_pred = np.ravel(y_true), np.ravel(y_pred)
+    labels = None
+    if y_true.size and y_true.dtype.kind in "biuf" and y_pred.dtype.kind in "biuf":
+        # Numeric labels are checked with min/max and comparisons, avoiding a sort of both arrays
+        lo, hi = min(y_true.min(), y_pred.min()), max(y_true.max(), y_pred.max())
+        if all(((y == lo) | (y == hi)).all() for y in (y_true, y_pred)):
+            labels = np.unique([lo, hi])
+    if labels is None:
+        labels = np.unique(np.concatenate([y_true, y_pred]))
+    if len(labels[labels != pos_label]) > 1:
+        raise ValueError(f"Se esperaban etiquetas binarias con clase positiva {pos_label}, "
+                         f"se encontraron: {labels.tolist()}")
+
+    is_true, is_pred = y_true == pos_label, y_pred == pos_label
+    tp = np.count_nonzero(is_true & is_pred)
+    n_true, n_pred = np.count_nonzero(is_true), np.count_nonzero(is_pred)
+
+    return np.array([[y_true.size - n_true - n_pred + tp, n_pred - tp], [n_true - tp, tp]])
+
+
+def roc_auc(y_true: np.ndarray, y_score: np.ndarray) -> float:
+    """"
+    Computes the ROC-AUC as the normalized Mann-Whitney U statistic (ties get average ranks).
+
+    :param y_true: True binary target values
+    :param y_score: Scores or probabilities of the positive class
+    :return: ROC-AUC, or NaN if only one class is present
+    """
+    y_true = np.asarray(y_true) == 1
+    n_pos = int(y_true.sum())
+    n_neg = y_true.size - n_pos
+    if n_pos == 0 or n_neg == 0:
+        return float("nan")
+
+    from scipy.stats import rankdata
+
+    ranks = rankdata(y_score)
+    u = ranks[y_true].sum() - n_pos * (n_pos + 1) / 2
+
+    return float(u / (n_pos * n_neg))
+
+
+def classification_metrics(y_true: np.ndarray, y_pred: np.ndarray, y_score: np.ndarray | None = None) -> Dict[str, float]:
     """"
     Calculates classification metric: Accuracy, Precision, Recall, and F1 Score.
 
+    All of them are derived from one confusion matrix, and ROC-AUC is added when scores are given.
+    Undefined ratios (e.g. precision without positive predictions) are reported as 0.
+
     :param y_true: True target values
     :param y_pred: Predicted target values
+    :param y_score: Probabilities of the positive class, optional
     :return: Dictionary with the calculated metrics
     """
-    acc = float(accuracy_score(y_true, y_pred))
-    prec = float(precision_score(y_true, y_pred))
-    rec = float(recall_score(y_true, y_pred))
-    f1 = float(f1_score(y_true, y_pred))
+    metrics = metrics_from_counts(binary_counts(y_true, y_pred))
+    if y_score is not None:
+        metrics["roc_auc"] = roc_auc(y_true, y_score)
+
+    return metrics
+
+
+def metrics_from_counts(counts: np.ndarray) -> Dict[str, float]:
+    """"
+    Derives Accuracy, Precision, Recall and F1 from a binary confusion matrix.
+
+    Confusion matrices of different batches can be summed first, which lets streaming evaluation
+    accumulate counts chunk by chunk.
+
+    :param counts: 2x2 confusion matrix as returned by `binary_counts`
+    :return: Dictionary with the calculated metrics
+    """
+    (tn, fp), (fn, tp) = counts
+    n = tn + fp + fn + tp
+
+    acc = float((tp + tn) / n) if n else 0.0
+    prec = float(tp / (tp + fp)) if tp + fp else 0.0
+    rec = float(tp / (tp + fn)) if tp + fn else 0.0
+    f1 = float(2 * tp / (2 * tp + fp + fn)) if tp + fp + fn else 0.0
+
+    return {"accuracy": acc, "precision": prec, "recall": rec, "f1": f1}
+
+
+def summarize_folds(fold_metrics: List[Dict[str, float]]) -> Dict[str, float]:
+    """"
+    Aggregates per-fold metrics into their mean and standard deviation.
+
+    :param fold_metrics: One metrics dictionary per fold
+    :return: Dictionary with `<metric>_mean` and `<metric>_std` entries
+    """
+    summary = {}
+    for name in fold_metrics[0]:
+        values = np.array([m[name] for m in fold_metrics], dtype = float)
+        summary[f"{name}_mean"] = float(values.mean())
+        summary[f"{name}_std"] = float(values.std())
 
-    return {"accuracy": acc, "precision": prec, "recall": rec, "f1": f1}
\ No newline at end of file
+    return summary
@@ -0,0 +1,144 @@
+from __future__ import annotations
+from src.io_utils import load_model
+from typing import Any, Callable, Dict, Tuple
+import threading
+import time
+import os
+
+
+def artifact_fingerprint(path: str) -> Tuple[str, int, int, int]:
+    """
+    Identifies the file a (possibly symlinked) path currently resolves to.
+
+    :param path: Path to the model file, e.g. `artifacts/latest/model.joblib`
+    :return: Tuple of resolved path, inode, mtime in nanoseconds and size
+    """
+    real_path = os.path.realpath(path)
+    st = os.stat(real_path)
+
+    return real_path, st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class ModelHolder:
+    """
+    Holds the current model and swaps in a new one when the file behind `model_path` changes.
+
+    Reloads happen on a background polling thread. Readers call `get()` once per batch and keep
+    that reference, so in-flight batches finish on the model they started with and never wait
+    for a reload. A model that fails to load (or to pass `validate`) is discarded and the current
+    one keeps serving.
+    """
+    def __init__(self, model_path: str, poll_interval: float = 2.0, loader: Callable[[str], Any] = load_model,
+                 validate: Callable[[Any], None] | None = None):
+        self.model_path = model_path
+        self.poll_interval = poll_interval
+        self.loader = loader
+        self.validate = validate
+        fingerprint = artifact_fingerprint(model_path)
+        self._current = (loader(model_path), fingerprint)
+        self._failed_fingerprint = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.swaps = 0
+        self.failed_loads = 0
+        self.last_swap_latency_s = None
+        self.last_error = None
+
+
+    def get(self):
+        """"
+        Returns the model currently being served.
+
+        :return: Loaded model
+        """
+        return self._current[0]
+
+
+    def get_with_version(self) -> Tuple[Any, str]:
+        """"
+        Returns the model currently being served together with its version, read from the same
+        snapshot so that a concurrent swap cannot pair one model with the other's version.
+
+        :return: Tuple of the loaded model and the resolved path of its artifact
+        """
+        model, fingerprint = self._current
+        return model, fingerprint[0]
+
+
+    @property
+    def version(self) -> str:
+        """"
+        Resolved path of the artifact currently being served.
+        """
+        return self._current[1][0]
+
+
+    def check(self) -> bool:
+        """"
+        Reloads the model if the artifact behind `model_path` changed since the last load.
+
+        :return: True if a new model was swapped in
+        """
+        with self._lock:
+            try:
+                fingerprint = artifact_fingerprint(self.model_path)
+            except OSError:
+                return False
+            if fingerprint in (self._current[1], self._failed_fingerprint):
+                return False
+
+            start = time.perf_counter()
+            try:
+                model = self.loader(fingerprint[0])
+                if self.validate is not None:
+                    self.validate(model)
+            except Exception as e:
+                self._failed_fingerprint = fingerprint
+                self.failed_loads += 1
+                self.last_error = f"{fingerprint[0]}: {e}"
+                return False
+
+            self._current = (model, fingerprint)
+            self.swaps += 1
+            self.last_swap_latency_s = time.perf_counter() - start
+
+            return True
+
+
+    def start(self) -> "ModelHolder":
+        """"
+        Starts polling the artifact every `poll_interval` seconds.
+
+        :return: The holder itself
+        """
+        def watch():
+            while not self._stop.wait(self.poll_interval):
+                self.check()
+
+        self._thread = threading.Thread(target = watch, name = "model-watcher", daemon = True)
+        self._thread.start()
+
+        return self
+
+
+    def stop(self):
+        """"
+        Stops the polling thread.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+    def stats(self) -> Dict[str, Any]:
+        """"
+        Summarizes the reload history.
+
+        :return: Dictionary with the served version, swap count and latency and failed loads
+        """
+        return {"version": self.version,
+                "swaps": self.swaps,
+                "last_swap_latency_ms": None if self.last_swap_latency_s is None else self.last_swap_latency_s * 1000,
+                "failed_loads": self.failed_loads,
+                "last_error": self.last_error}
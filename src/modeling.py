@@ -1,13 +1,34 @@
 from __future__ import annotations
-from sklearn.linear_model import LogisticRegression
+from src.data import FittedScaler
+from typing import Callable, Iterable, Tuple, TYPE_CHECKING
 import pandas as pd
+import numpy as np
+
+
+if TYPE_CHECKING:
+    from sklearn.linear_model import LogisticRegression
+
+TRAINING_MODES = ("batch", "incremental")
+# Solvers of LogisticRegression that start from `coef_` when `warm_start=True` (liblinear ignores it)
+WARM_START_SOLVERS = ("lbfgs", "newton-cg", "newton-cholesky", "sag", "saga")
+# Parameters that change how long a fit runs but not the solution it converges to
+_RUNTIME_PARAMS = ("max_iter", "n_jobs", "verbose", "warm_start")
+
 
 class ModelBuilder:
-    def __init__(self, random_state: int, params: dict):
+    def __init__(self, random_state: int, params: dict, mode: str = "batch"):
         self.random_state = random_state
         self.params = params
+        self.mode = mode
+        if mode not in TRAINING_MODES:
+            raise ValueError(f"Modo de entrenamiento desconocido: {mode}. Opciones: {TRAINING_MODES}")
+        # sklearn is imported here so that loading a saved artifact does not pull in every estimator
+        from sklearn.linear_model import LogisticRegression, SGDClassifier
         try:
-            self.model = LogisticRegression(random_state = self.random_state, **self.params)
+            if mode == "incremental":
+                self.model = SGDClassifier(loss = "log_loss", random_state = self.random_state, **self.params)
+            else:
+                self.model = LogisticRegression(random_state = self.random_state, **self.params)
         except Exception as e:
             raise ValueError(f"Error al construir el modelo: {e}")
 
@@ -24,6 +45,83 @@ class ModelBuilder:
         return self.model
 
 
+    def warm_start_from(self, previous: "PreprocessedModel", scaler: FittedScaler, classes) -> str | None:
+        """"
+        Initializes the classifier from a previously trained artifact, so `train_model` starts near
+        the optimum instead of from zero.
+
+        The previous coefficients live in the space of the previous scaler; they are folded into raw
+        feature weights (`w = coef / scale_old`, `b = intercept - w @ mean_old`) and unfolded with
+        `scaler` (`coef = w * scale`, `intercept = b + w @ mean`), which gives the same decision
+        function on the new standardized features. The builder is left untouched when warm starting
+        is not possible.
+
+        :param previous: Model currently promoted to `latest`
+        :param scaler: Scaler fitted on the new training split
+        :param classes: Classes of the new training target
+        :return: None if the classifier was initialized, otherwise the reason for a cold fit
+        """
+        clf = getattr(previous, "model", None)
+        if self.mode != "batch" or type(clf) is not type(self.model):
+            return "modelo previo de otro tipo"
+        solver = self.model.get_params()["solver"]
+        if solver not in WARM_START_SOLVERS:
+            return f"el solver {solver} no admite warm_start"
+        if list(previous.feature_names) != list(scaler.feature_names):
+            return "cambiaron las variables"
+        if not np.array_equal(np.asarray(clf.classes_), np.unique(classes)):
+            return "cambiaron las clases"
+        old, new = clf.get_params(), self.model.get_params()
+        changed = sorted(k for k in new if k not in _RUNTIME_PARAMS and old.get(k) != new[k])
+        if changed:
+            return f"cambiaron los hiperparametros: {', '.join(changed)}"
+
+        weights = np.asarray(clf.coef_, dtype = np.float64) / previous.scaler.scale_
+        bias = np.asarray(clf.intercept_, dtype = np.float64) - weights @ previous.scaler.mean_
+        self.model.set_params(warm_start = True)
+        self.model.coef_ = weights * scaler.scale_
+        self.model.intercept_ = bias + weights @ scaler.mean_
+
+        return None
+
+
+    def train_incremental(self, chunks: Callable[[], Iterable[Tuple[pd.DataFrame, pd.Series]]],
+                          epochs: int = 1) -> "PreprocessedModel":
+        """"
+        Trains out-of-core: memory is bounded by the chunk size, not by the dataset size.
+
+        A first pass over the chunks fits the scaler with `StandardScaler.partial_fit` and collects
+        the classes; each of the following `epochs` passes updates the classifier with `partial_fit`
+        on the standardized chunks. Requires `mode="incremental"`.
+
+        :param chunks: Callable returning a fresh iterable of (X, y) chunks for each pass
+        :param epochs: Number of passes over the data for the classifier
+        :return: Trained model with its preprocessing, ready for `save_model`
+        :raises ValueError: If the builder is not in incremental mode or there is no data
+        """
+        if self.mode != "incremental":
+            raise ValueError("train_incremental requiere mode='incremental'.")
+
+        from sklearn.preprocessing import StandardScaler
+
+        scaler = StandardScaler()
+        classes = np.array([], dtype = np.int64)
+        feature_names = None
+        for X, y in chunks():
+            scaler.partial_fit(X)
+            classes = np.union1d(classes, np.unique(y))
+            feature_names = feature_names or list(X.columns)
+        if feature_names is None:
+            raise ValueError("No hay datos para entrenar.")
+
+        fitted_scaler = FittedScaler(feature_names, scaler.mean_, scaler.scale_)
+        for _ in range(epochs):
+            for X, y in chunks():
+                self.model.partial_fit(fitted_scaler.transform(X), np.asarray(y), classes = classes)
+
+        return PreprocessedModel(self.model, fitted_scaler)
+
+
     def predict(self, X):
         """"
         Makes predictions using the trained model.
@@ -33,3 +131,47 @@ class ModelBuilder:
         """
         y_pred = self.model.predict(X)
         return y_pred
+
+
+class PreprocessedModel:
+    """
+    A fitted scaler and the classifier trained on its output, saved and loaded as one artifact.
+
+    Accepts raw feature frames (extra columns are ignored, order is taken from the scaler) and
+    feeds the classifier a plain float64 array.
+    """
+    def __init__(self, model, scaler: FittedScaler):
+        self.model = model
+        self.scaler = scaler
+        self.feature_names = scaler.feature_names
+        self.classes_ = getattr(model, "classes_", None)
+
+
+    def transform(self, X) -> np.ndarray:
+        """"
+        Applies the fitted preprocessing.
+
+        :param X: Raw input features
+        :return: Preprocessed feature array
+        """
+        return self.scaler.transform(X)
+
+
+    def predict(self, X) -> np.ndarray:
+        """"
+        Makes predictions on raw input features.
+
+        :param X: Raw input features
+        :return y_pred: Predicted values
+        """
+        return self.model.predict(self.transform(X))
+
+
+    def predict_proba(self, X) -> np.ndarray:
+        """"
+        Estimates class probabilities on raw input features.
+
+        :param X: Raw input features
+        :return: Array of shape (n_samples, n_classes)
+        """
+        return self.model.predict_proba(self.transform(X))
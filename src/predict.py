@@ -1,10 +1,514 @@
 from __future__ import annotations
-from src.io_utils import load_model
+from concurrent.futures import ProcessPoolExecutor
+from src.io_utils import load_model, PredictionWriter, prediction_frame, save_predictions
+from src.io_utils import PREDICTION_FORMATS, PREDICTION_EXTENSIONS
+from src.scorer import load_scorer, LinearScorer, StackedLinearScorer
+from src.profiling import Profiler
+from src.drift import DriftReference, DriftSketch, reference_path, format_report
+from src.prediction_cache import PredictionCache, CachedModel, model_checksum
+from src.schema import FeatureSchema, schema_path, quarantine_path
+from collections import deque
+from itertools import islice
+from typing import Any, Dict, Iterator, Sequence, Tuple
 import pandas as pd
+import numpy as np
 import argparse
+import time
+import json
+import io
 import os
 
 
+_WORKER_MODEL = None
+_WORKER_REFERENCE = None
+_WORKER_SCHEMA = None
+
+
+def load_predictor(path: str, mmap_mode: str | None = None):
+    """
+    Loads either a NumPy scorer artifact (`.npz`) or a joblib model.
+
+    :param path: Path to `scorer.npz` or `model.joblib`
+    :param mmap_mode: Memory-map mode for uncompressed joblib models, e.g. "r"
+    :return: Object exposing `predict`
+    """
+    return load_scorer(path) if path.endswith(".npz") else load_model(path, mmap_mode = mmap_mode)
+
+
+def default_samples() -> pd.DataFrame:
+    """
+    Builds the two example rows scored when no samples file is given.
+
+    :return: DataFrame with the Boston Housing features
+    """
+    return pd.DataFrame({"CRIM": [0.03, 0.1],
+                         "ZN": [18.0, 0.0],
+                         "INDUS": [2.31, 7.07],
+                         "CHAS": [0, 0],
+                         "NOX": [0.538, 0.469],
+                         "RM": [6.575, 6.0],
+                         "AGE": [65.2, 68.2],
+                         "DIS": [4.09, 3.5],
+                         "RAD": [1, 2],
+                         "TAX": [296, 242],
+                         "PTRATIO": [15.3, 17.8],
+                         "B": [396.9, 392.8],
+                         "LSTAT": [4.98, 9.14]})
+
+
+def iter_chunks(samples_file: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Reads a samples file in fixed-size chunks; the index of each chunk is the source row number.
+
+    :param samples_file: Path to the CSV file with the samples
+    :param chunksize: Number of rows per chunk
+    :return: Iterator over the chunks
+    """
+    with pd.read_csv(samples_file, chunksize = chunksize) as reader:
+        yield from reader
+
+
+def iter_raw_chunks(samples_file: str, chunksize: int) -> Iterator[Tuple[int, str, str]]:
+    """
+    Splits a samples file into blocks of `chunksize` unparsed lines, leaving the CSV parsing to the workers.
+
+    Assumes one record per line (no quoted newlines), which holds for numeric feature files.
+
+    :param samples_file: Path to the CSV file with the samples
+    :param chunksize: Number of rows per block
+    :return: Iterator of (first row number, header line, block text)
+    """
+    with open(samples_file, "r", encoding = "utf-8") as f:
+        header = f.readline()
+        start = 0
+        while True:
+            lines = list(islice(f, chunksize))
+            if not lines:
+                break
+            yield start, header, "".join(lines)
+            start += len(lines)
+
+
+def _score_chunk(model, chunk: pd.DataFrame, id_column: str | None = None, with_proba: bool = False) -> pd.DataFrame:
+    """
+    Scores one chunk and pairs each prediction (and optionally its class probabilities) with its row id.
+
+    :param model: Trained model exposing `predict` (and `predict_proba`, if `with_proba`)
+    :param chunk: DataFrame with the samples
+    :param id_column: Column holding the row ids; if None, the chunk index is used as `row_id`
+    :param with_proba: Also compute one `proba_<class>` column per class
+    :return: DataFrame with the ids, the predictions and, if requested, the class probabilities
+    """
+    if id_column:
+        ids = chunk[id_column]
+        chunk = chunk.drop(columns = [id_column])
+    else:
+        ids = chunk.index
+    preds, proba = _predict_with_proba(model, chunk) if with_proba else (model.predict(chunk), None)
+
+    return prediction_frame(preds, proba, _classes(model), ids, id_column or "row_id")
+
+
+def _predict_with_proba(model, X: pd.DataFrame):
+    if hasattr(model, "predict_with_proba"):
+        return model.predict_with_proba(X)
+    return model.predict(X), model.predict_proba(X) if hasattr(model, "predict_proba") else None
+
+
+def _classes(model):
+    return getattr(model, "classes_", getattr(model, "classes", None))
+
+
+def _init_worker(model_path: str, mmap_mode: str | None = None, reference: DriftReference | None = None,
+                 schema: FeatureSchema | None = None):
+    """
+    Loads the model once per worker process.
+
+    :param model_path: Path to the joblib model or scorer artifact
+    :param mmap_mode: Memory-map mode, so that workers share the pages of the model arrays
+    :param reference: Drift reference; if given, every chunk also returns its drift histogram
+    :param schema: Feature schema; if given, blocks are parsed and validated with it
+    """
+    global _WORKER_MODEL, _WORKER_REFERENCE, _WORKER_SCHEMA
+    _WORKER_MODEL = load_predictor(model_path, mmap_mode)
+    _WORKER_REFERENCE = reference
+    _WORKER_SCHEMA = schema
+
+
+def _score_raw_chunk(start: int, header: str, text: str, id_column: str | None = None, with_proba: bool = False
+                     ) -> Tuple[pd.DataFrame, np.ndarray | None, pd.DataFrame | None]:
+    """
+    Parses and scores one block of lines inside a worker process.
+
+    :param start: Row number of the first line of the block
+    :param header: Header line of the samples file
+    :param text: Lines of the block
+    :param id_column: Column holding the row ids
+    :param with_proba: Also compute the class probabilities
+    :return: Tuple of the DataFrame with the ids and the predictions (None if no row was valid), the block's
+        drift counts (or None) and its quarantined rows (or None without a schema)
+    """
+    buffer = io.StringIO(header + text)
+    chunk = _WORKER_SCHEMA.read_csv(buffer, _keep(id_column)) if _WORKER_SCHEMA is not None else pd.read_csv(buffer)
+    chunk.index = pd.RangeIndex(start, start + len(chunk))
+    quarantined = None
+    if _WORKER_SCHEMA is not None:
+        chunk, quarantined = validate_chunk(chunk, _WORKER_SCHEMA, id_column)
+    counts = None
+    if _WORKER_REFERENCE is not None:
+        sketch = DriftSketch(_WORKER_REFERENCE)
+        sketch.update(chunk)
+        counts = sketch.counts
+
+    out = _score_chunk(_WORKER_MODEL, chunk, id_column, with_proba) if len(chunk) else None
+
+    return out, counts, quarantined
+
+
+def _keep(id_column: str | None) -> tuple:
+    return (id_column,) if id_column else ()
+
+
+def open_schema(model_path: str) -> FeatureSchema | None:
+    """
+    Loads the feature schema stored next to the model.
+
+    :param model_path: Path to the joblib model or scorer artifact
+    :return: Schema, or None if the model has none
+    """
+    path = schema_path(model_path)
+    if not os.path.exists(path):
+        print(f"No hay esquema de variables en {path}; la entrada se lee sin validar.")
+        return None
+
+    return FeatureSchema.load(path)
+
+
+def read_samples(samples_file: str, schema: FeatureSchema | None = None, id_column: str | None = None) -> pd.DataFrame:
+    """
+    Reads the whole samples file (or the default samples), with the feature schema if there is one.
+
+    :param samples_file: Path to the CSV file with the samples; the default samples are used if it does not exist
+    :param schema: Feature schema of the model
+    :param id_column: Column holding the row ids, kept by the schema reader
+    :return: DataFrame with the samples
+    """
+    if not (samples_file and os.path.exists(samples_file)):
+        X = default_samples()
+        return schema.conform(X) if schema is not None else X
+
+    return schema.read_csv(samples_file, _keep(id_column)) if schema is not None else pd.read_csv(samples_file)
+
+
+def validate_chunk(chunk: pd.DataFrame, schema: FeatureSchema,
+                   id_column: str | None = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Splits a conformed chunk into the rows to score and the quarantined ones.
+
+    :param chunk: DataFrame read with the schema
+    :param schema: Feature schema of the model
+    :param id_column: Column holding the row ids; without it, the source row number is kept as `row_id`
+    :return: Tuple of the valid rows and the quarantined rows with their ids and `quarantine_reason`
+    """
+    valid, quarantined = schema.split(chunk)
+    if not id_column:
+        quarantined = quarantined.reset_index(names = "row_id")
+
+    return valid, quarantined
+
+
+def validated_chunks(chunks, schema: FeatureSchema | None, quarantine: PredictionWriter | None,
+                     id_column: str | None = None) -> Iterator[pd.DataFrame]:
+    """
+    Validates each chunk against the schema, appending the quarantined rows to `quarantine`.
+
+    :param chunks: Iterable of conformed DataFrames
+    :param schema: Feature schema of the model; if None, chunks pass through unchanged
+    :param quarantine: CSV writer of the quarantined rows
+    :param id_column: Column holding the row ids
+    :return: Iterator over the non-empty chunks of valid rows
+    """
+    for chunk in chunks:
+        if schema is not None:
+            chunk, quarantined = validate_chunk(chunk, schema, id_column)
+            if len(quarantined):
+                quarantine.write(quarantined)
+        if len(chunk):
+            yield chunk
+
+
+def _write_scored(scored: Iterator[pd.DataFrame], output_csv: str, output_format: str = "csv") -> int:
+    """
+    Appends scored chunks to `output_csv` as they arrive and reports the throughput.
+
+    :param scored: Iterator of DataFrames with ids and predictions, in input order
+    :param output_csv: File path where the predictions will be written
+    :param output_format: One of `PREDICTION_FORMATS`; each chunk becomes a row group/record batch
+    :return: Total number of written rows
+    """
+    start = time.perf_counter()
+    with PredictionWriter(output_csv, output_format) as writer:
+        for i, out in enumerate(scored):
+            writer.write(out)
+
+            elapsed = time.perf_counter() - start
+            print(f"Chunk {i}: {writer.n_rows} filas ({writer.n_rows / max(elapsed, 1e-9):.0f} filas/s)")
+
+    return writer.n_rows
+
+
+def predict_chunks(model, chunks, output_csv: str, id_column: str | None = None, output_format: str = "csv",
+                   sketch: DriftSketch | None = None, with_proba: bool = False) -> int:
+    """
+    Scores an iterable of chunks and appends each chunk's predictions to `output_csv` as soon as it is done.
+
+    Memory is bounded by the chunk size. The output keeps the input row order and carries either
+    `id_column` or the source row number as `row_id`.
+
+    :param model: Trained model exposing `predict`
+    :param chunks: Iterable of DataFrames with the samples
+    :param output_csv: File path where the predictions will be written
+    :param id_column: Column holding the row ids; it is not passed to the model
+    :param output_format: One of `PREDICTION_FORMATS`
+    :param sketch: Drift sketch updated with every chunk, in the same pass
+    :param with_proba: Also write one `proba_<class>` column per class
+    :return: Total number of scored rows
+    """
+    def scored() -> Iterator[pd.DataFrame]:
+        for chunk in chunks:
+            if sketch is not None:
+                sketch.update(chunk)
+            yield _score_chunk(model, chunk, id_column, with_proba)
+
+    return _write_scored(scored(), output_csv, output_format)
+
+
+def predict_parallel(model_path: str, samples_file: str, output_csv: str, chunksize: int, workers: int,
+                     id_column: str | None = None, mmap_mode: str | None = None, output_format: str = "csv",
+                     sketch: DriftSketch | None = None, schema: FeatureSchema | None = None,
+                     quarantine: PredictionWriter | None = None, with_proba: bool = False) -> int:
+    """
+    Scores a samples file on a pool of worker processes, each one holding its own copy of the model.
+
+    Blocks of raw lines are fanned out to the workers, which parse and score them; at most
+    `2 * workers` blocks are in flight, and results are written back in input order.
+
+    :param model_path: Path to the joblib model or scorer artifact
+    :param samples_file: Path to the CSV file with the samples
+    :param output_csv: File path where the predictions will be written
+    :param chunksize: Number of rows per block
+    :param workers: Number of worker processes
+    :param id_column: Column holding the row ids; it is not passed to the model
+    :param mmap_mode: Memory-map mode for uncompressed joblib models, e.g. "r"
+    :param output_format: One of `PREDICTION_FORMATS`
+    :param sketch: Drift sketch; each worker histograms its blocks and the counts are merged here
+    :param schema: Feature schema; workers parse and validate their blocks with it
+    :param quarantine: CSV writer of the rows quarantined by the workers
+    :param with_proba: Also write one `proba_<class>` column per class
+    :return: Total number of scored rows
+    """
+    reference = sketch.reference if sketch is not None else None
+
+    def collect(future) -> Iterator[pd.DataFrame]:
+        out, counts, quarantined = future.result()
+        if sketch is not None:
+            sketch.merge(counts)
+        if quarantined is not None and len(quarantined):
+            quarantine.write(quarantined)
+        if out is not None:
+            yield out
+
+    def scored() -> Iterator[pd.DataFrame]:
+        with ProcessPoolExecutor(max_workers = workers, initializer = _init_worker,
+                                 initargs = (model_path, mmap_mode, reference, schema)) as pool:
+            pending = deque()
+            for start, header, text in iter_raw_chunks(samples_file, chunksize):
+                pending.append(pool.submit(_score_raw_chunk, start, header, text, id_column, with_proba))
+                if len(pending) >= 2 * workers:
+                    yield from collect(pending.popleft())
+            while pending:
+                yield from collect(pending.popleft())
+
+    return _write_scored(scored(), output_csv, output_format)
+
+
+def model_labels(paths: Sequence[str]) -> list:
+    """
+    Short names for model artifacts, taken from their directories (e.g. `latest`, `20240101-120000`).
+
+    :param paths: Paths to the model or scorer artifacts
+    :return: One unique name per path
+    """
+    labels = []
+    for path in paths:
+        label = os.path.basename(os.path.dirname(os.path.abspath(path))) or "model"
+        labels.append(label if label not in labels else f"{label}_{len(labels)}")
+
+    return labels
+
+
+def compare_chunks(models: Dict[str, Any], chunks, output_csv: str, id_column: str | None = None,
+                   output_format: str = "csv", sketch: DriftSketch | None = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Scores every model on each chunk and writes their predictions side by side.
+
+    Each chunk is parsed once and shared by all models. Linear models (joblib or scorer artifacts)
+    are stacked into one `StackedLinearScorer`, so they cost a single matrix multiply per chunk,
+    whose time is split evenly among them; the rest, including bare estimators fitted without
+    column names, are scored one by one. The first model is the champion the others are compared with.
+
+    :param models: Dictionary name -> loaded model, champion first
+    :param chunks: Iterable of DataFrames with the samples
+    :param output_csv: File path where the predictions will be written
+    :param id_column: Column holding the row ids; it is not passed to the models
+    :param output_format: One of `PREDICTION_FORMATS`
+    :param sketch: Drift sketch updated with every chunk, in the same pass
+    :return: Dictionary name -> `agreement` with the champion, `proba_mae` against it, `seconds`, `rows_per_s` and `stacked`
+    """
+    names = list(models)
+    scorers = {}
+    for name, model in models.items():
+        if isinstance(model, LinearScorer):
+            scorers[name] = model
+        elif getattr(model, "scaler", None) is not None or hasattr(model, "feature_names_in_"):
+            # Without a scaler or `feature_names_in_` the scorer would select made-up x0..xN columns
+            try:
+                scorers[name] = LinearScorer.from_model(model)
+            except (ValueError, AttributeError):
+                pass
+    stacked = StackedLinearScorer(list(scorers.values())) if scorers else None
+    summary = {name: {"agreement": 0.0, "proba_mae": 0.0, "seconds": 0.0, "stacked": name in scorers} for name in names}
+    n_rows = 0
+
+    def scored() -> Iterator[pd.DataFrame]:
+        nonlocal n_rows
+        for chunk in chunks:
+            if sketch is not None:
+                sketch.update(chunk)
+            if id_column:
+                ids = chunk[id_column]
+                chunk = chunk.drop(columns = [id_column])
+            else:
+                ids = chunk.index
+
+            results = {}
+            if stacked is not None:
+                start = time.perf_counter()
+                outputs = stacked.score(chunk)
+                share = (time.perf_counter() - start) / len(scorers)
+                for name, out in zip(scorers, outputs):
+                    results[name] = out
+                    summary[name]["seconds"] += share
+            for name in names:
+                if name not in results:
+                    start = time.perf_counter()
+                    results[name] = _predict_with_proba(models[name], chunk)
+                    summary[name]["seconds"] += time.perf_counter() - start
+
+            champion_preds, champion_proba = results[names[0]]
+            frame = {id_column or "row_id": np.asarray(ids)}
+            for name in names:
+                preds, proba = results[name]
+                summary[name]["agreement"] += float(np.sum(preds == champion_preds))
+                if proba is not None and champion_proba is not None and proba.shape == champion_proba.shape:
+                    summary[name]["proba_mae"] += float(np.abs(proba - champion_proba).mean(axis = 1).sum())
+                frame[f"prediction_{name}"] = preds
+                classes = _classes(models[name])
+                if proba is not None and classes is not None:
+                    for j, c in enumerate(classes):
+                        frame[f"proba_{c}_{name}"] = proba[:, j]
+            n_rows += len(chunk)
+            yield pd.DataFrame(frame)
+
+    _write_scored(scored(), output_csv, output_format)
+    for name in names:
+        summary[name]["agreement"] /= max(n_rows, 1)
+        summary[name]["proba_mae"] /= max(n_rows, 1)
+        summary[name]["rows_per_s"] = n_rows / max(summary[name]["seconds"], 1e-9)
+
+    return summary
+
+
+def format_comparison(summary: Dict[str, Dict[str, Any]]) -> list:
+    """
+    Summarizes a model comparison as printable lines.
+
+    :param summary: Summary returned by `compare_chunks`
+    :return: Lines of text
+    """
+    width = max(12, *(len(name) for name in summary))
+    lines = [f"{'modelo':>{width}} {'acuerdo':>8} {'mae_proba':>10} {'seconds':>8} {'filas/s':>12} {'apilado':>8}"]
+    lines += [f"{name:>{width}} {s['agreement']:>8.2%} {s['proba_mae']:>10.4f} {s['seconds']:>8.3f} "
+              f"{s['rows_per_s']:>12.0f} {'si' if s['stacked'] else 'no':>8}" for name, s in summary.items()]
+
+    return lines
+
+
+def open_drift_sketch(model_path: str) -> DriftSketch | None:
+    """
+    Starts a drift sketch over the reference stored next to the model.
+
+    :param model_path: Path to the joblib model or scorer artifact
+    :return: Empty sketch, or None if the model has no drift reference
+    """
+    path = reference_path(model_path)
+    if not os.path.exists(path):
+        print(f"No hay referencia de deriva en {path}; se omite el reporte.")
+        return None
+
+    return DriftSketch(DriftReference.load(path))
+
+
+def write_drift_report(sketch: DriftSketch | None, path: str):
+    """
+    Saves the drift report of a finished scoring pass as JSON and prints its summary.
+
+    :param sketch: Sketch updated during scoring, or None
+    :param path: Destination JSON file
+    """
+    if sketch is None:
+        return
+    report = sketch.report()
+    with open(path, "w", encoding = "utf-8") as f:
+        json.dump(report, f, indent = 2)
+    print("\n------ Deriva de las variables ------")
+    print("\n".join(format_report(report)))
+    print(f"Reporte de deriva guardado en: {path}")
+
+
+def iter_samples(args: argparse.Namespace, schema: FeatureSchema | None = None) -> Iterator[pd.DataFrame]:
+    """
+    Chunks of the samples file given on the command line: streamed when `--chunksize` is set, otherwise
+    the whole file (or the default samples) as a single chunk.
+
+    :param args: Parsed command line arguments
+    :param schema: Feature schema of the model
+    :return: Iterator over the chunks
+    """
+    if args.chunksize > 0 and args.samples_file and os.path.exists(args.samples_file):
+        if schema is not None:
+            return schema.iter_csv(args.samples_file, args.chunksize, _keep(args.id_column))
+        return iter_chunks(args.samples_file, args.chunksize)
+
+    return iter([read_samples(args.samples_file, schema, args.id_column)])
+
+
+def print_cache_report(cache: PredictionCache | None):
+    """
+    Prints the hit rates of the prediction cache and closes it.
+
+    :param cache: Cache used for scoring, or None if it was disabled
+    """
+    if cache is None:
+        return
+    report = cache.report()
+    cache.close()
+    print("\n------ Cache de predicciones ------")
+    print(f"Filas: {report['rows']} | unicas: {report['unique_rows']} | aciertos memoria: {report['memory_hits']} | "
+          f"aciertos disco: {report['disk_hits']} | puntuadas: {report['misses']}")
+    print(f"Tasa de aciertos: {report['hit_rate']:.1%} | tiempo ahorrado estimado: {report['seconds_saved']:.3f} s")
+
+
 def main():
     """
     Main function to perform inference using a trained model (joblib).
@@ -13,37 +517,144 @@ def main():
     parser.add_argument("--model_path", type = str, default = "artifacts/latest/model.joblib")
     parser.add_argument("--samples_file", type = str, default = "")
     parser.add_argument("--output_csv", type = str, default = "artifacts/latest/predictions.csv")
+    parser.add_argument("--chunksize", type = int, default = 0,
+                        help = "Filas por bloque; si es mayor que 0 el archivo se procesa en streaming")
+    parser.add_argument("--id_column", type = str, default = None, help = "Columna con el id de cada fila, copiada a la salida")
+    parser.add_argument("--scorer_path", type = str, default = "",
+                        help = "Artefacto scorer.npz; si se indica, puntua con NumPy en lugar del modelo joblib")
+    parser.add_argument("--mmap", action = "store_true",
+                        help = "Carga el modelo con memoria mapeada (artefactos sin compresion)")
+    parser.add_argument("--workers", type = int, default = 1,
+                        help = "Procesos para puntuar en paralelo (modo streaming; usa 10000 filas por bloque si no hay --chunksize)")
+    parser.add_argument("--output_format", type = str, choices = PREDICTION_FORMATS, default = "csv",
+                        help = "Formato de salida; parquet/arrow/npy incluyen probabilidades e ids en binario")
+    parser.add_argument("--proba", action = "store_true",
+                        help = "Incluye las columnas proba_<clase> tambien en la salida CSV")
+    parser.add_argument("--drift_report", type = str, default = "",
+                        help = "Compara las entradas con la referencia de entrenamiento y guarda el reporte JSON aqui")
+    parser.add_argument("--profile", type = str, default = "",
+                        help = "Mide cada etapa y escribe la traza (formato Chrome trace) en este archivo JSON")
+    parser.add_argument("--challengers", type = str, nargs = "+", default = [],
+                        help = "Modelos retadores; se puntuan junto al modelo principal en una sola pasada")
+    parser.add_argument("--compare_report", type = str, default = "",
+                        help = "Guarda aqui el resumen JSON de acuerdo y latencia por modelo (con --challengers)")
+    parser.add_argument("--no_schema", action = "store_true",
+                        help = "Lee la entrada sin el esquema de variables del modelo (sin validacion ni cuarentena)")
+    parser.add_argument("--quarantine_path", type = str, default = "",
+                        help = "CSV de filas invalidas; por defecto <salida>.quarantine.csv")
+    parser.add_argument("--cache", action = "store_true",
+                        help = "Deduplica filas repetidas y reutiliza predicciones en cache (no admite --workers)")
+    parser.add_argument("--cache_size", type = int, default = 100_000, help = "Filas en la cache en memoria (LRU)")
+    parser.add_argument("--cache_db", type = str, default = "",
+                        help = "Archivo SQLite para persistir la cache entre ejecuciones (implica --cache)")
     args = parser.parse_args()
+    profiler = Profiler(enabled = bool(args.profile))
+    quarantine = None
 
-    if not os.path.exists(args.model_path):
-        raise FileNotFoundError(f"No existe el modelo en {args.model_path}. Corre 'make train' primero.")
+    try:
+        if args.scorer_path and not os.path.exists(args.scorer_path):
+            raise FileNotFoundError(f"No existe el scorer en {args.scorer_path}. Corre 'make train' primero.")
+        if not args.scorer_path and not os.path.exists(args.model_path):
+            raise FileNotFoundError(f"No existe el modelo en {args.model_path}. Corre 'make train' primero.")
 
-    model = load_model(args.model_path)
+        output_path = args.output_csv
+        if output_path.endswith(".csv") and args.output_format != "csv":
+            output_path = output_path[:-len(".csv")] + PREDICTION_EXTENSIONS[args.output_format]
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok = True)
+        sketch = open_drift_sketch(args.scorer_path or args.model_path) if args.drift_report else None
+        schema = None if args.no_schema else open_schema(args.scorer_path or args.model_path)
+        if schema is not None:
+            quarantine = PredictionWriter(args.quarantine_path or quarantine_path(output_path), "csv")
+            if os.path.exists(quarantine.path):
+                os.remove(quarantine.path)
+        has_samples = bool(args.samples_file) and os.path.exists(args.samples_file)
+        with_proba = args.proba or args.output_format != "csv"
 
-    if args.samples_file and os.path.exists(args.samples_file):
-        X = pd.read_csv(args.samples_file)
-    else:
-        X = pd.DataFrame({"CRIM": [0.03, 0.1],
-                          "ZN": [18.0, 0.0],
-                          "INDUS": [2.31, 7.07],
-                          "CHAS": [0, 0],
-                          "NOX": [0.538, 0.469],
-                          "RM": [6.575, 6.0],
-                          "AGE": [65.2, 68.2],
-                          "DIS": [4.09, 3.5],
-                          "RAD": [1, 2],
-                          "TAX": [296, 242],
-                          "PTRATIO": [15.3, 17.8],
-                          "B": [396.9, 392.8],
-                          "LSTAT": [4.98, 9.14]})
-
-    preds = model.predict(X)
-    print("Predicciones:", preds)
-
-    os.makedirs(os.path.dirname(args.output_csv), exist_ok = True)
-    pd.DataFrame({"prediction": preds}).to_csv(args.output_csv, index = False)
-    print(f"Predicciones guardadas en: {args.output_csv}")
+        if args.challengers:
+            if args.workers > 1 or args.cache or args.cache_db:
+                raise ValueError("--challengers no admite --workers ni --cache/--cache_db: todos los modelos se "
+                                 "puntuan juntos en un solo proceso.")
+            paths = [args.scorer_path or args.model_path] + args.challengers
+            for path in args.challengers:
+                if not os.path.exists(path):
+                    raise FileNotFoundError(f"No existe el modelo retador en {path}.")
+            with profiler.span("load_model"):
+                models = dict(zip(model_labels(paths), (load_predictor(p, "r" if args.mmap else None) for p in paths)))
+            with profiler.span("compare_models"):
+                summary = compare_chunks(models, validated_chunks(iter_samples(args, schema), schema, quarantine,
+                                                                  args.id_column),
+                                         output_path, args.id_column, args.output_format, sketch)
+            print(f"Predicciones por modelo guardadas en: {output_path}")
+            print(f"\n------ Campeon ({next(iter(models))}) vs retadores ------")
+            print("\n".join(format_comparison(summary)))
+            if args.compare_report:
+                with open(args.compare_report, "w", encoding = "utf-8") as f:
+                    json.dump(summary, f, indent = 2)
+                print(f"Resumen guardado en: {args.compare_report}")
+            write_drift_report(sketch, args.drift_report)
+            return
+
+        if args.workers > 1 and has_samples:
+            if args.cache or args.cache_db:
+                raise ValueError("--workers no admite --cache/--cache_db: la cache vive en un solo proceso; "
+                                 "usa --workers 1 para reutilizar predicciones.")
+            with profiler.span("predict_parallel"):
+                n_rows = predict_parallel(args.scorer_path or args.model_path, args.samples_file, output_path,
+                                          args.chunksize or 10_000, args.workers, args.id_column,
+                                          "r" if args.mmap else None, args.output_format, sketch, schema, quarantine,
+                                          with_proba)
+            print(f"{n_rows} predicciones guardadas en: {output_path}")
+            write_drift_report(sketch, args.drift_report)
+            return
+
+        with profiler.span("load_model"):
+            model = load_predictor(args.scorer_path or args.model_path, "r" if args.mmap else None)
+        cache = None
+        if args.cache or args.cache_db:
+            cache = PredictionCache(model_checksum(args.scorer_path or args.model_path), args.cache_size,
+                                    args.cache_db or None)
+            model = CachedModel(model, cache)
+
+        if args.chunksize > 0 and has_samples:
+            with profiler.span("predict_stream"):
+                n_rows = predict_chunks(model, validated_chunks(iter_samples(args, schema), schema, quarantine,
+                                                                args.id_column),
+                                        output_path, args.id_column, args.output_format, sketch, with_proba)
+            print(f"{n_rows} predicciones guardadas en: {output_path}")
+            write_drift_report(sketch, args.drift_report)
+            print_cache_report(cache)
+            return
+
+        with profiler.span("load_data"):
+            X = read_samples(args.samples_file, schema, args.id_column)
+            X = next(validated_chunks([X], schema, quarantine, args.id_column), None)
+            if X is None:
+                print("Ninguna fila paso la validacion del esquema; no hay predicciones.")
+                return
+            if args.id_column and args.id_column in X.columns:
+                X = X.set_index(args.id_column)
+            if sketch is not None:
+                sketch.update(X)
+
+        with profiler.span("predict"):
+            preds, proba = _predict_with_proba(model, X) if with_proba else (model.predict(X), None)
+        print("Predicciones:", preds)
+
+        with profiler.span("save_predictions"):
+            # A plain CSV keeps the single `prediction` column unless ids were asked for
+            row_ids = X.index if args.id_column or args.output_format != "csv" else None
+            save_predictions(preds, output_path, output_format = args.output_format, proba = proba,
+                             classes = _classes(model), row_ids = row_ids, id_name = args.id_column or "row_id")
+        print(f"Predicciones guardadas en: {output_path}")
+        write_drift_report(sketch, args.drift_report)
+        print_cache_report(cache)
+    finally:
+        if quarantine is not None and quarantine.n_rows:
+            print(f"{quarantine.n_rows} filas invalidas en cuarentena: {quarantine.path}")
+        if profiler.enabled:
+            profiler.write_trace(args.profile)
+            print(f"\n------ Perfil por etapa ------\n{profiler.summary()}\nTraza guardada en: {args.profile}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,258 @@
+from __future__ import annotations
+from src.io_utils import read_manifest, file_sha256
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+import pandas as pd
+import numpy as np
+import sqlite3
+import time
+import os
+
+
+def model_checksum(model_path: str) -> str:
+    """
+    Checksum of the artifact a path currently resolves to (e.g. through `artifacts/latest`).
+
+    :param model_path: Path to the model or scorer artifact
+    :return: SHA-256 from the artifact manifest, or computed from the file
+    """
+    path = os.path.realpath(model_path)
+    manifest = read_manifest(path)
+
+    return manifest["sha256"] if manifest else file_sha256(path)
+
+
+def canonical_rows(X: pd.DataFrame, feature_names) -> np.ndarray:
+    """
+    Feature rows as contiguous float64 with -0.0 and NaN payloads normalized, so equal rows have equal bytes.
+
+    :param X: DataFrame containing `feature_names`
+    :param feature_names: Feature order of the model
+    :return: Array of shape (n_rows, n_features)
+    """
+    # Adding 0.0 turns -0.0 into 0.0 and yields a fresh, writable array even when pandas hands back a read-only view
+    values = np.ascontiguousarray(X[list(feature_names)].to_numpy(dtype = np.float64) + 0.0)
+    values[np.isnan(values)] = np.nan
+
+    return values
+
+
+def row_hashes(rows: np.ndarray) -> np.ndarray:
+    """
+    Vectorized 64-bit hash of each row of a canonical float64 matrix.
+
+    :param rows: Array returned by `canonical_rows`
+    :return: Array of uint64, one per row
+    """
+    words = rows.view(np.uint64)
+    multipliers = (np.arange(words.shape[1], dtype = np.uint64) * np.uint64(0x9E3779B97F4A7C15)) | np.uint64(1)
+    h = (words * multipliers).sum(axis = 1, dtype = np.uint64)
+    h ^= h >> np.uint64(31)
+    h *= np.uint64(0xBF58476D1CE4E5B9)
+    h ^= h >> np.uint64(29)
+
+    return h
+
+
+def unique_rows(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Deduplicates the rows of a canonical matrix by their hash, falling back to comparing raw bytes on a collision.
+
+    :param rows: Array returned by `canonical_rows`
+    :return: Tuple of the index of the first occurrence of each distinct row and, per row, its position among them
+    """
+    _, first, inverse = np.unique(row_hashes(rows), return_index = True, return_inverse = True)
+    if not np.array_equal(rows.view(np.uint64)[first][inverse], rows.view(np.uint64)):
+        row_bytes = rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).ravel()
+        _, first, inverse = np.unique(row_bytes, return_index = True, return_inverse = True)
+
+    return first, inverse
+
+
+class PredictionCache:
+    """
+    Row-level cache of predictions and class probabilities for one model artifact.
+
+    Each batch is deduplicated with one `np.unique` pass over a vectorized hash of its rows; only
+    rows missing from both tiers are scored. Entries live in a bounded in-memory LRU and,
+    optionally, in a SQLite file shared across runs. Keys include the model checksum, and
+    entries of any other model are dropped when the cache is opened or the model changes.
+    """
+    def __init__(self, checksum: str, max_entries: int = 100_000, db_path: str | None = None):
+        self.checksum = checksum
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self._memory: OrderedDict[bytes, Tuple[Any, np.ndarray | None]] = OrderedDict()
+        self._db = None
+        self.stats = {"rows": 0, "unique_rows": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0,
+                      "scoring_seconds": 0.0, "lookup_seconds": 0.0, "skipped_calls": 0}
+        self._calls: List[Tuple[int, float]] = []
+        if db_path:
+            self._db = sqlite3.connect(db_path)
+            self._db.execute("CREATE TABLE IF NOT EXISTS predictions "
+                             "(model TEXT, key BLOB, prediction BLOB, proba BLOB, PRIMARY KEY (model, key))")
+            self._purge_other_models()
+
+
+    def _purge_other_models(self):
+        if self._db is not None:
+            with self._db:
+                self._db.execute("DELETE FROM predictions WHERE model != ?", (self.checksum,))
+
+
+    def ensure_model(self, checksum: str):
+        """"
+        Switches the cache to another model artifact, dropping every entry of the previous one.
+
+        :param checksum: Checksum of the model now being served
+        """
+        if checksum != self.checksum:
+            self.checksum = checksum
+            self._memory.clear()
+            self._purge_other_models()
+
+
+    def _get_memory(self, key: bytes):
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+        return entry
+
+
+    def _put_memory(self, key: bytes, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last = False)
+
+
+    def _get_disk(self, keys: List[bytes]) -> Dict[bytes, Tuple[Any, np.ndarray | None]]:
+        found = {}
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            rows = self._db.execute(f"SELECT key, prediction, proba FROM predictions WHERE model = ? AND key IN "
+                                    f"({','.join('?' * len(batch))})", (self.checksum, *batch)).fetchall()
+            for key, pred, proba in rows:
+                found[key] = (np.frombuffer(pred, dtype = np.float64)[0] if pred is not None else None,
+                              np.frombuffer(proba, dtype = np.float64) if proba is not None else None)
+        return found
+
+
+    def score(self, model, X: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray | None]:
+        """"
+        Predicts a batch, scoring only the distinct rows that are not cached yet.
+
+        :param model: Model exposing `predict` (and `predict_proba`, if available)
+        :param X: DataFrame with the samples
+        :return: Tuple of predictions and class probabilities (None if the model has no `predict_proba`)
+        """
+        lookup_start = time.perf_counter()
+        feature_names = getattr(model, "feature_names", None) or list(getattr(model, "feature_names_in_", X.columns))
+        rows = canonical_rows(X, feature_names)
+        first, inverse = unique_rows(rows)
+        keys = [r.tobytes() for r in rows[first]]
+
+        entries: List[Tuple[Any, np.ndarray | None] | None] = [self._get_memory(k) for k in keys]
+        memory_hits = sum(e is not None for e in entries)
+        disk_hits = 0
+        if self._db is not None and memory_hits < len(keys):
+            found = self._get_disk([k for k, e in zip(keys, entries) if e is None])
+            for i, k in enumerate(keys):
+                if entries[i] is None and k in found:
+                    entries[i] = found[k]
+                    self._put_memory(k, found[k])
+                    disk_hits += 1
+
+        missing = [i for i, e in enumerate(entries) if e is None]
+        scoring_seconds = 0.0
+        if missing:
+            start = time.perf_counter()
+            batch = pd.DataFrame(rows[first[missing]], columns = feature_names)
+            preds = model.predict(batch)
+            proba = model.predict_proba(batch) if hasattr(model, "predict_proba") else None
+            scoring_seconds = time.perf_counter() - start
+            self._calls.append((len(missing), scoring_seconds))
+            stored = []
+            for j, i in enumerate(missing):
+                entries[i] = (preds[j], None if proba is None else proba[j])
+                self._put_memory(keys[i], entries[i])
+                stored.append((self.checksum, keys[i], np.float64(preds[j]).tobytes(),
+                               None if proba is None else np.ascontiguousarray(proba[j], dtype = np.float64).tobytes()))
+            if self._db is not None:
+                with self._db:
+                    self._db.executemany("INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?)", stored)
+
+        self.stats["rows"] += len(X)
+        self.stats["unique_rows"] += len(keys)
+        self.stats["memory_hits"] += memory_hits
+        self.stats["disk_hits"] += disk_hits
+        self.stats["misses"] += len(missing)
+        self.stats["skipped_calls"] += not missing
+        self.stats["scoring_seconds"] += scoring_seconds
+
+        unique_preds = np.array([e[0] for e in entries])
+        preds = unique_preds[inverse]
+        classes = getattr(model, "classes_", getattr(model, "classes", None))
+        if classes is not None:
+            preds = preds.astype(np.asarray(classes).dtype)
+        proba = None
+        if entries and entries[0][1] is not None:
+            proba = np.vstack([e[1] for e in entries])[inverse]
+        self.stats["lookup_seconds"] += time.perf_counter() - lookup_start - scoring_seconds
+
+        return preds, proba
+
+
+    def report(self) -> Dict[str, float]:
+        """"
+        Hit rates and the scoring time saved.
+
+        The model cost is fitted as `per_call + per_row * n` over the scoring calls made so far
+        (all per-call when every call had the same size); the saving is the cost of the rows and
+        calls that were not scored, minus the time spent hashing and looking rows up.
+
+        :return: Dictionary with the counters, `hit_rate` (rows not scored) and `seconds_saved`
+        """
+        stats = dict(self.stats)
+        rows = max(stats["rows"], 1)
+        stats["hit_rate"] = 1 - stats["misses"] / rows
+        stats["dedup_rate"] = 1 - stats["unique_rows"] / rows
+        per_call, per_row = 0.0, 0.0
+        if self._calls:
+            sizes, seconds = np.array(self._calls, dtype = np.float64).T
+            if len(np.unique(sizes)) > 1:
+                per_row, per_call = np.maximum(np.polyfit(sizes, seconds, 1), 0.0)
+            else:
+                per_call = float(seconds.mean())
+        saved = stats["skipped_calls"] * per_call + (stats["rows"] - stats["misses"]) * per_row
+        stats["seconds_saved"] = float(saved - stats["lookup_seconds"])
+
+        return stats
+
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class CachedModel:
+    """
+    Wraps a model so that `predict`/`predict_proba` go through a `PredictionCache`.
+
+    `predict_with_proba` returns both from a single cache pass; chunked scoring uses it when present.
+    """
+    def __init__(self, model, cache: PredictionCache):
+        self.model = model
+        self.cache = cache
+        self.classes_ = getattr(model, "classes_", getattr(model, "classes", None))
+        if hasattr(model, "predict_proba"):
+            self.predict_proba = lambda X: self.cache.score(self.model, X)[1]
+
+
+    def predict_with_proba(self, X: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray | None]:
+        return self.cache.score(self.model, X)
+
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        return self.cache.score(self.model, X)[0]
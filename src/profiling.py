@@ -0,0 +1,180 @@
+from __future__ import annotations
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterator, List
+import tracemalloc
+import functools
+import threading
+import time
+import json
+import os
+
+try:
+    import resource
+except ImportError:  # Windows: only wall/CPU time and the tracemalloc peak are reported
+    resource = None
+
+
+_DISABLED = nullcontext()
+
+
+def _rss_mb() -> float:
+    """
+    Current resident set size of the process, in MB (0 where `/proc` is not available).
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024**2
+    except OSError:
+        return 0.0
+
+
+def _max_rss_mb() -> float:
+    """
+    Peak resident set size of the process so far, in MB (0 where `resource` is not available).
+    """
+    if resource is None:
+        return 0.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Profiler:
+    """
+    Records timing and memory spans around pipeline stages.
+
+    Each span stores its wall time, CPU time, RSS delta, growth of the process peak RSS and, with
+    `trace_memory`, the peak of the Python allocations traced by `tracemalloc` above the span's
+    starting point. Spans nest. A disabled profiler hands out one shared no-op context manager,
+    so instrumented code costs a method call per stage. If the profiler started `tracemalloc`,
+    `close()` (or leaving its `with` block) stops it again.
+    """
+    def __init__(self, enabled: bool = True, trace_memory: bool = False):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.spans: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+
+    def __enter__(self) -> "Profiler":
+        return self
+
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+    def close(self):
+        """"
+        Stops `tracemalloc` if this profiler started it; recorded spans are kept.
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+    def span(self, name: str):
+        """"
+        Context manager measuring the enclosed block.
+
+        :param name: Stage name
+        :return: Context manager
+        """
+        if not self.enabled:
+            return _DISABLED
+        return self._span(name)
+
+
+    @contextmanager
+    def _span(self, name: str) -> Iterator[Dict[str, Any]]:
+        record = {"name": name, "depth": len(self._stack)}
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1]["_traced_peak"] = max(self._stack[-1]["_traced_peak"], peak)
+            tracemalloc.reset_peak()
+            record["_traced_start"], record["_traced_peak"] = current, current
+        self._stack.append(record)
+
+        rss, max_rss = _rss_mb(), _max_rss_mb()
+        cpu, start = time.process_time(), time.perf_counter()
+        try:
+            yield record
+        finally:
+            end = time.perf_counter()
+            record["start_s"] = start - self._origin
+            record["wall_s"] = end - start
+            record["cpu_s"] = time.process_time() - cpu
+            record["rss_delta_mb"] = _rss_mb() - rss
+            record["peak_rss_delta_mb"] = _max_rss_mb() - max_rss
+            self._stack.pop()
+            if self.trace_memory:
+                peak = max(record.pop("_traced_peak"), tracemalloc.get_traced_memory()[1])
+                record["traced_peak_mb"] = (peak - record.pop("_traced_start")) / 1024**2
+                if self._stack:
+                    self._stack[-1]["_traced_peak"] = max(self._stack[-1]["_traced_peak"], peak)
+            self.spans.append(record)
+
+
+    def wrap(self, name: str | None = None) -> Callable:
+        """"
+        Decorator that runs the function inside a span.
+
+        :param name: Stage name; defaults to the function name
+        :return: Decorator
+        """
+        def decorator(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(name or fn.__name__):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+
+    def metrics(self) -> Dict[str, float]:
+        """"
+        Flattens the spans into MLflow metric names, `span.<name>.<measure>`; repeated spans are summed.
+
+        :return: Dictionary metric name -> value
+        """
+        metrics: Dict[str, float] = {}
+        for record in self.spans:
+            for key in ("wall_s", "cpu_s", "rss_delta_mb", "peak_rss_delta_mb", "traced_peak_mb"):
+                if key in record:
+                    name = f"span.{record['name']}.{key}"
+                    metrics[name] = metrics.get(name, 0.0) + record[key]
+
+        return metrics
+
+
+    def write_trace(self, path: str):
+        """"
+        Writes the spans in Chrome trace format (open it in chrome://tracing or Perfetto).
+
+        :param path: Destination JSON file
+        """
+        pid, tid = os.getpid(), threading.get_ident()
+        events = [{"name": r["name"], "ph": "X", "ts": r["start_s"] * 1e6, "dur": r["wall_s"] * 1e6,
+                   "pid": pid, "tid": tid,
+                   "args": {k: v for k, v in r.items() if k not in ("name", "start_s", "depth")}}
+                  for r in sorted(self.spans, key = lambda r: r["start_s"])]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok = True)
+        with open(path, "w", encoding = "utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, indent = 2)
+
+
+    def summary(self) -> str:
+        """"
+        Human-readable table of the spans, indented by nesting depth.
+
+        :return: Table as a string
+        """
+        lines = [f"{'span':<28} {'wall_s':>8} {'cpu_s':>8} {'rss_mb':>8}"]
+        for r in sorted(self.spans, key = lambda r: r["start_s"]):
+            name = "  " * r["depth"] + r["name"]
+            lines.append(f"{name:<28} {r['wall_s']:>8.3f} {r['cpu_s']:>8.3f} {r['rss_delta_mb']:>8.1f}")
+
+        return "\n".join(lines)
@@ -0,0 +1,303 @@
+from __future__ import annotations
+from src.io_utils import timestamped_dir, ensure_latest_symlink, read_manifest
+from typing import Any, Dict, List, Sequence
+import argparse
+import sqlite3
+import math
+import shutil
+import time
+import json
+import os
+
+
+REGISTRY_FILENAME = "registry.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL UNIQUE,
+    run_id TEXT,
+    created_at REAL NOT NULL,
+    size_bytes INTEGER NOT NULL DEFAULT 0,
+    sha256 TEXT,
+    promoted_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_created ON artifacts (created_at);
+CREATE INDEX IF NOT EXISTS idx_artifacts_run ON artifacts (run_id);
+CREATE TABLE IF NOT EXISTS metrics (
+    artifact_id INTEGER NOT NULL REFERENCES artifacts (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (artifact_id, name)
+);
+CREATE INDEX IF NOT EXISTS idx_metrics_name_value ON metrics (name, value);
+"""
+
+
+def _dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+def _window(since: float | None, until: float | None) -> tuple:
+    return -math.inf if since is None else since, math.inf if until is None else until
+
+
+class ArtifactRegistry:
+    """
+    SQLite index of the model artifact directories under `base_dir`.
+
+    Each artifact is one row with its run id, size, model checksum and timestamps, plus one row
+    per metric. Both tables are indexed (`created_at`, and `(name, value)` for metrics), so
+    lookups by time or by metric and retention decisions are B-tree queries instead of directory
+    or MLflow store scans. The database lives next to the artifacts, in `registry.sqlite`.
+    """
+    def __init__(self, base_dir: str, latest_name: str = "latest"):
+        self.base_dir = base_dir
+        self.latest_name = latest_name
+        os.makedirs(base_dir, exist_ok = True)
+        self._db = sqlite3.connect(os.path.join(base_dir, REGISTRY_FILENAME), timeout = 30)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.executescript(_SCHEMA)
+
+
+    def __enter__(self) -> "ArtifactRegistry":
+        return self
+
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+    def close(self):
+        self._db.close()
+
+
+    def allocate_dir(self) -> str:
+        """"
+        Creates a new, never reused artifact directory (`<YYYYmmdd_HHMMSS>`, suffixed on collisions).
+
+        :return: Path to the created directory
+        """
+        return timestamped_dir(self.base_dir)
+
+
+    def register(self, path: str, run_id: str | None = None, metrics: Dict[str, float] | None = None,
+                 model_file: str = "model.joblib", created_at: float | None = None) -> int:
+        """"
+        Indexes a finished artifact directory.
+
+        :param path: Artifact directory
+        :param run_id: MLflow run that produced it
+        :param metrics: Metrics of the run, used for lookups and retention; NaN and infinite values are not indexed
+        :param model_file: Model file whose manifest checksum is recorded
+        :param created_at: Creation time (epoch seconds); defaults to now
+        :return: Id of the artifact
+        """
+        path = os.path.realpath(path)
+        manifest = read_manifest(os.path.join(path, model_file)) or {}
+        values = {k: float(v) for k, v in (metrics or {}).items()}
+        with self._db:
+            cursor = self._db.execute(
+                "INSERT INTO artifacts (path, run_id, created_at, size_bytes, sha256) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (path) DO UPDATE SET run_id = excluded.run_id, size_bytes = excluded.size_bytes, "
+                "sha256 = excluded.sha256 RETURNING id",
+                (path, run_id, time.time() if created_at is None else created_at, _dir_size(path), manifest.get("sha256")))
+            artifact_id = cursor.fetchone()[0]
+            self._db.executemany("INSERT OR REPLACE INTO metrics (artifact_id, name, value) VALUES (?, ?, ?)",
+                                 [(artifact_id, k, v) for k, v in values.items() if math.isfinite(v)])
+
+        return artifact_id
+
+
+    def promote(self, path: str) -> str:
+        """"
+        Points `latest` at an artifact; the link is swapped atomically after the index is updated.
+
+        :param path: Artifact directory
+        :return: Path to the `latest` symlink
+        """
+        with self._db:
+            self._db.execute("UPDATE artifacts SET promoted_at = ? WHERE path = ?", (time.time(), os.path.realpath(path)))
+
+        return ensure_latest_symlink(self.base_dir, self.latest_name, target_dir = path)
+
+
+    def latest(self) -> Dict[str, Any] | None:
+        """"
+        Most recently created artifact.
+
+        :return: Artifact record, or None if the registry is empty
+        """
+        row = self._db.execute("SELECT * FROM artifacts ORDER BY created_at DESC, id DESC LIMIT 1").fetchone()
+        return self._record(row) if row else None
+
+
+    def get(self, path: str) -> Dict[str, Any] | None:
+        """"
+        Artifact stored in a directory (symlinks such as `latest` are resolved).
+
+        :param path: Artifact directory
+        :return: Artifact record, or None if the directory is not indexed
+        """
+        row = self._db.execute("SELECT * FROM artifacts WHERE path = ?", (os.path.realpath(path),)).fetchone()
+        return self._record(row) if row else None
+
+
+    def find(self, since: float | None = None, until: float | None = None, limit: int | None = None) -> List[Dict[str, Any]]:
+        """"
+        Artifacts created in a time window, newest first.
+
+        :param since: Earliest creation time (epoch seconds)
+        :param until: Latest creation time (epoch seconds)
+        :param limit: Maximum number of artifacts
+        :return: List of artifact records
+        """
+        rows = self._db.execute("SELECT * FROM artifacts WHERE created_at >= ? AND created_at <= ? "
+                                "ORDER BY created_at DESC, id DESC LIMIT ?",
+                                (*_window(since, until), -1 if limit is None else limit)).fetchall()
+        return [self._record(r) for r in rows]
+
+
+    def best(self, metric: str, k: int = 1, since: float | None = None, until: float | None = None,
+             higher_is_better: bool = True) -> List[Dict[str, Any]]:
+        """"
+        Top artifacts by a metric, optionally within a time window (e.g. "best f1 last week").
+
+        :param metric: Metric name
+        :param k: Number of artifacts
+        :param since: Earliest creation time (epoch seconds)
+        :param until: Latest creation time (epoch seconds)
+        :param higher_is_better: Sort order of the metric
+        :return: List of artifact records, best first
+        """
+        order = "DESC" if higher_is_better else "ASC"
+        rows = self._db.execute(f"SELECT a.* FROM metrics m JOIN artifacts a ON a.id = m.artifact_id "
+                                f"WHERE m.name = ? AND a.created_at >= ? AND a.created_at <= ? "
+                                f"ORDER BY m.value {order}, a.created_at DESC LIMIT ?",
+                                (metric, *_window(since, until), k)).fetchall()
+        return [self._record(r) for r in rows]
+
+
+    def _record(self, row: sqlite3.Row) -> Dict[str, Any]:
+        record = dict(row)
+        record["metrics"] = {name: value for name, value in self._db.execute(
+            "SELECT name, value FROM metrics WHERE artifact_id = ?", (row["id"],))}
+        return record
+
+
+    def gc(self, metric: str = "f1", keep_top_k: int = 3, keep_last: int = 5, higher_is_better: bool = True,
+           dry_run: bool = False) -> Dict[str, Any]:
+        """"
+        Deletes artifacts outside the retention policy: the top `keep_top_k` by `metric`, the last
+        `keep_last` created and the one behind `latest` are kept.
+
+        Only the index is queried; nothing under `base_dir` is listed.
+
+        :param metric: Metric ranking the artifacts
+        :param keep_top_k: Number of best artifacts kept
+        :param keep_last: Number of most recent artifacts kept
+        :param higher_is_better: Sort order of the metric
+        :param dry_run: Report what would be removed without deleting it
+        :return: Dictionary with the `removed` paths and the `reclaimed_bytes`
+        """
+        order = "DESC" if higher_is_better else "ASC"
+        latest = os.path.join(self.base_dir, self.latest_name)
+        doomed = self._db.execute(
+            f"SELECT id, path, size_bytes FROM artifacts WHERE id NOT IN ("
+            f"SELECT artifact_id FROM (SELECT artifact_id FROM metrics WHERE name = ? ORDER BY value {order} LIMIT ?) "
+            f"UNION SELECT id FROM (SELECT id FROM artifacts ORDER BY created_at DESC, id DESC LIMIT ?) "
+            f"UNION SELECT id FROM artifacts WHERE path = ?)",
+            (metric, keep_top_k, keep_last, os.path.realpath(latest) if os.path.islink(latest) else None)).fetchall()
+        if not dry_run:
+            for artifact_id, path, _ in doomed:
+                shutil.rmtree(path, ignore_errors = True)
+                with self._db:
+                    self._db.execute("DELETE FROM artifacts WHERE id = ?", (artifact_id,))
+
+        return {"removed": [r[1] for r in doomed], "reclaimed_bytes": sum(r[2] for r in doomed)}
+
+
+    def sync(self, model_file: str = "model.joblib") -> int:
+        """"
+        Indexes artifact directories created before the registry existed (one directory listing).
+
+        :param model_file: File that marks a directory as a model artifact
+        :return: Number of newly indexed artifacts
+        """
+        known = {r[0] for r in self._db.execute("SELECT path FROM artifacts")}
+        added = 0
+        for name in sorted(os.listdir(self.base_dir)):
+            path = os.path.realpath(os.path.join(self.base_dir, name))
+            if name != self.latest_name and path not in known and os.path.exists(os.path.join(path, model_file)):
+                self.register(path, model_file = model_file, created_at = os.path.getmtime(path))
+                added += 1
+
+        return added
+
+
+def apply_retention(registry: ArtifactRegistry, retention: Dict[str, Any]) -> Dict[str, Any] | None:
+    """
+    Runs `gc` with the `outputs.retention` section of the configuration.
+
+    :param registry: Artifact registry
+    :param retention: Dictionary with `enabled`, `metric`, `keep_top_k` and `keep_last`
+    :return: Report of `gc`, or None if retention is disabled
+    """
+    if not retention.get("enabled", False):
+        return None
+
+    return registry.gc(metric = retention.get("metric", "f1"), keep_top_k = int(retention.get("keep_top_k", 3)),
+                       keep_last = int(retention.get("keep_last", 5)),
+                       higher_is_better = bool(retention.get("higher_is_better", True)))
+
+
+def _print_records(records: Sequence[Dict[str, Any]]):
+    for r in records:
+        created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(r["created_at"]))
+        print(f"{created}  {r['size_bytes'] / 1024**2:>8.2f} MB  {r['run_id'] or '-':<32}  {r['path']}  "
+              f"{json.dumps(r['metrics'])}")
+
+
+def main():
+    """
+    Command line access to the artifact registry.
+    """
+    parser = argparse.ArgumentParser(description = "Registro de artefactos del modelo")
+    parser.add_argument("--base_dir", type = str, default = "artifacts")
+    sub = parser.add_subparsers(dest = "command", required = True)
+    sub.add_parser("sync", help = "Indexa directorios de artefactos creados antes del registro")
+    best = sub.add_parser("best", help = "Mejores artefactos por metrica")
+    best.add_argument("--metric", type = str, default = "f1")
+    best.add_argument("--k", type = int, default = 5)
+    best.add_argument("--days", type = float, default = None, help = "Solo artefactos de los ultimos N dias")
+    best.add_argument("--lower_is_better", action = "store_true")
+    recent = sub.add_parser("list", help = "Artefactos mas recientes")
+    recent.add_argument("--limit", type = int, default = 20)
+    gc = sub.add_parser("gc", help = "Borra los artefactos fuera de la politica de retencion")
+    gc.add_argument("--metric", type = str, default = "f1")
+    gc.add_argument("--keep_top_k", type = int, default = 3)
+    gc.add_argument("--keep_last", type = int, default = 5)
+    gc.add_argument("--lower_is_better", action = "store_true")
+    gc.add_argument("--dry_run", action = "store_true")
+    args = parser.parse_args()
+
+    with ArtifactRegistry(args.base_dir) as registry:
+        if args.command == "sync":
+            print(f"{registry.sync()} artefactos indexados.")
+        elif args.command == "best":
+            since = time.time() - args.days * 86400 if args.days else None
+            _print_records(registry.best(args.metric, args.k, since = since, higher_is_better = not args.lower_is_better))
+        elif args.command == "list":
+            _print_records(registry.find(limit = args.limit))
+        else:
+            report = registry.gc(args.metric, args.keep_top_k, args.keep_last, not args.lower_is_better, args.dry_run)
+            action = "Se borrarian" if args.dry_run else "Borrados"
+            print(f"{action} {len(report['removed'])} artefactos ({report['reclaimed_bytes'] / 1024**2:.1f} MB).")
+            for path in report["removed"]:
+                print(f"  {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, Iterator, Sequence, Tuple
+import pandas as pd
+import numpy as np
+import json
+import os
+
+
+SCHEMA_FILENAME = "feature_schema.json"
+RANGE_MARGIN = 0.25
+QUARANTINE_COLUMN = "quarantine_reason"
+
+
+def schema_path(model_path: str) -> str:
+    """
+    Path of the feature schema stored next to a model or scorer artifact.
+
+    :param model_path: Path to `model.joblib` or `scorer.npz`
+    :return: Path to `feature_schema.json` in the same directory
+    """
+    return os.path.join(os.path.dirname(model_path), SCHEMA_FILENAME)
+
+
+def _normalize_header(name) -> str:
+    return str(name).strip().upper()
+
+
+def _bound(value, default: float) -> float:
+    return default if value is None else value
+
+
+class FeatureSchema:
+    """
+    Names, order, dtypes and allowed ranges of the features a model was trained on.
+
+    At inference it drives the CSV reader (only the needed columns, no type inference) and a
+    vectorized validation that sends rows with missing, non-numeric, non-integral or out-of-range
+    values to quarantine instead of failing the whole batch. Headers are matched exactly, then
+    through `aliases`, then ignoring case and surrounding spaces.
+    """
+    def __init__(self, features: Sequence[Dict[str, Any]], aliases: Dict[str, str] | None = None):
+        self.features = [dict(f) for f in features]
+        self.names = [f["name"] for f in self.features]
+        self.aliases = dict(aliases or {})
+
+
+    @classmethod
+    def from_frame(cls, X: pd.DataFrame, margin: float = RANGE_MARGIN,
+                   aliases: Dict[str, str] | None = None) -> "FeatureSchema":
+        """"
+        Builds the schema from the raw training features.
+
+        :param X: Raw training features, in model order
+        :param margin: Fraction of each training range added below the minimum and above the maximum;
+            features that were never negative stay non-negative
+        :param aliases: Extra header -> feature name mappings
+        :return: Schema of the features
+        """
+        return cls.from_chunks([X], margin, aliases)
+
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame], margin: float = RANGE_MARGIN,
+                    aliases: Dict[str, str] | None = None) -> "FeatureSchema":
+        """"
+        Builds the schema from raw training features streamed in chunks, keeping only a running
+        minimum, maximum, dtype and missing-value flag per feature.
+
+        :param chunks: Iterable of raw training feature DataFrames with the same columns, in model order
+        :param margin: See `from_frame`
+        :param aliases: Extra header -> feature name mappings
+        :return: Schema of the features
+        :raises ValueError: If there are no chunks
+        """
+        stats = {}
+        for X in chunks:
+            for col in X.columns:
+                values = X[col].to_numpy(dtype = np.float64)
+                present = values[~np.isnan(values)]
+                f = stats.setdefault(str(col), {"dtype": X[col].dtype, "integer": True, "min": np.inf,
+                                                "max": -np.inf, "nullable": False})
+                f["dtype"] = np.result_type(f["dtype"], X[col].dtype)
+                f["integer"] &= bool(pd.api.types.is_integer_dtype(X[col].dtype))
+                f["nullable"] |= len(present) < len(values)
+                if len(present):
+                    f["min"], f["max"] = min(f["min"], present.min()), max(f["max"], present.max())
+        if not stats:
+            raise ValueError("No hay datos para construir el esquema de variables.")
+
+        features = []
+        for name, f in stats.items():
+            lo, hi = float(f["min"]), float(f["max"])
+            pad = float(np.floor(margin * (hi - lo)) if f["integer"] else margin * (hi - lo))
+            bounded = lo <= hi  # a feature that was always missing gets no range (None in the JSON)
+            features.append({"name": name,
+                             "dtype": str(f["dtype"]),
+                             "integer": f["integer"],
+                             "min": (lo - pad if lo < 0 else max(lo - pad, 0.0)) if bounded else None,
+                             "max": hi + pad if bounded else None,
+                             "nullable": f["nullable"]})
+
+        return cls(features, aliases)
+
+
+    def save(self, path: str):
+        """"
+        Saves the schema as JSON.
+
+        :param path: Destination file path
+        """
+        with open(path, "w", encoding = "utf-8") as f:
+            json.dump({"features": self.features, "aliases": self.aliases}, f, indent = 2)
+
+
+    @classmethod
+    def load(cls, path: str) -> "FeatureSchema":
+        """"
+        Loads a schema written by `save`.
+
+        :param path: Path to the JSON file
+        :return: Loaded schema
+        """
+        with open(path, "r", encoding = "utf-8") as f:
+            payload = json.load(f)
+
+        return cls(payload["features"], payload.get("aliases"))
+
+
+    def resolve_columns(self, columns: Sequence) -> Dict[Any, str]:
+        """"
+        Maps input headers to feature names.
+
+        :param columns: Headers of the input
+        :return: Dictionary input header -> feature name, one entry per feature
+        :raises ValueError: If a feature has no matching column
+        """
+        by_name = {name: name for name in self.names}
+        by_alias = {_normalize_header(k): v for k, v in self.aliases.items()}
+        by_upper = {_normalize_header(name): name for name in self.names}
+        mapping = {}
+        for col in columns:
+            name = by_name.get(col) or self.aliases.get(col) or by_alias.get(_normalize_header(col)) \
+                or by_upper.get(_normalize_header(col))
+            if name is not None and name not in mapping.values():
+                mapping[col] = name
+
+        missing = [name for name in self.names if name not in mapping.values()]
+        if missing:
+            raise ValueError(f"Faltan variables del modelo en la entrada: {', '.join(missing)}. "
+                             f"Columnas recibidas: {', '.join(map(str, columns))}")
+
+        return mapping
+
+
+    def conform(self, df: pd.DataFrame, keep: Sequence[str] = ()) -> pd.DataFrame:
+        """"
+        Renames aliased headers, drops unused columns and orders the features as in training.
+
+        :param df: Input DataFrame
+        :param keep: Extra columns kept in front of the features (e.g. the id column)
+        :return: DataFrame with `keep` and then the features
+        """
+        mapping = self.resolve_columns([c for c in df.columns if c not in keep])
+        out = df[list(keep) + list(mapping)]
+        out.columns = list(keep) + [mapping[c] for c in mapping]
+
+        return out[list(keep) + self.names]
+
+
+    def _read_options(self, source, keep: Sequence[str]) -> Dict[str, Any]:
+        start = source.tell() if hasattr(source, "seek") else None
+        mapping = self.resolve_columns([c for c in pd.read_csv(source, nrows = 0).columns if c not in keep])
+        if start is not None:
+            source.seek(start)
+
+        return {"usecols": list(keep) + list(mapping), "dtype": {c: np.float64 for c in mapping}}
+
+
+    def read_csv(self, source, keep: Sequence[str] = ()) -> pd.DataFrame:
+        """"
+        Reads only the model features (and `keep`) with explicit float64 dtypes, using the pyarrow
+        engine when it is installed. Columns with non-numeric text are re-read as NaN, so the
+        affected rows are quarantined by `split`.
+
+        :param source: Path to the CSV file, or a text buffer
+        :param keep: Extra columns to read as-is (e.g. the id column)
+        :return: DataFrame with `keep` and the features in model order
+        """
+        start = source.tell() if hasattr(source, "seek") else None
+        options = self._read_options(source, keep)
+        try:
+            import pyarrow  # noqa: F401
+            engine = "pyarrow"
+        except ImportError:
+            engine = "c"
+        try:
+            df = pd.read_csv(source, engine = engine, **options)
+        except (ValueError, TypeError):
+            if start is not None:
+                source.seek(start)
+            df = self._coerce(pd.read_csv(source, usecols = options["usecols"]), options["dtype"])
+
+        return self.conform(df, keep)
+
+
+    def iter_csv(self, path: str, chunksize: int, keep: Sequence[str] = ()) -> Iterator[pd.DataFrame]:
+        """"
+        Streams the model features (and `keep`) in chunks with explicit float64 dtypes; the index
+        of each chunk is the source row number.
+
+        :param path: Path to the CSV file
+        :param chunksize: Number of rows per chunk
+        :param keep: Extra columns to read as-is (e.g. the id column)
+        :return: Iterator over the conformed chunks
+        """
+        options = self._read_options(path, keep)
+        n_read = 0
+        with pd.read_csv(path, chunksize = chunksize, **options) as reader:
+            while True:
+                try:
+                    chunk = next(reader)
+                except StopIteration:
+                    return
+                except (ValueError, TypeError):
+                    break
+                n_read += len(chunk)
+                yield self.conform(chunk, keep)
+
+        # A chunk holds non-numeric text: read the rest with inferred dtypes, coercing chunk by chunk
+        with pd.read_csv(path, chunksize = chunksize, usecols = options["usecols"],
+                         skiprows = range(1, n_read + 1)) as reader:
+            for chunk in reader:
+                chunk.index += n_read
+                yield self.conform(self._coerce(chunk, options["dtype"]), keep)
+
+
+    @staticmethod
+    def _coerce(df: pd.DataFrame, dtypes: Dict[Any, Any]) -> pd.DataFrame:
+        return df.assign(**{str(c): pd.to_numeric(df[c], errors = "coerce").astype(t) for c, t in dtypes.items()})
+
+
+    def validate(self, X: pd.DataFrame) -> np.ndarray:
+        """"
+        Checks every feature with whole-column comparisons.
+
+        :param X: Conformed DataFrame
+        :return: Boolean array (n_rows, n_features), True where a value breaks the schema
+        """
+        bad = np.zeros((len(X), len(self.features)), dtype = bool)
+        for j, f in enumerate(self.features):
+            values = X[f["name"]].to_numpy(dtype = np.float64)
+            missing = np.isnan(values)
+            with np.errstate(invalid = "ignore"):
+                wrong = (values < _bound(f["min"], -np.inf)) | (values > _bound(f["max"], np.inf))
+                if f["integer"]:
+                    wrong |= values != np.round(values)
+            bad[:, j] = (missing & (not f["nullable"])) | (wrong & ~missing)
+
+        return bad
+
+
+    def split(self, X: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """"
+        Separates valid rows from quarantined ones.
+
+        :param X: Conformed DataFrame
+        :return: Tuple of the valid rows and the quarantined rows, the latter with a `quarantine_reason`
+            column naming the offending features
+        """
+        bad = self.validate(X)
+        rows = bad.any(axis = 1)
+        if not rows.any():
+            return X, X.iloc[:0].assign(**{QUARANTINE_COLUMN: pd.Series(dtype = object)})
+
+        # One string per distinct violation pattern, not per row: the patterns are packed into integer keys
+        bad = bad[rows]
+        packed = np.packbits(bad, axis = 1)
+        if packed.shape[1] <= 8:
+            keys = np.pad(packed, ((0, 0), (0, 8 - packed.shape[1]))).view(np.uint64).ravel()
+        else:
+            keys = np.ascontiguousarray(packed).view(f"V{packed.shape[1]}").ravel()
+        _, first, inverse = np.unique(keys, return_index = True, return_inverse = True)
+        names = np.array(self.names)
+        reasons = np.array([",".join(names[bad[i]]) for i in first], dtype = object)[inverse.ravel()]
+        quarantined = X[rows].assign(**{QUARANTINE_COLUMN: reasons})
+
+        return X[~rows], quarantined
+
+
+def quarantine_path(output_path: str) -> str:
+    """
+    Default path of the quarantined rows, next to the predictions.
+
+    :param output_path: Path of the predictions file
+    :return: Path to `<predictions stem>.quarantine.csv`
+    """
+    return f"{os.path.splitext(output_path)[0]}.quarantine.csv"
+
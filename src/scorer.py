@@ -0,0 +1,193 @@
+from __future__ import annotations
+from typing import Sequence
+import numpy as np
+
+
+class LinearScorer:
+    """
+    NumPy-only scorer for linear classifiers, with the standardization folded into the weights.
+
+    For a scaler (mean, scale) and a classifier (coef, intercept), `((X - mean) / scale) @ coef.T +
+    intercept` equals `X @ W + b` with `W = (coef / scale).T` and `b = intercept - W.T @ mean`,
+    so scoring raw features is one matrix multiply with no sklearn input validation.
+    """
+    def __init__(self, feature_names: Sequence[str], weights: np.ndarray, intercept: np.ndarray, classes: np.ndarray,
+                 dtype = np.float64):
+        self.feature_names = [str(c) for c in feature_names]
+        self.weights = np.ascontiguousarray(weights, dtype = dtype)
+        self.intercept = np.ascontiguousarray(intercept, dtype = dtype)
+        self.classes = np.asarray(classes)
+        self.dtype = np.dtype(dtype)
+
+
+    @classmethod
+    def from_model(cls, model, feature_names: Sequence[str] | None = None, dtype = np.float64) -> "LinearScorer":
+        """"
+        Exports a fitted linear model, optionally wrapped in a `PreprocessedModel`.
+
+        :param model: `PreprocessedModel` or fitted estimator exposing `coef_`, `intercept_` and `classes_`
+        :param feature_names: Feature order for bare estimators without `feature_names_in_`
+        :param dtype: Floating point type of the exported weights
+        :return: Scorer with the same outputs as the model
+        :raises ValueError: If the model is not linear
+        """
+        scaler = getattr(model, "scaler", None)
+        clf = getattr(model, "model", model) if scaler is not None else model
+        if not hasattr(clf, "coef_"):
+            raise ValueError(f"El modelo {type(clf).__name__} no es lineal; no se puede exportar.")
+
+        coef = np.asarray(clf.coef_, dtype = np.float64)
+        intercept = np.asarray(clf.intercept_, dtype = np.float64)
+        if scaler is not None:
+            coef = coef / scaler.scale_
+            intercept = intercept - coef @ scaler.mean_
+            feature_names = scaler.feature_names
+        elif feature_names is None:
+            feature_names = getattr(clf, "feature_names_in_", [f"x{i}" for i in range(coef.shape[1])])
+
+        return cls(feature_names, coef.T, intercept, clf.classes_, dtype = dtype)
+
+
+    def _as_array(self, X) -> np.ndarray:
+        if hasattr(X, "columns"):
+            return X[self.feature_names].to_numpy(dtype = self.dtype)
+        return np.asarray(X, dtype = self.dtype)
+
+
+    def decision_function(self, X) -> np.ndarray:
+        """"
+        Computes the linear scores.
+
+        :param X: Array in `feature_names` order, or a DataFrame containing those columns
+        :return: Scores of shape (n_samples,) for binary models, (n_samples, n_classes) otherwise
+        """
+        scores = self._as_array(X) @ self.weights + self.intercept
+        return scores[:, 0] if scores.shape[1] == 1 else scores
+
+
+    def predict_proba(self, X) -> np.ndarray:
+        """"
+        Estimates class probabilities (sigmoid for binary models, softmax otherwise).
+
+        :param X: Array in `feature_names` order, or a DataFrame containing those columns
+        :return: Array of shape (n_samples, n_classes)
+        """
+        return self._proba(self.decision_function(X))
+
+
+    @staticmethod
+    def _proba(scores: np.ndarray) -> np.ndarray:
+        if scores.ndim == 1:
+            with np.errstate(over = "ignore"):
+                positive = 1.0 / (1.0 + np.exp(-scores))
+            return np.column_stack([1.0 - positive, positive])
+
+        scores = scores - scores.max(axis = 1, keepdims = True)
+        np.exp(scores, out = scores)
+        scores /= scores.sum(axis = 1, keepdims = True)
+
+        return scores
+
+
+    def predict(self, X) -> np.ndarray:
+        """"
+        Makes predictions.
+
+        :param X: Array in `feature_names` order, or a DataFrame containing those columns
+        :return y_pred: Predicted classes
+        """
+        return self._labels(self.decision_function(X))
+
+
+    def _labels(self, scores: np.ndarray) -> np.ndarray:
+        if scores.ndim == 1:
+            return self.classes[(scores > 0).astype(np.intp)]
+        return self.classes[scores.argmax(axis = 1)]
+
+
+    def save(self, path: str):
+        """"
+        Saves the scorer as an uncompressed `.npz` file.
+
+        :param path: Destination file path
+        """
+        np.savez(path, feature_names = np.array(self.feature_names), weights = self.weights,
+                 intercept = self.intercept, classes = self.classes)
+
+
+    @classmethod
+    def load(cls, path: str) -> "LinearScorer":
+        """"
+        Loads a scorer written by `save`.
+
+        :param path: Path to the `.npz` file
+        :return: Loaded scorer
+        """
+        with np.load(path, allow_pickle = False) as data:
+            return cls(data["feature_names"].tolist(), data["weights"], data["intercept"], data["classes"],
+                       dtype = data["weights"].dtype)
+
+
+class StackedLinearScorer:
+    """
+    Several `LinearScorer`s scored together: their weights are laid side by side over the union
+    of their features, so one matrix multiply computes the scores of every model.
+    """
+    def __init__(self, scorers: Sequence[LinearScorer], dtype = np.float64):
+        self.scorers = list(scorers)
+        self.feature_names = list(dict.fromkeys(f for s in self.scorers for f in s.feature_names))
+        index = {f: i for i, f in enumerate(self.feature_names)}
+        blocks, self.slices, start = [], [], 0
+        for s in self.scorers:
+            block = np.zeros((len(self.feature_names), s.weights.shape[1]))
+            block[[index[f] for f in s.feature_names]] = s.weights
+            blocks.append(block)
+            self.slices.append(slice(start, start + block.shape[1]))
+            start += block.shape[1]
+        self.weights = np.ascontiguousarray(np.hstack(blocks), dtype = dtype)
+        self.intercept = np.concatenate([s.intercept for s in self.scorers]).astype(dtype)
+        self.dtype = np.dtype(dtype)
+
+
+    def score(self, X) -> list:
+        """"
+        Predicts with every model from one matrix multiply.
+
+        :param X: DataFrame containing the features of every model, or an array in `feature_names` order
+        :return: List with one (predictions, class probabilities) tuple per scorer
+        """
+        if hasattr(X, "columns"):
+            X = X[self.feature_names].to_numpy(dtype = self.dtype)
+        scores = np.asarray(X, dtype = self.dtype) @ self.weights + self.intercept
+        outputs = []
+        for scorer, cols in zip(self.scorers, self.slices):
+            block = scores[:, cols]
+            block = block[:, 0] if block.shape[1] == 1 else block
+            outputs.append((scorer._labels(block), scorer._proba(block)))
+
+        return outputs
+
+
+def export_scorer(model, path: str, dtype = np.float64) -> LinearScorer:
+    """
+    Exports a fitted linear model (and its preprocessing) as a NumPy-only scorer artifact.
+
+    :param model: `PreprocessedModel` or fitted linear estimator
+    :param path: Destination `.npz` file path
+    :param dtype: Floating point type of the exported weights
+    :return: The exported scorer
+    """
+    scorer = LinearScorer.from_model(model, dtype = dtype)
+    scorer.save(path)
+
+    return scorer
+
+
+def load_scorer(path: str) -> LinearScorer:
+    """
+    Loads a scorer artifact written by `export_scorer`.
+
+    :param path: Path to the `.npz` file
+    :return: Loaded scorer
+    """
+    return LinearScorer.load(path)
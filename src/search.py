@@ -0,0 +1,147 @@
+from __future__ import annotations
+from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold
+from src.metrics import classification_metrics, summarize_folds
+from src.modeling import ModelBuilder
+from joblib import Parallel, delayed
+from typing import Any, Dict, List
+from scipy import stats
+import numpy as np
+import time
+
+
+SEARCH_STRATEGIES = ("grid", "random")
+
+
+def _as_distribution(values):
+    """
+    Turns a YAML search-space entry into something `ParameterSampler` understands.
+
+    Lists are sampled uniformly; a mapping `{low, high, log}` becomes a continuous (log-)uniform
+    distribution.
+
+    :param values: List of candidate values or a `{low, high, log}` mapping
+    :return: List or scipy distribution
+    """
+    if isinstance(values, dict):
+        low, high = float(values["low"]), float(values["high"])
+        if values.get("log", False):
+            return stats.loguniform(low, high)
+        return stats.uniform(low, high - low)
+    return list(values)
+
+
+def expand_search_space(search_config: Dict[str, Any], seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Expands the `search` section of the training config into the list of candidate parameters.
+
+    :param search_config: Dictionary with `strategy` ("grid" or "random"), `space` and, for random search, `n_iter`
+    :param seed: Random seed for the random search
+    :return: List of parameter dictionaries
+    :raises ValueError: If the strategy is unknown or the space is empty
+    """
+    strategy = search_config.get("strategy", "grid")
+    space = search_config.get("space") or {}
+    if strategy not in SEARCH_STRATEGIES:
+        raise ValueError(f"Estrategia de busqueda desconocida: {strategy}. Opciones: {SEARCH_STRATEGIES}")
+    if not space:
+        raise ValueError("El espacio de busqueda esta vacio.")
+
+    if strategy == "grid":
+        if any(isinstance(v, dict) for v in space.values()):
+            raise ValueError("La busqueda en grilla solo admite listas de valores.")
+        return list(ParameterGrid({k: list(v) for k, v in space.items()}))
+
+    n_iter = int(search_config.get("n_iter", 10))
+    distributions = {k: _as_distribution(v) for k, v in space.items()}
+
+    return list(ParameterSampler(distributions, n_iter = n_iter, random_state = seed))
+
+
+def evaluate_candidate(params: Dict[str, Any], base_params: Dict[str, Any], seed: int, X_train: np.ndarray,
+                       y_train: np.ndarray, n_splits: int = 5) -> Dict[str, Any]:
+    """
+    Cross-validates one candidate on the already preprocessed training arrays.
+
+    The test split is never seen here: candidates are compared on their stratified k-fold
+    validation metrics, and only the winner is refitted and scored on test by the caller.
+
+    :param params: Candidate parameters, overriding `base_params`
+    :param base_params: Parameters shared by every candidate
+    :param seed: Random seed for the fold assignment and the model
+    :param X_train: Preprocessed training features
+    :param y_train: Training target
+    :param n_splits: Number of folds
+    :return: Dictionary with the params, the `<metric>_mean`/`<metric>_std` validation metrics, fit time and
+        error (if any)
+    """
+    start = time.perf_counter()
+    try:
+        fold_metrics = []
+        for train_idx, val_idx in StratifiedKFold(n_splits = n_splits, shuffle = True,
+                                                  random_state = seed).split(X_train, y_train):
+            builder = ModelBuilder(random_state = seed, params = {**base_params, **params})
+            builder.train_model(X_train[train_idx], y_train[train_idx])
+            fold_metrics.append(classification_metrics(y_train[val_idx], builder.predict(X_train[val_idx]),
+                                                       builder.model.predict_proba(X_train[val_idx])[:, 1]))
+        metrics = summarize_folds(fold_metrics)
+    except Exception as e:
+        return {"params": params, "metrics": None, "fit_time": time.perf_counter() - start, "error": str(e)}
+
+    return {"params": params, "metrics": metrics, "fit_time": time.perf_counter() - start, "error": None}
+
+
+def run_search(candidates: List[Dict[str, Any]], base_params: Dict[str, Any], seed: int, X_train: np.ndarray,
+               y_train: np.ndarray, n_splits: int = 5, n_jobs: int = -1) -> List[Dict[str, Any]]:
+    """
+    Cross-validates every candidate on a process pool.
+
+    The data is loaded and preprocessed once by the caller. joblib dumps arrays larger than
+    1 MB to a shared memory-mapped file that every worker opens read-only, instead of pickling
+    a copy per task.
+
+    :param candidates: List of candidate parameters
+    :param base_params: Parameters shared by every candidate
+    :param seed: Random seed for reproducibility
+    :param X_train: Preprocessed training features
+    :param y_train: Training target
+    :param n_splits: Number of folds per candidate
+    :param n_jobs: Number of worker processes; -1 uses all cores
+    :return: One result per candidate, in the same order
+    """
+    arrays = [np.ascontiguousarray(a) for a in (X_train, y_train)]
+
+    return Parallel(n_jobs = n_jobs, max_nbytes = "1M", mmap_mode = "r")(
+        delayed(evaluate_candidate)(params, base_params, seed, *arrays, n_splits) for params in candidates)
+
+
+def refit_candidate(params: Dict[str, Any], base_params: Dict[str, Any], seed: int, X_train: np.ndarray,
+                    y_train: np.ndarray):
+    """
+    Trains a candidate on the whole training split, once it has been selected.
+
+    :param params: Candidate parameters, overriding `base_params`
+    :param base_params: Parameters shared by every candidate
+    :param seed: Random seed for reproducibility
+    :param X_train: Preprocessed training features
+    :param y_train: Training target
+    :return: Fitted estimator
+    """
+    builder = ModelBuilder(random_state = seed, params = {**base_params, **params})
+
+    return builder.train_model(X_train, y_train)
+
+
+def best_result(results: List[Dict[str, Any]], metric: str = "f1") -> Dict[str, Any]:
+    """
+    Picks the successful candidate with the highest mean validation value of `metric`.
+
+    :param results: Results returned by `run_search`
+    :param metric: Metric to maximize, e.g. "f1" (compared as `f1_mean`)
+    :return: Best result
+    :raises RuntimeError: If every candidate failed
+    """
+    valid = [r for r in results if r["error"] is None]
+    if not valid:
+        raise RuntimeError("Ningun candidato de la busqueda pudo entrenarse.")
+
+    return max(valid, key = lambda r: np.nan_to_num(r["metrics"][f"{metric}_mean"], nan = -np.inf))
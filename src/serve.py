@@ -0,0 +1,344 @@
+from __future__ import annotations
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from collections import Counter, deque
+from src.model_holder import ModelHolder
+from src.prediction_cache import PredictionCache, model_checksum
+from typing import Any, Dict, List
+import pandas as pd
+import numpy as np
+import threading
+import argparse
+import queue
+import time
+import json
+
+
+class ServingStats:
+    """
+    Thread-safe request latency and batch-size counters exposed on `/stats`.
+    """
+    def __init__(self, window: int = 10_000):
+        self.latencies = deque(maxlen = window)
+        self.batch_sizes = Counter()
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+
+    def record_request(self, latency_s: float, ok: bool = True):
+        """
+        Records the end-to-end latency of one request.
+
+        :param latency_s: Latency in seconds
+        :param ok: Whether the request succeeded
+        """
+        with self._lock:
+            self.requests += 1
+            self.errors += 0 if ok else 1
+            self.latencies.append(latency_s)
+
+
+    def record_batch(self, n_rows: int):
+        """
+        Records one model call, bucketing its size by powers of two.
+
+        :param n_rows: Number of rows scored in the batch
+        """
+        bucket = 1 << max(n_rows - 1, 0).bit_length()
+        with self._lock:
+            self.batches += 1
+            self.batch_sizes[bucket] += 1
+
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Summarizes the counters.
+
+        :return: Dictionary with request counts, p50/p99 latency and the batch-size histogram
+        """
+        with self._lock:
+            latencies = np.array(self.latencies, dtype = float)
+            histogram = {f"<={k}": v for k, v in sorted(self.batch_sizes.items())}
+            requests, batches, errors = self.requests, self.batches, self.errors
+
+        p50, p99 = (np.percentile(latencies, [50, 99]) * 1000).tolist() if len(latencies) else (None, None)
+
+        return {"requests": requests,
+                "errors": errors,
+                "batches": batches,
+                "latency_ms": {"p50": p50, "p99": p99},
+                "batch_size_histogram": histogram}
+
+
+class MicroBatcher:
+    """
+    Gathers rows from concurrent requests and scores them with a single model call.
+
+    A batch is closed when it reaches `max_batch_size` rows or `max_wait_ms` after its first
+    request arrived, whichever comes first. `model` may be a `ModelHolder`, in which case each
+    batch is scored entirely on the model that was current when the batch started. With a
+    `cache`, repeated rows are served from it, and it is cleared whenever the holder swaps models.
+    """
+    def __init__(self, model, max_batch_size: int = 64, max_wait_ms: float = 5.0, stats: ServingStats | None = None,
+                 cache: PredictionCache | None = None):
+        self.model = model
+        self.cache = cache
+        self._cache_version = None
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000
+        self.stats = stats or ServingStats()
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target = self._run, name = "micro-batcher", daemon = True)
+
+
+    def start(self) -> "MicroBatcher":
+        """"
+        Starts the background batching thread.
+
+        :return: The batcher itself
+        """
+        self._thread.start()
+        return self
+
+
+    def stop(self):
+        """"
+        Stops the background batching thread.
+        """
+        self._stop.set()
+        self._thread.join()
+
+
+    def submit(self, rows: List[Dict[str, Any]]) -> Future:
+        """
+        Queues rows for scoring.
+
+        :param rows: List of feature dictionaries
+        :return: Future resolved with the predictions and probabilities of these rows
+        """
+        future = Future()
+        self._queue.put((rows, future))
+        return future
+
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout = 0.1)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            n_rows = len(first[0])
+            deadline = time.perf_counter() + self.max_wait_s
+            while n_rows < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout = remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                n_rows += len(item[0])
+
+            try:
+                self._process(batch)
+            except Exception as e:
+                # Never let one batch kill the thread: fail whatever it left unresolved and keep serving.
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+
+    def _sync_cache(self, version: str | None) -> bool:
+        """"
+        Points the cache at the model version about to score a batch.
+
+        :param version: Version of that model, None if it is not served from a `ModelHolder`
+        :return: False if the cache could not be switched and must be bypassed for this batch
+        """
+        if version is None or version == self._cache_version:
+            return True
+        try:
+            checksum = model_checksum(version)
+        except OSError:
+            # The artifact was moved or removed after loading: key the entries by the version itself,
+            # which still never matches rows cached for another model.
+            checksum = f"version:{version}"
+        try:
+            self.cache.ensure_model(checksum)
+        except Exception:
+            return False
+        self._cache_version = version
+
+        return True
+
+
+    def _score(self, model, rows: List[Dict[str, Any]], use_cache: bool = True) -> Dict[str, list]:
+        X = pd.DataFrame.from_records(rows)
+        if self.cache is not None and use_cache:
+            preds, probas = self.cache.score(model, X)
+        else:
+            preds = model.predict(X)
+            probas = model.predict_proba(X) if hasattr(model, "predict_proba") else None
+        self.stats.record_batch(len(X))
+
+        return {"predictions": preds.tolist(), "probabilities": None if probas is None else probas.tolist()}
+
+
+    def _process(self, batch):
+        model, version = self.model.get_with_version() if isinstance(self.model, ModelHolder) else (self.model, None)
+        use_cache = self.cache is not None and self._sync_cache(version)
+        rows = [row for item, _ in batch for row in item]
+        try:
+            result = self._score(model, rows, use_cache)
+        except Exception:
+            # One malformed request must not fail the others: score them one by one.
+            for item, future in batch:
+                try:
+                    future.set_result(self._score(model, item, use_cache))
+                except Exception as e:
+                    future.set_exception(e)
+            return
+
+        start = 0
+        for item, future in batch:
+            end = start + len(item)
+            future.set_result({k: None if v is None else v[start:end] for k, v in result.items()})
+            start = end
+
+
+def make_handler(batcher: MicroBatcher, request_timeout: float = 30.0):
+    """
+    Builds the request handler bound to a batcher.
+
+    :param batcher: Running micro-batcher
+    :param request_timeout: Seconds a request waits for its batch before answering 504
+    :return: Request handler class for `ThreadingHTTPServer`
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, payload: Dict[str, Any]):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+
+        def do_GET(self):
+            if self.path == "/health":
+                if batcher._thread.is_alive():
+                    self._send_json(200, {"status": "ok"})
+                else:
+                    self._send_json(503, {"status": "error", "error": "El hilo de micro-batching no esta activo"})
+            elif self.path == "/stats":
+                stats = batcher.stats.snapshot()
+                if isinstance(batcher.model, ModelHolder):
+                    stats["model"] = batcher.model.stats()
+                if batcher.cache is not None:
+                    stats["cache"] = batcher.cache.report()
+                self._send_json(200, stats)
+            else:
+                self._send_json(404, {"error": f"Ruta desconocida: {self.path}"})
+
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send_json(404, {"error": f"Ruta desconocida: {self.path}"})
+                return
+
+            start = time.perf_counter()
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                rows = payload["rows"] if isinstance(payload, dict) else payload
+                if isinstance(rows, dict):
+                    rows = [rows]
+                if not batcher._thread.is_alive():
+                    batcher.stats.record_request(time.perf_counter() - start, ok = False)
+                    self._send_json(503, {"error": "El hilo de micro-batching no esta activo"})
+                    return
+                result = batcher.submit(rows).result(timeout = request_timeout)
+            except FutureTimeout:
+                batcher.stats.record_request(time.perf_counter() - start, ok = False)
+                self._send_json(504, {"error": f"La prediccion no termino en {request_timeout} s"})
+                return
+            except Exception as e:
+                batcher.stats.record_request(time.perf_counter() - start, ok = False)
+                self._send_json(400, {"error": str(e)})
+                return
+
+            batcher.stats.record_request(time.perf_counter() - start)
+            self._send_json(200, result)
+
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(model_path: str, host: str = "127.0.0.1", port: int = 8000, max_batch_size: int = 64,
+          max_wait_ms: float = 5.0, reload_interval: float = 2.0, cache_size: int = 0,
+          request_timeout: float = 30.0) -> ThreadingHTTPServer:
+    """
+    Loads the model once and builds the HTTP server around a running micro-batcher.
+
+    :param model_path: Path to the joblib model
+    :param host: Interface to bind
+    :param port: Port to bind; 0 picks a free one
+    :param max_batch_size: Maximum number of rows per model call
+    :param max_wait_ms: Maximum time a request waits for a batch to fill up
+    :param reload_interval: Seconds between checks for a new model behind `model_path`; 0 disables reloading
+    :param cache_size: Rows kept in the in-memory prediction cache; 0 disables it
+    :param request_timeout: Seconds a request waits for its batch before answering 504
+    :return: Server ready for `serve_forever`; its batcher is available as `server.batcher`
+    """
+    holder = ModelHolder(model_path, poll_interval = reload_interval)
+    if reload_interval > 0:
+        holder.start()
+    cache = PredictionCache(model_checksum(holder.version), cache_size) if cache_size > 0 else None
+    batcher = MicroBatcher(holder, max_batch_size = max_batch_size, max_wait_ms = max_wait_ms, cache = cache).start()
+    server = ThreadingHTTPServer((host, port), make_handler(batcher, request_timeout))
+    server.batcher = batcher
+
+    return server
+
+
+def main():
+    """
+    Main function to run the model-serving process.
+    """
+    parser = argparse.ArgumentParser(description = "Servidor HTTP de inferencia con micro-batching")
+    parser.add_argument("--model_path", type = str, default = "artifacts/latest/model.joblib")
+    parser.add_argument("--host", type = str, default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 8000)
+    parser.add_argument("--max_batch_size", type = int, default = 64)
+    parser.add_argument("--max_wait_ms", type = float, default = 5.0)
+    parser.add_argument("--reload_interval", type = float, default = 2.0,
+                        help = "Segundos entre revisiones de artifacts/latest; 0 desactiva la recarga")
+    parser.add_argument("--cache_size", type = int, default = 0,
+                        help = "Filas en la cache de predicciones en memoria; 0 la desactiva")
+    parser.add_argument("--request_timeout", type = float, default = 30.0,
+                        help = "Segundos que una peticion espera su prediccion antes de responder 504")
+    args = parser.parse_args()
+
+    server = serve(args.model_path, args.host, args.port, args.max_batch_size, args.max_wait_ms, args.reload_interval,
+                   args.cache_size, args.request_timeout)
+    print(f"Sirviendo {args.model_path} en http://{args.host}:{server.server_port} (POST /predict, GET /stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.stop()
+        server.batcher.model.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+from __future__ import annotations
+from src.io_utils import save_columns, load_columns
+from typing import Any, Callable, Dict, Sequence, Tuple
+import pandas as pd
+import numpy as np
+import inspect
+import hashlib
+import shutil
+import joblib
+import json
+import os
+
+
+def frame_digest(*objs) -> str:
+    """
+    Content hash of DataFrames/Series (values, dtypes, column names and index).
+
+    :param objs: DataFrames or Series to hash together
+    :return: SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    for obj in objs:
+        frame = obj.to_frame() if isinstance(obj, pd.Series) else obj
+        digest.update(np.ascontiguousarray(frame.index.to_numpy()).tobytes())
+        for col in frame.columns:
+            values = np.ascontiguousarray(frame[col].to_numpy())
+            digest.update(str(col).encode("utf-8"))
+            digest.update(values.dtype.str.encode("utf-8"))
+            digest.update(values.tobytes())
+
+    return digest.hexdigest()
+
+
+def code_version(fn: Callable) -> str:
+    """
+    Hash of the source file that defines `fn`, so any change to the stage code invalidates it.
+
+    :param fn: Stage function
+    :return: SHA-256 hex digest
+    """
+    with open(inspect.getsourcefile(fn), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _save_output(obj, path: str) -> Dict[str, Any]:
+    """
+    Saves one stage output; frames and arrays as memory-mappable `.npy` columns, anything else with joblib.
+
+    :param obj: Output to save
+    :param path: Directory for this output
+    :return: Metadata needed to load it back
+    """
+    if isinstance(obj, pd.Series):
+        save_columns(pd.DataFrame({"__index__": obj.index.to_numpy(), "__values__": obj.to_numpy()}), path)
+        return {"kind": "series", "name": obj.name}
+    if isinstance(obj, pd.DataFrame):
+        save_columns(pd.DataFrame({"__index__": obj.index.to_numpy(), **{c: obj[c].to_numpy() for c in obj.columns}}), path)
+        return {"kind": "frame"}
+    if isinstance(obj, np.ndarray):
+        os.makedirs(path, exist_ok = True)
+        np.save(os.path.join(path, "array.npy"), obj)
+        return {"kind": "array"}
+
+    os.makedirs(path, exist_ok = True)
+    joblib.dump(obj, os.path.join(path, "object.joblib"))
+    return {"kind": "object"}
+
+
+def _load_output(meta: Dict[str, Any], path: str):
+    """
+    Loads one stage output written by `_save_output`, memory-mapping arrays.
+
+    :param meta: Metadata returned by `_save_output`
+    :param path: Directory of this output
+    :return: The output
+    """
+    if meta["kind"] == "array":
+        return np.load(os.path.join(path, "array.npy"), mmap_mode = "r")
+    if meta["kind"] == "object":
+        return joblib.load(os.path.join(path, "object.joblib"))
+
+    frame = load_columns(path)
+    index = pd.Index(frame.pop("__index__"))
+    if meta["kind"] == "series":
+        return pd.Series(frame["__values__"].to_numpy(), index = index, name = meta["name"], copy = False)
+    frame.index = index
+
+    return frame
+
+
+def _dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+class StageCache:
+    """
+    On-disk memoization of pipeline stages, addressed by a hash of the stage's inputs, parameters
+    and code.
+
+    Stage outputs are chained: the key of a stage becomes the input digest of the next one, so
+    only the initial data has to be hashed. Entries are evicted least-recently-used first once the
+    cache grows beyond `max_bytes`.
+    """
+    def __init__(self, root: str, max_bytes: int = 2 * 1024**3, enabled: bool = True):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.report: Dict[str, str] = {}
+
+
+    def key(self, stage: str, fn: Callable, params: Dict[str, Any], upstream: Sequence[str]) -> str:
+        """"
+        Computes the cache key of a stage.
+
+        :param stage: Stage name
+        :param fn: Stage function
+        :param params: Keyword parameters of the stage
+        :param upstream: Digests of the stage inputs
+        :return: SHA-256 hex digest
+        """
+        payload = json.dumps({"stage": stage, "code": code_version(fn), "params": params, "upstream": list(upstream)},
+                             sort_keys = True, default = str)
+
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+    def run(self, stage: str, fn: Callable, args: Tuple, params: Dict[str, Any], upstream: Sequence[str]) -> Tuple[Any, str]:
+        """"
+        Returns the stage output from the cache, or computes `fn(*args, **params)` and stores it.
+
+        :param stage: Stage name, used in the report
+        :param fn: Stage function
+        :param args: Positional inputs of the stage
+        :param params: Keyword parameters of the stage
+        :param upstream: Digests of the positional inputs
+        :return: Tuple of the stage output and its key
+        """
+        key = self.key(stage, fn, params, upstream)
+        if not self.enabled:
+            self.report[stage] = "disabled"
+            return fn(*args, **params), key
+
+        path = os.path.join(self.root, f"{stage}-{key[:16]}")
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding = "utf-8") as f:
+                meta = json.load(f)
+            os.utime(meta_path)
+            outputs = [_load_output(m, os.path.join(path, f"out_{i}")) for i, m in enumerate(meta["outputs"])]
+            self.report[stage] = "hit"
+            return (tuple(outputs) if meta["tuple"] else outputs[0]), key
+
+        result = fn(*args, **params)
+        is_tuple = isinstance(result, tuple)
+        outputs = result if is_tuple else (result,)
+
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_path, ignore_errors = True)
+        metas = [_save_output(obj, os.path.join(tmp_path, f"out_{i}")) for i, obj in enumerate(outputs)]
+        meta = {"stage": stage, "key": key, "params": params, "tuple": is_tuple, "outputs": metas,
+                "size": _dir_size(tmp_path)}
+        with open(os.path.join(tmp_path, "meta.json"), "w", encoding = "utf-8") as f:
+            json.dump(meta, f, indent = 2, default = str)
+        if os.path.exists(path):
+            shutil.rmtree(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+
+        self.report[stage] = "miss"
+        self.evict()
+
+        return result, key
+
+
+    def evict(self) -> int:
+        """"
+        Removes least-recently-used entries until the cache fits in `max_bytes`.
+
+        :return: Number of removed entries
+        """
+        entries = []
+        for name in os.listdir(self.root) if os.path.isdir(self.root) else []:
+            meta_path = os.path.join(self.root, name, "meta.json")
+            if os.path.exists(meta_path):
+                with open(meta_path, "r", encoding = "utf-8") as f:
+                    entries.append((os.path.getmtime(meta_path), json.load(f)["size"], os.path.join(self.root, name)))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        while entries and total > self.max_bytes:
+            _, size, path = entries.pop(0)
+            shutil.rmtree(path, ignore_errors = True)
+            total -= size
+            removed += 1
+
+        return removed
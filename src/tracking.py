@@ -0,0 +1,162 @@
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+import threading
+import time
+
+
+# Per-request limits of the MLflow `log_batch` endpoint
+MAX_BATCH_METRICS = 1000
+MAX_BATCH_PARAMS = 100
+MAX_BATCH_TAGS = 100
+
+
+class RunLogger:
+    """
+    Buffers params, metrics and tags of one MLflow run and sends them with `log_batch`.
+
+    Batches and artifact uploads go through a single background thread, so the training loop
+    never waits on the tracking server and everything reaches it in the order it was logged.
+    `close` flushes the buffers and waits for every pending request.
+    """
+    def __init__(self, run_id: str, client = None, flush_metrics: int = MAX_BATCH_METRICS):
+        if client is None:
+            from mlflow.tracking import MlflowClient
+            client = MlflowClient()
+
+        self.run_id = run_id
+        self.client = client
+        self.flush_metrics = flush_metrics
+        self._lock = threading.Lock()
+        self._params: List[Any] = []
+        self._metrics: List[Any] = []
+        self._tags: List[Any] = []
+        self._executor = ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "mlflow-logger")
+        self._futures: List[Future] = []
+
+
+    def log_params(self, params: Dict[str, Any]):
+        """"
+        Buffers run parameters.
+
+        :param params: Dictionary name -> value
+        """
+        from mlflow.entities import Param
+
+        with self._lock:
+            self._params.extend(Param(str(k), str(v)) for k, v in params.items())
+
+
+    def log_param(self, key: str, value: Any):
+        self.log_params({key: value})
+
+
+    def log_metrics(self, metrics: Dict[str, float], step: int = 0):
+        """"
+        Buffers metrics, timestamped now; flushes once `flush_metrics` are pending.
+
+        :param metrics: Dictionary name -> value
+        :param step: Metric step
+        """
+        from mlflow.entities import Metric
+
+        timestamp = int(time.time() * 1000)
+        with self._lock:
+            self._metrics.extend(Metric(k, float(v), timestamp, step) for k, v in metrics.items())
+            full = len(self._metrics) >= self.flush_metrics
+        if full:
+            self.flush()
+
+
+    def log_metric(self, key: str, value: float, step: int = 0):
+        self.log_metrics({key: value}, step = step)
+
+
+    def set_tags(self, tags: Dict[str, Any]):
+        """"
+        Buffers run tags.
+
+        :param tags: Dictionary name -> value
+        """
+        from mlflow.entities import RunTag
+
+        with self._lock:
+            self._tags.extend(RunTag(str(k), str(v)) for k, v in tags.items())
+
+
+    def set_tag(self, key: str, value: Any):
+        self.set_tags({key: value})
+
+
+    def log_artifact(self, local_path: str, artifact_path: str | None = None):
+        """"
+        Uploads a file in the background. Pending batches are sent first.
+
+        :param local_path: Path of the file; it must not change until the logger is closed
+        :param artifact_path: Directory inside the run's artifact root
+        """
+        self.flush()
+        self._submit(self.client.log_artifact, self.run_id, local_path, artifact_path)
+
+
+    def flush(self):
+        """"
+        Sends the buffered params, metrics and tags as `log_batch` requests, without waiting for them.
+        """
+        with self._lock:
+            params, metrics, tags = self._params, self._metrics, self._tags
+            self._params, self._metrics, self._tags = [], [], []
+
+        while params or metrics or tags:
+            self._submit(self.client.log_batch, self.run_id, metrics = metrics[:MAX_BATCH_METRICS],
+                         params = params[:MAX_BATCH_PARAMS], tags = tags[:MAX_BATCH_TAGS])
+            params, metrics, tags = params[MAX_BATCH_PARAMS:], metrics[MAX_BATCH_METRICS:], tags[MAX_BATCH_TAGS:]
+
+
+    def _submit(self, fn, *args, **kwargs):
+        with self._lock:
+            self._futures = [f for f in self._futures if not f.done() or f.exception() is not None]
+            self._futures.append(self._executor.submit(fn, *args, **kwargs))
+
+
+    def close(self, raise_errors: bool = True):
+        """"
+        Flushes the buffers and waits for every pending batch and upload.
+
+        :param raise_errors: Re-raise the first failed request; otherwise failures are only reported
+        :raises Exception: The first error of a failed request, if `raise_errors`
+        """
+        self.flush()
+        self._executor.shutdown(wait = True)
+        errors = [f.exception() for f in self._futures if f.exception() is not None]
+        self._futures = []
+        for e in errors:
+            print(f"Error registrando en MLflow: {e}")
+        if errors and raise_errors:
+            raise errors[0]
+
+
+@contextmanager
+def logged_run(run_name: str, nested: bool = False, client = None) -> Iterator[RunLogger]:
+    """
+    Starts an MLflow run and yields its `RunLogger`.
+
+    The logger is closed before the run ends, also when the body raises, so everything logged up to
+    the failure is stored and the run is marked as failed.
+
+    :param run_name: Name of the run
+    :param nested: Whether the run is nested in the active one
+    :param client: Tracking client, by default `MlflowClient()`
+    :return: Logger of the run
+    """
+    import mlflow
+
+    with mlflow.start_run(run_name = run_name, nested = nested) as run:
+        logger = RunLogger(run.info.run_id, client = client)
+        try:
+            yield logger
+        except BaseException:
+            logger.close(raise_errors = False)
+            raise
+        logger.close()
@@ -1,12 +1,20 @@
 from __future__ import annotations
-from src.data import load_data, train_test_split_xy, normalize_data, remove_outliers
-from src.io_utils import timestamped_dir, ensure_latest_symlink, save_model
-from src.metrics import classification_metrics
-from src.modeling import ModelBuilder
+from src.data import load_data, train_test_split_xy, fit_normalize, remove_outliers, FittedScaler, DATA_SOURCES, CACHE_DIR
+from src.data import iter_xy_chunks, streaming_target_threshold, SAMPLE_CSV
+from src.io_utils import save_model, load_model, manifest_path
+from src.metrics import classification_metrics, binary_counts, metrics_from_counts
+from src.modeling import ModelBuilder, PreprocessedModel
+from src.stage_cache import StageCache, frame_digest
+from src.tracking import RunLogger, logged_run
+from src.profiling import Profiler
+from src.drift import DriftReference, reference_path
+from src.schema import FeatureSchema, schema_path
+from src.scorer import export_scorer
+from src.registry import ArtifactRegistry, apply_retention
 from typing import Dict, Any
-import mlflow
+import numpy as np
 import argparse
-import mlflow
+import time
 import yaml
 import os
 
@@ -28,12 +36,121 @@ def setup_mlflow(config: Dict[str, Any]):
 
     :param config: Configuration dictionary containing MLflow settings
     """
+    import mlflow
+
     tracking_uri = os.getenv("MLFLOW_TRACKING_URI", "file:./mlruns")
     mlflow.set_tracking_uri(tracking_uri)
     experiment_name = config.get("experiment_name", "mlops-boston")
     mlflow.set_experiment(experiment_name)
 
 
+def log_cache_report(logger: RunLogger, report: Dict[str, str]):
+    """
+    Logs the per-stage cache hits/misses to the active MLflow run.
+
+    :param logger: Logger of the active run
+    :param report: Dictionary stage -> "hit" | "miss" | "disabled"
+    """
+    if not report:
+        return
+    logger.set_tags({f"stage_cache.{stage}": status for stage, status in report.items()})
+    logger.log_metrics({"stage_cache_hits": sum(v == "hit" for v in report.values()),
+                        "stage_cache_misses": sum(v == "miss" for v in report.values())})
+
+
+def save_artifacts(logger: RunLogger, artifact: PreprocessedModel, base_dir: str, compress: str = "none",
+                   level: int = 3, reference: DriftReference | None = None, metrics: Dict[str, float] | None = None,
+                   retention: Dict[str, Any] | None = None, schema: FeatureSchema | None = None) -> str:
+    """
+    Saves the model and its NumPy scorer in a new timestamped directory, uploads both to the active
+    MLflow run in the background, indexes the directory in the artifact registry, points `latest`
+    at it and applies the retention policy.
+
+    :param logger: Logger of the active run
+    :param artifact: Trained model with its preprocessing
+    :param base_dir: Base directory of the artifacts
+    :param compress: Compression of the model artifact, see `save_model`
+    :param level: Compression level
+    :param reference: Training feature histograms for drift monitoring, saved next to the model
+    :param metrics: Metrics of the run, indexed with the artifact
+    :param retention: The `outputs.retention` section of the configuration
+    :param schema: Feature names, dtypes and ranges used to validate inference inputs, saved next to the model
+    :return: Path to the saved model
+    """
+    registry = ArtifactRegistry(base_dir)
+    out_dir = registry.allocate_dir()
+    model_path = os.path.join(out_dir, "model.joblib")
+    manifest = save_model(artifact, model_path, compress = compress, level = level)
+    logger.log_artifact(model_path, artifact_path = "model")
+    logger.log_artifact(manifest_path(model_path), artifact_path = "model")
+    logger.log_metrics({"model_size_bytes": manifest["size_bytes"], "model_load_seconds": manifest["load_seconds"]})
+    scorer_path = os.path.join(out_dir, "scorer.npz")
+    export_scorer(artifact, scorer_path)
+    logger.log_artifact(scorer_path, artifact_path = "model")
+    if reference is not None:
+        reference.save(reference_path(model_path))
+        logger.log_artifact(reference_path(model_path), artifact_path = "model")
+    if schema is not None:
+        schema.save(schema_path(model_path))
+        logger.log_artifact(schema_path(model_path), artifact_path = "model")
+
+    with registry:
+        registry.register(out_dir, run_id = logger.run_id, metrics = metrics)
+        registry.promote(out_dir)
+        report = apply_retention(registry, retention or {})
+    if report and report["removed"]:
+        logger.log_metrics({"retention_removed": len(report["removed"]),
+                            "retention_reclaimed_bytes": report["reclaimed_bytes"]})
+        print(f"Retencion: {len(report['removed'])} artefactos borrados ({report['reclaimed_bytes'] / 1024**2:.1f} MB)")
+
+    return model_path
+
+
+def fit_model(model_builder: ModelBuilder, X_train, y_train, scaler: FittedScaler, output_dir: str,
+              warm_start: bool = False) -> Dict[str, float]:
+    """
+    Trains the classifier, warm-started from the model behind `latest` when requested and compatible.
+
+    The savings of a warm fit are measured against the last cold fit recorded in the artifact
+    registry (`cold_fit_seconds`, `cold_fit_n_iter`), which every run carries forward, so no extra
+    cold fit is run to compare.
+
+    :param model_builder: Builder of the classifier
+    :param X_train: Preprocessed training features
+    :param y_train: Training target
+    :param scaler: Scaler fitted on the training split
+    :param output_dir: Base directory of the artifacts
+    :param warm_start: Initialize from `<output_dir>/latest/model.joblib`
+    :return: Fit metrics: `fit_seconds`, `fit_n_iter`, `warm_start` and the cold-fit baseline and
+        savings, indexed with the artifact
+    """
+    reason, baseline = "no solicitado", {}
+    if warm_start:
+        latest = os.path.join(output_dir, "latest")
+        if os.path.exists(os.path.join(latest, "model.joblib")):
+            reason = model_builder.warm_start_from(load_model(os.path.join(latest, "model.joblib")), scaler, y_train)
+            with ArtifactRegistry(output_dir) as registry:
+                baseline = (registry.get(latest) or {}).get("metrics", {})
+        else:
+            reason = "no hay modelo en latest"
+        print("Warm start desde latest" if reason is None else f"Entrenamiento en frio: {reason}")
+
+    start = time.perf_counter()
+    model_builder.train_model(X_train, y_train)
+    report = {"fit_seconds": time.perf_counter() - start,
+              "fit_n_iter": float(np.max(getattr(model_builder.model, "n_iter_", np.nan))),
+              "warm_start": float(reason is None)}
+
+    if reason is not None:
+        report.update(cold_fit_seconds = report["fit_seconds"], cold_fit_n_iter = report["fit_n_iter"])
+    elif "cold_fit_seconds" in baseline:
+        report.update(cold_fit_seconds = baseline["cold_fit_seconds"], cold_fit_n_iter = baseline["cold_fit_n_iter"])
+        report.update(warm_start_seconds_saved = report["cold_fit_seconds"] - report["fit_seconds"],
+                      warm_start_iter_saved = report["cold_fit_n_iter"] - report["fit_n_iter"])
+
+    return report
+
+
 def main():
     """
     Main function to execute the training pipeline.
@@ -41,54 +158,278 @@ def main():
     # Argument parsing
     parser = argparse.ArgumentParser(description = "Entrenamiento del modelo")
     parser.add_argument("--config", type = str, default = "configs/train_config.yaml")
+    parser.add_argument("--data_source", type = str, choices = DATA_SOURCES, default = None,
+                        help = "Origen de los datos; por defecto el de la configuracion o 'auto'")
+    parser.add_argument("--refresh_cache", action = "store_true", help = "Invalida la cache local de datos")
+    parser.add_argument("--search", action = "store_true", help = "Busqueda de hiperparametros segun la seccion 'search'")
+    parser.add_argument("--cv", action = "store_true", help = "Validacion cruzada segun la seccion 'cv'")
+    parser.add_argument("--warm_start", action = "store_true",
+                        help = "Inicializa el modelo desde artifacts/latest (o model.warm_start en la configuracion)")
+    parser.add_argument("--no-cache", dest = "no_cache", action = "store_true",
+                        help = "Recalcula todas las etapas sin usar la cache de etapas")
+    parser.add_argument("--profile", type = str, default = "",
+                        help = "Mide cada etapa y escribe la traza (formato Chrome trace) en este archivo JSON")
+    parser.add_argument("--profile_memory", action = "store_true",
+                        help = "Incluye el pico de memoria de tracemalloc en cada etapa (mas lento)")
     args = parser.parse_args()
+    profiler = Profiler(enabled = bool(args.profile), trace_memory = args.profile_memory)
+
+    try:
+        # Load configuration
+        config = load_config(args.config)
+        setup_mlflow(config)
+
+        # Experiment parameters
+        seed = int(config.get("seed", 42))
+        test_size = float(config.get("split", {}).get("test_size", 0.2))
+        model_name = config.get("model", {}).get("name", "RandomForestClassifier")
+        model_params = config.get("model", {}).get("params", {})
+        data_source = args.data_source or config.get("data", {}).get("source", "auto")
+        cache_dir = config.get("data", {}).get("cache_dir", CACHE_DIR)
+        compact = bool(config.get("data", {}).get("compact", False))
+        aliases = config.get("data", {}).get("aliases") or {}
+        search_config = config.get("search", {})
+        cv_config = config.get("cv", {})
+        contamination = float(config.get("outliers", {}).get("contamination", 0.05))
+        outlier_method = config.get("outliers", {}).get("method", "mcd")
+        output_dir = config.get("outputs", {}).get("dir", "artifacts")
+        save_options = {"compress": config.get("outputs", {}).get("compress", "none"),
+                       "level": int(config.get("outputs", {}).get("compress_level", 3)),
+                       "retention": config.get("outputs", {}).get("retention", {})}
+        cache_config = config.get("stage_cache", {})
+        stage_cache = StageCache(cache_config.get("dir", ".cache/stages"),
+                                 max_bytes = int(float(cache_config.get("max_gb", 2)) * 1024**3),
+                                 enabled = cache_config.get("enabled", True) and not args.no_cache)
+
+        if config.get("model", {}).get("mode", "batch") == "incremental":
+            run_incremental_mode(config.get("incremental", {}), model_name, seed, test_size, output_dir, save_options,
+                                 profiler, aliases)
+            return
+
+        # Data loading and preprocessing
+        with profiler.span("load_data"):
+            X, y = load_data(source = data_source, cache_dir = cache_dir, refresh = args.refresh_cache, compact = compact)
+            X_all, y_all = X, y
+            data_key = frame_digest(X, y)
+        with profiler.span("split"):
+            (X_train, X_test, y_train, y_test), split_key = stage_cache.run(
+                "split", train_test_split_xy, (X, y), {"test_size": test_size, "seed": seed}, [data_key])
+        with profiler.span("drift_reference"):
+            reference = DriftReference.from_frame(X_train)
+            schema = FeatureSchema.from_frame(X_train, aliases = aliases)
+        with profiler.span("normalize"):
+            (X_train, scaler), norm_key = stage_cache.run("normalize", fit_normalize, (X_train,), {}, [split_key])
+        with profiler.span("outliers"):
+            (X_train, y_train), _ = stage_cache.run(
+                "outliers", remove_outliers, (X_train, y_train), {"contamination": contamination, "method": outlier_method},
+                [norm_key, split_key])
+        print("Cache de etapas: " + ", ".join(f"{k}={v}" for k, v in stage_cache.report.items()))
 
-    # Load configuration
-    config = load_config(args.config)
-    setup_mlflow(config)
+        if args.search or search_config.get("enabled", False):
+            run_search_mode(search_config, model_name, model_params, seed, test_size, scaler,
+                            X_train, y_train, X_test, y_test, output_dir, stage_cache.report, save_options, profiler,
+                            reference, schema)
+            return
 
-    # Experiment parameters
-    seed = int(config.get("seed", 42))
-    test_size = float(config.get("split", {}).get("test_size", 0.2))
-    model_name = config.get("model", {}).get("name", "RandomForestClassifier")
-    model_params = config.get("model", {}).get("params", {})
+        with logged_run(f"{model_name}") as logger:
+            logger.log_params({"model_name": model_name,
+                               "test_size": test_size,
+                               "outlier_method": outlier_method,
+                               "contamination": contamination,
+                               **{f"param_{k}": v for k, v in model_params.items()}})
+            log_cache_report(logger, stage_cache.report)
+
+            # Model training
+            with profiler.span("fit"):
+                model_builder = ModelBuilder(random_state = seed, params = model_params)
+                fit_report = fit_model(model_builder, X_train.to_numpy(), y_train.to_numpy(), scaler, output_dir,
+                                       args.warm_start or config.get("model", {}).get("warm_start", False))
+                artifact = PreprocessedModel(model_builder.model, scaler)
+            logger.log_metrics(fit_report)
+
+            # Model evaluation on raw test data, through the same path used at inference
+            with profiler.span("predict"):
+                y_pred = artifact.predict(X_test)
+                y_score = artifact.predict_proba(X_test)[:, 1]
+
+            # Calculate and log metrics
+            with profiler.span("metrics"):
+                metrics = classification_metrics(y_test, y_pred, y_score)
+            logger.log_metrics(metrics)
+
+            # Cross-validation of the whole pipeline, one fold per worker
+            if args.cv or cv_config.get("enabled", False):
+                from src.validation import cross_validate
+
+                n_splits = int(cv_config.get("n_splits", 5))
+                with profiler.span("cross_validation"):
+                    _, cv_summary = cross_validate(X_all, y_all, model_params, seed = seed, n_splits = n_splits,
+                                                   n_jobs = int(cv_config.get("n_jobs", -1)),
+                                                   contamination = contamination, outlier_method = outlier_method)
+                logger.log_param("cv_n_splits", n_splits)
+                logger.log_metrics({f"cv_{k}": v for k, v in cv_summary.items()})
+                metrics.update({f"cv_{k}": v for k, v in cv_summary.items()})
+
+            # Save the model
+            with profiler.span("save_artifacts"):
+                model_path = save_artifacts(logger, artifact, output_dir, **save_options, reference = reference,
+                                            metrics = {**metrics, **fit_report}, schema = schema)
+            logger.log_metrics(profiler.metrics())
+
+            print("\n------ Resultados ------")
+            for k, v in metrics.items():
+                print(f"{k}: {v}")
+                print(f"Modelo guardado en: {model_path}")
+                print("Rastrea el experimento con: make mlflow-ui (http://localhost:5000)")
+    finally:
+        profiler.close()
+        if profiler.enabled:
+            profiler.write_trace(args.profile)
+            print(f"\n------ Perfil por etapa ------\n{profiler.summary()}\nTraza guardada en: {args.profile}")
+
+
+def run_search_mode(search_config: Dict[str, Any], model_name: str, model_params: Dict[str, Any], seed: int,
+                    test_size: float, scaler: FittedScaler, X_train, y_train, X_test, y_test, output_dir: str,
+                    cache_report: Dict[str, str] | None = None, save_options: Dict[str, Any] | None = None,
+                    profiler: Profiler | None = None, reference: DriftReference | None = None,
+                    schema: FeatureSchema | None = None):
+    """
+    Runs the hyperparameter search: every candidate becomes a nested MLflow run and the best one
+    is saved and promoted to `latest`.
+
+    :param search_config: The `search` section of the configuration
+    :param model_name: Name of the model, used for the run names
+    :param model_params: Base model parameters shared by every candidate
+    :param seed: Random seed for reproducibility
+    :param test_size: Proportion of the test split, logged as a parameter
+    :param scaler: Scaler fitted on the training split
+    :param X_train: Preprocessed training features
+    :param y_train: Training target
+    :param X_test: Raw test features
+    :param y_test: Test target
+    :param output_dir: Base directory of the artifacts
+    :param cache_report: Per-stage cache report of the preprocessing
+    :param save_options: Keyword arguments `compress`, `level` and `retention` for `save_artifacts`
+    :param profiler: Stage profiler; spans are logged as metrics of the parent run
+    :param reference: Training feature histograms saved next to the best model
+    :param schema: Training feature schema saved next to the best model
+    """
+    from src.search import expand_search_space, run_search, best_result, refit_candidate
+
+    profiler = profiler or Profiler(enabled = False)
+    metric = search_config.get("metric", "f1")
+    candidates = expand_search_space(search_config, seed = seed)
+    n_splits = int(search_config.get("n_splits", 5))
+
+    with logged_run(f"{model_name}-search") as logger:
+        logger.log_params({"model_name": model_name,
+                           "test_size": test_size,
+                           "search_strategy": search_config.get("strategy", "grid"),
+                           "search_candidates": len(candidates),
+                           "search_metric": metric,
+                           "search_cv_splits": n_splits})
+        log_cache_report(logger, cache_report or {})
+
+        with profiler.span("search"):
+            results = run_search(candidates, model_params, seed, X_train.to_numpy(), y_train.to_numpy(),
+                                 n_splits = n_splits, n_jobs = int(search_config.get("n_jobs", -1)))
+
+        for i, result in enumerate(results):
+            with logged_run(f"{model_name}-{i:03d}", nested = True) as candidate_logger:
+                candidate_logger.log_params({f"param_{k}": v for k, v in {**model_params, **result["params"]}.items()})
+                candidate_logger.log_metric("fit_time", result["fit_time"])
+                if result["error"] is None:
+                    candidate_logger.log_metrics({f"cv_{k}": v for k, v in result["metrics"].items()})
+                else:
+                    candidate_logger.set_tag("error", result["error"][:500])
+
+        # The winner is chosen on validation folds of the training split, refitted on all of it and
+        # scored once on the held-out test split
+        best = best_result(results, metric)
+        logger.log_params({f"best_param_{k}": v for k, v in best["params"].items()})
+        with profiler.span("fit"):
+            artifact = PreprocessedModel(refit_candidate(best["params"], model_params, seed, X_train.to_numpy(),
+                                                         y_train.to_numpy()), scaler)
+        with profiler.span("metrics"):
+            metrics = classification_metrics(y_test.to_numpy(), artifact.predict(X_test),
+                                             artifact.predict_proba(X_test)[:, 1])
+        metrics.update({f"cv_{k}": v for k, v in best["metrics"].items()})
+        logger.log_metrics(metrics)
+        with profiler.span("save_artifacts"):
+            model_path = save_artifacts(logger, artifact, output_dir, **(save_options or {}), reference = reference,
+                                        metrics = metrics, schema = schema)
+        logger.log_metrics(profiler.metrics())
+
+        print("\n------ Mejor candidato ------")
+        print(f"Parametros: {best['params']}")
+        for k, v in metrics.items():
+            print(f"{k}: {v}")
+        print(f"Modelo guardado en: {model_path}")
+
+
+def run_incremental_mode(incremental_config: Dict[str, Any], model_name: str, seed: int, test_size: float,
+                         output_dir: str, save_options: Dict[str, Any] | None = None,
+                         profiler: Profiler | None = None, aliases: Dict[str, str] | None = None):
+    """
+    Trains out-of-core on a CSV streamed from disk in chunks (`SGDClassifier` with log loss behind a
+    streaming scaler) and evaluates it on a streamed holdout. Outlier removal is skipped because it
+    needs the whole dataset.
+
+    :param incremental_config: The `incremental` section of the configuration
+    :param model_name: Name of the model, used for the run name
+    :param seed: Random seed for reproducibility
+    :param test_size: Approximate proportion of rows held out for evaluation
+    :param output_dir: Base directory of the artifacts
+    :param save_options: Keyword arguments `compress`, `level` and `retention` for `save_artifacts`
+    :param profiler: Stage profiler; spans are logged as metrics of the run
+    :param aliases: Input header -> feature name mappings stored in the feature schema
+    """
+    profiler = profiler or Profiler(enabled = False)
+    path = incremental_config.get("path", SAMPLE_CSV)
+    chunksize = int(incremental_config.get("chunksize", 100_000))
+    epochs = int(incremental_config.get("epochs", 5))
+    params = incremental_config.get("params", {})
 
-    # Data loading and preprocessing
-    X, y = load_data()
-    X = normalize_data(X)
-    X, y = remove_outliers(X, y, contamination = 0.05)
-    X_train, X_test, y_train, y_test = train_test_split_xy(X, y, test_size = test_size, seed = seed)
+    threshold = streaming_target_threshold(path, chunksize, seed = seed)
 
-    with mlflow.start_run(run_name = f"{model_name}"):
-        mlflow.log_params({"model_name": model_name,
+    with logged_run(f"{model_name}-incremental") as logger:
+        logger.log_params({"model_name": model_name,
+                           "mode": "incremental",
                            "test_size": test_size,
-                           **{f"param_{k}": v for k, v in model_params.items()}})
+                           "chunksize": chunksize,
+                           "epochs": epochs,
+                           "target_threshold": threshold,
+                           **{f"param_{k}": v for k, v in params.items()}})
 
-        # Model training
-        model_builder = ModelBuilder(random_state = seed, params = model_params)
-        model_builder.train_model(X_train, y_train)
+        def train_features():
+            return (X for X, _ in iter_xy_chunks(path, chunksize, threshold, split = "train", test_size = test_size))
 
-        # Model evaluation
-        y_pred = model_builder.predict(X_test)
+        with profiler.span("feature_schema"):
+            schema = FeatureSchema.from_chunks(train_features(), aliases = aliases)
+        with profiler.span("drift_reference"):
+            reference = DriftReference.from_chunks(train_features())
 
-        # Calculate and log metrics
-        metrics = classification_metrics(y_test, y_pred)
-        mlflow.log_metrics(metrics)
+        with profiler.span("fit"):
+            model_builder = ModelBuilder(random_state = seed, params = params, mode = "incremental")
+            artifact = model_builder.train_incremental(
+                lambda: iter_xy_chunks(path, chunksize, threshold, split = "train", test_size = test_size), epochs = epochs)
 
-        # Save the model
-        out_dir = timestamped_dir(config.get("outputs", {}).get("dir", "artifacts"))
-        model_path = os.path.join(out_dir, "model.joblib")
-        save_model(model_builder.model, model_path)
-        mlflow.log_artifact(model_path, artifact_path = "model")
+        with profiler.span("predict"):
+            counts = sum(binary_counts(y, artifact.predict(X))
+                         for X, y in iter_xy_chunks(path, chunksize, threshold, split = "test", test_size = test_size))
+        metrics = metrics_from_counts(counts)
+        logger.log_metrics(metrics)
 
-        ensure_latest_symlink(config.get("outputs", {}).get("dir", "artifacts"))
+        with profiler.span("save_artifacts"):
+            model_path = save_artifacts(logger, artifact, output_dir, **(save_options or {}), reference = reference,
+                                         metrics = metrics, schema = schema)
+        logger.log_metrics(profiler.metrics())
 
-        print("\n------ Resultados ------")
+        print("\n------ Resultados (incremental) ------")
         for k, v in metrics.items():
             print(f"{k}: {v}")
-            print(f"Modelo guardado en: {model_path}")
-            print("Rastrea el experimento con: make mlflow-ui (http://localhost:5000)")
+        print(f"Modelo guardado en: {model_path}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+from sklearn.model_selection import StratifiedKFold
+from src.data import FittedScaler, normalize_data, remove_outliers
+from src.metrics import classification_metrics, summarize_folds
+from src.modeling import ModelBuilder, PreprocessedModel
+from joblib import Parallel, delayed
+from typing import Any, Dict, List, Tuple
+import pandas as pd
+import numpy as np
+
+
+def evaluate_fold(X: pd.DataFrame, y: pd.Series, train_idx: np.ndarray, test_idx: np.ndarray, params: Dict[str, Any],
+                  seed: int = 42, contamination: float = 0.05, outlier_method: str = "mcd") -> Dict[str, float]:
+    """
+    Runs the training pipeline on one fold and scores its held-out rows.
+
+    The scaler and the outlier filter only see the fold's training rows, as in `src.train`.
+
+    :param X: Raw features
+    :param y: Target
+    :param train_idx: Positions of the training rows
+    :param test_idx: Positions of the held-out rows
+    :param params: Model parameters
+    :param seed: Random seed for reproducibility
+    :param contamination: Proportion of outliers removed from the training rows
+    :param outlier_method: Outlier detection backend, see `remove_outliers`
+    :return: Dictionary with the fold metrics, ROC-AUC included
+    """
+    X_train, y_train = X.iloc[train_idx], y.iloc[train_idx]
+    X_test, y_test = X.iloc[test_idx], y.iloc[test_idx]
+
+    scaler = FittedScaler.fit(X_train)
+    X_train, y_train = remove_outliers(normalize_data(X_train, scaler), y_train, contamination = contamination,
+                                       method = outlier_method)
+    builder = ModelBuilder(random_state = seed, params = params)
+    builder.train_model(X_train.to_numpy(), y_train.to_numpy())
+    artifact = PreprocessedModel(builder.model, scaler)
+
+    return classification_metrics(y_test.to_numpy(), artifact.predict(X_test), artifact.predict_proba(X_test)[:, 1])
+
+
+def cross_validate(X: pd.DataFrame, y: pd.Series, params: Dict[str, Any], seed: int = 42, n_splits: int = 5,
+                   n_jobs: int = -1, contamination: float = 0.05,
+                   outlier_method: str = "mcd") -> Tuple[List[Dict[str, float]], Dict[str, float]]:
+    """
+    Evaluates the training pipeline with stratified k-fold cross-validation, one fold per worker.
+
+    :param X: Raw features
+    :param y: Target
+    :param params: Model parameters
+    :param seed: Random seed for the fold assignment and the model
+    :param n_splits: Number of folds
+    :param n_jobs: Number of worker processes; -1 uses all cores
+    :param contamination: Proportion of outliers removed from each fold's training rows
+    :param outlier_method: Outlier detection backend, see `remove_outliers`
+    :return: Tuple of per-fold metrics and their mean/std summary
+    """
+    folds = StratifiedKFold(n_splits = n_splits, shuffle = True, random_state = seed).split(X, y)
+    fold_metrics = Parallel(n_jobs = n_jobs)(
+        delayed(evaluate_fold)(X, y, train_idx, test_idx, params, seed, contamination, outlier_method)
+        for train_idx, test_idx in folds)
+
+    return fold_metrics, summarize_folds(fold_metrics)
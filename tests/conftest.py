@@ -0,0 +1,19 @@
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+
+@pytest.fixture
+def toy_frame():
+    """
+    Two-feature training frame shared by the inference tests.
+    """
+    return pd.DataFrame({"a": [0.0, 1.0, 2.0, 3.0], "b": [1.0, 0.0, 1.0, 0.0]})
+
+
+@pytest.fixture
+def toy_model(toy_frame):
+    """
+    Logistic regression fitted on `toy_frame`, with feature names.
+    """
+    return LogisticRegression(random_state=42).fit(toy_frame, [0, 0, 1, 1])
@@ -0,0 +1,27 @@
+from benchmarks.bench_pipeline import compare_to_baseline, measure
+
+
+def test_compare_to_baseline():
+    """
+    Test that only regressions beyond the tolerance and the noise floor are reported.
+    """
+    baseline = {"train_model@1000": {"seconds": 1.0, "peak_mb": 10.0},
+                "predict@1000": {"seconds": 0.001, "peak_mb": 0.1}}
+    results = {"train_model@1000": {"seconds": 1.2, "peak_mb": 30.0},
+               "predict@1000": {"seconds": 0.003, "peak_mb": 0.5},
+               "load_data@1000": {"seconds": 5.0, "peak_mb": 100.0}}
+
+    regressions = compare_to_baseline(results, baseline, tolerance=0.5)
+
+    assert regressions == ["train_model@1000: 30.0 MB > 10.0 MB"]
+    assert len(compare_to_baseline(results, baseline, tolerance=0.1)) == 2
+
+
+def test_measure():
+    """
+    Test that a stage is timed and its allocations traced.
+    """
+    result = measure(lambda: bytearray(4 * 1024**2), repeat=2)
+
+    assert result["seconds"] >= 0
+    assert result["peak_mb"] >= 4
@@ -1,6 +1,10 @@
+import os
+import tempfile
+import pytest
 import pandas as pd
 import numpy as np
-from src.data import load_data, train_test_split_xy, normalize_data, remove_outliers
+from src.data import load_data, train_test_split_xy, normalize_data, remove_outliers, clear_data_cache, FittedScaler
+from src.data import SAMPLE_CSV, iter_xy_chunks, streaming_target_threshold
 
 def test_load_data():
     """
@@ -40,6 +44,20 @@ def test_normalize_data():
     assert np.allclose(X_norm.std(ddof=0).values, 1, atol=1e-10)
 
 
+def test_fitted_scaler_uses_training_statistics():
+    """
+    Test that a scaler fitted on the training split is reused as-is on new data.
+    """
+    X, y = load_data()
+    X_train, X_test, _, _ = train_test_split_xy(X, y, test_size=0.3, seed=42)
+    scaler = FittedScaler.fit(X_train)
+
+    X_test_norm = normalize_data(X_test, scaler)
+    expected = (X_test - X_train.mean()) / X_train.std(ddof=0)
+    assert np.allclose(X_test_norm.values, expected.values)
+    assert np.allclose(scaler.transform(X_test.to_numpy()), X_test_norm.values)
+
+
 def test_remove_outliers():
     """
     Test outlier removal functionality.
@@ -55,4 +73,109 @@ def test_remove_outliers():
     
     assert len(X_clean) == len(y_clean)
     assert len(X_clean) < len(X)
-    assert len(X_clean) >= int(0.8 * len(X))
\ No newline at end of file
+    assert len(X_clean) >= int(0.8 * len(X))
+
+
+def test_remove_outliers_backends():
+    """
+    Test the subsampled MCD and robust backends and their time/memory report.
+    """
+    X, y = load_data()
+    _, y_exact = remove_outliers(X, y, contamination=0.1)
+
+    for method in ["mcd_subsample", "robust"]:
+        stats = {}
+        X_clean, y_clean = remove_outliers(X, y, contamination=0.1, method=method, max_samples=300,
+                                           chunksize=100, stats=stats)
+        assert len(X_clean) == len(y_clean)
+        assert abs(stats["n_removed"] - 0.1 * len(X)) <= 0.05 * len(X)
+        assert stats["method"] == method
+        assert stats["seconds"] > 0 and stats["peak_memory_mb"] > 0
+        assert len(set(y_clean.index) & set(y_exact.index)) > 0.8 * len(y_exact)
+
+    with pytest.raises(ValueError):
+        remove_outliers(X, y, method="lof")
+
+def test_load_data_csv_source_is_cached():
+    """
+    Test that the bundled CSV is parsed once and then served from the columnar cache.
+    """
+    with tempfile.TemporaryDirectory() as cache_dir:
+        X, y = load_data(source="csv", cache_dir=cache_dir)
+        entries = os.listdir(cache_dir)
+        assert len(entries) == 1 and entries[0].startswith("boston-vsample-")
+        assert list(X.columns)[0] == "CRIM"
+
+        X_cached, y_cached = load_data(source="cache", cache_dir=cache_dir)
+        base = X_cached["CRIM"].to_numpy()
+        while base is not None and not isinstance(base, np.memmap):
+            base = base.base
+        assert isinstance(base, np.memmap)
+        assert X.equals(X_cached)
+        assert (y.values == y_cached.values).all()
+
+
+def test_clear_data_cache():
+    """
+    Test cache invalidation and the error raised when the cache is required but empty.
+    """
+    with tempfile.TemporaryDirectory() as cache_dir:
+        load_data(source="csv", cache_dir=cache_dir)
+        assert clear_data_cache(cache_dir) == 1
+
+        with pytest.raises(RuntimeError):
+            load_data(source="cache", cache_dir=cache_dir)
+
+        with pytest.raises(ValueError):
+            load_data(source="ftp", cache_dir=cache_dir)
+
+
+def test_streamed_chunks_and_threshold():
+    """
+    Test the streamed target threshold and the disjoint streamed train/test splits.
+    """
+    X, y = load_data(source="csv")
+    threshold = streaming_target_threshold(SAMPLE_CSV, chunksize=50)
+    test_threshold = streaming_target_threshold(SAMPLE_CSV, chunksize=50, max_samples=100)
+
+    train = list(iter_xy_chunks(SAMPLE_CSV, 50, threshold, split="train"))
+    test = list(iter_xy_chunks(SAMPLE_CSV, 50, threshold, split="test"))
+    train_rows = np.concatenate([c[0].index.to_numpy() for c in train])
+    test_rows = np.concatenate([c[0].index.to_numpy() for c in test])
+
+    assert all(len(c[0]) <= 50 for c in train)
+    assert len(np.intersect1d(train_rows, test_rows)) == 0
+    assert len(train_rows) + len(test_rows) == len(X)
+    assert list(train[0][0].columns) == list(X.columns)
+    labels = pd.concat([c[1] for c in train + test]).sort_index()
+    assert (labels.to_numpy() == y.to_numpy()).all()
+    assert 15 < test_threshold < 30
+
+def test_compact_dtypes_keep_metrics():
+    """
+    Test that the compact float32/small-integer path gives the same model metrics as float64.
+    """
+    from src.data import fit_normalize, optimize_dtypes
+    from src.modeling import ModelBuilder, PreprocessedModel
+    from src.metrics import classification_metrics
+
+    X, y = load_data(source="csv")
+    X_compact, _ = load_data(source="csv", compact=True)
+    assert X_compact["CHAS"].dtype == np.int8 and X_compact["RAD"].dtype == np.int8
+    assert X_compact["CRIM"].dtype == np.float32
+    assert X_compact.memory_usage(index=False).sum() < X.memory_usage(index=False).sum() / 2
+    assert np.allclose(X_compact.to_numpy(dtype=float), X.to_numpy(dtype=float), rtol=1e-6)
+    assert optimize_dtypes(pd.DataFrame({"x": [0.1, 1e-12 + 1.0]}), rtol=0)["x"].dtype == np.float64
+
+    metrics = []
+    for features in (X, X_compact):
+        X_train, X_test, y_train, y_test = train_test_split_xy(features, y, test_size=0.2, seed=42)
+        X_train, scaler = fit_normalize(X_train)
+        X_train, y_train = remove_outliers(X_train, y_train, method="robust")
+        builder = ModelBuilder(random_state=42, params={"max_iter": 1000, "solver": "liblinear"})
+        builder.train_model(X_train.to_numpy(), y_train.to_numpy())
+        artifact = PreprocessedModel(builder.model, scaler)
+        metrics.append(classification_metrics(y_test, artifact.predict(X_test), artifact.predict_proba(X_test)[:, 1]))
+
+    assert X_train.to_numpy().dtype == np.float32
+    assert metrics[0] == pytest.approx(metrics[1], abs=1e-9)
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from src.drift import DriftReference, DriftSketch, reference_path, psi, format_report
+
+def make_frame(n, shift=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"x": rng.normal(shift, 1.0, n), "k": rng.integers(0, 3, n).astype(np.float32)})
+
+def test_drift_detects_shift_and_roundtrips():
+    """
+    Test that shifted features are flagged and unchanged ones are not, after a save/load roundtrip.
+    """
+    reference = DriftReference.from_frame(make_frame(5000))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = reference_path(os.path.join(temp_dir, "model.joblib"))
+        reference.save(path)
+        reference = DriftReference.load(path)
+
+    current = make_frame(4000, seed=1)
+    current["x"] += 1.0
+    current.loc[:9, "k"] = np.nan
+    sketch = DriftSketch(reference)
+    sketch.update(current)
+    report = sketch.report()
+
+    assert report["drifted"] == ["x"]
+    assert report["features"]["k"]["psi"] < 0.05
+    assert report["features"]["k"]["missing"] == 10 and report["features"]["k"]["n"] == 3990
+    assert report["features"]["x"]["ks"] > 0.3
+    assert psi([10, 10], [10, 10]) == 0.0
+
+def test_sketches_merge_with_constant_memory():
+    """
+    Test that sketches of disjoint chunks add up to the sketch of the whole stream.
+    """
+    reference = DriftReference.from_frame(make_frame(1000))
+    data = make_frame(10_000, shift=0.5, seed=2)
+
+    whole = DriftSketch(reference)
+    whole.update(data)
+    merged = DriftSketch(reference)
+    for start in range(0, len(data), 1500):
+        part = DriftSketch(reference)
+        part.update(data.iloc[start:start + 1500])
+        merged.merge(part if start % 2 else part.counts)
+
+    assert np.array_equal(whole.counts, merged.counts)
+    assert whole.counts.size == DriftSketch(reference).counts.size
+    assert whole.report() == merged.report()
+
+def test_reference_from_chunks_and_empty_features():
+    """
+    Test a streamed reference matches the whole-frame one, and features without observed values report null, not NaN.
+    """
+    import json
+
+    data = make_frame(3000, seed=3)
+    reference = DriftReference.from_chunks((data[i:i + 500] for i in range(0, 3000, 500)), sample_rows=3000)
+    expected = DriftReference.from_frame(data)
+    assert all(np.array_equal(a, b) for a, b in zip(reference.edges, expected.edges))
+    assert np.array_equal(reference.counts, expected.counts)
+    assert DriftReference.from_chunks([data[:1000], data[1000:]], sample_rows=500).counts.sum() == 2 * 3000
+
+    current = make_frame(100, seed=4)
+    current["k"] = np.nan
+    sketch = DriftSketch(reference)
+    sketch.update(current)
+    report = json.loads(json.dumps(sketch.report(), allow_nan=False))
+    assert report["features"]["k"]["psi"] is None and report["features"]["k"]["missing"] == 100
+    assert "k" not in report["drifted"]
+    assert format_report(report)
@@ -1,8 +1,11 @@
 import os
 import tempfile
+import numpy as np
 import pandas as pd
 from sklearn.linear_model import LogisticRegression
-from src.io_utils import timestamped_dir, save_model, load_model, save_predictions
+import pytest
+from src.io_utils import timestamped_dir, ensure_latest_symlink, save_model, load_model, save_predictions, save_columns, load_columns
+from src.io_utils import file_sha256, read_manifest, PredictionWriter, prediction_frame
 
 def test_timestamped_dir():
     """
@@ -34,6 +37,39 @@ def test_save_load_model():
         pred_loaded = loaded_model.predict(X)
         assert all(pred_original == pred_loaded)
 
+def test_model_manifest_and_mmap():
+    """
+    Test the artifact manifest, compressed roundtrips and memory-mapped loading.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(60, 2000))
+        y = np.arange(60) % 2
+        model = LogisticRegression(max_iter=50).fit(X, y)
+
+        raw_path = os.path.join(temp_dir, "model.joblib")
+        manifest = save_model(model, raw_path)
+        assert manifest == read_manifest(raw_path)
+        assert manifest["compress"] == "none" and manifest["mmap_compatible"]
+        assert manifest["size_bytes"] == os.path.getsize(raw_path)
+        assert manifest["sha256"] == file_sha256(raw_path)
+        assert "load_seconds" in manifest
+
+        mapped = load_model(raw_path, mmap_mode="r")
+        assert isinstance(mapped.coef_, np.memmap)
+        assert np.array_equal(mapped.predict(X), model.predict(X))
+
+        zlib_path = os.path.join(temp_dir, "model_zlib.joblib")
+        manifest = save_model(model, zlib_path, compress="zlib", level=6)
+        assert manifest["level"] == 6 and not manifest["mmap_compatible"]
+        assert manifest["size_bytes"] < os.path.getsize(raw_path)
+        loaded = load_model(zlib_path, mmap_mode="r")
+        assert not isinstance(loaded.coef_, np.memmap)
+        assert np.array_equal(loaded.coef_, model.coef_)
+
+        with pytest.raises(ValueError):
+            save_model(model, raw_path, compress="gzip")
+
 def test_save_predictions():
     """
     Test predictions saving.
@@ -47,3 +83,73 @@ def test_save_predictions():
         assert os.path.exists(csv_path)
         df = pd.read_csv(csv_path)
         assert list(df["prediction"]) == preds
+
+@pytest.mark.parametrize("output_format", ["csv", "parquet", "arrow", "npy"])
+def test_prediction_writer_appends_chunks(output_format):
+    """
+    Test that chunked predictions with ids and probabilities round-trip in every output format.
+    """
+    proba = np.linspace(0, 1, 10)
+    chunks = [prediction_frame((proba[i:i + 4] > 0.5).astype(int), np.column_stack([1 - proba[i:i + 4], proba[i:i + 4]]),
+                               classes=[0, 1], row_ids=np.arange(i, min(i + 4, 10)))
+              for i in range(0, 10, 4)]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, f"predictions.{output_format}")
+        with PredictionWriter(path, output_format) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+
+        if output_format == "csv":
+            out = pd.read_csv(path)
+        elif output_format == "parquet":
+            import pyarrow.parquet as pq
+            assert pq.ParquetFile(path).metadata.num_row_groups == 3
+            out = pd.read_parquet(path)
+        elif output_format == "arrow":
+            import pyarrow as pa
+            with pa.ipc.open_file(path) as reader:
+                assert reader.num_record_batches == 3
+                out = reader.read_pandas()
+        else:
+            out = pd.DataFrame(np.load(path))
+
+    assert writer.n_rows == 10
+    assert list(out.columns) == ["row_id", "prediction", "proba_0", "proba_1"]
+    assert list(out["row_id"]) == list(range(10))
+    assert np.allclose(out["proba_1"], proba)
+
+def test_save_load_columns():
+    """
+    Test columnar save and memory-mapped load.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        df = pd.DataFrame({"a": [1.0, 2.0, 3.0], "b": [0, 1, 0]})
+        digest = save_columns(df, temp_dir)
+        loaded = load_columns(temp_dir)
+
+        assert len(digest) == 64
+        assert digest == save_columns(df, os.path.join(temp_dir, "copy"))
+        assert list(loaded.columns) == ["a", "b"]
+        assert list(loaded.dtypes) == list(df.dtypes)
+        assert all(np.array_equal(df[c].values, loaded[c].values) for c in df.columns)
+        base = loaded["a"].to_numpy()
+        while base is not None and not isinstance(base, np.memmap):
+            base = base.base
+        assert isinstance(base, np.memmap)
+
+def test_ensure_latest_symlink():
+    """
+    Test that `latest` points to the newest or the requested directory.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        old = os.path.join(temp_dir, "20240101_000000")
+        new = os.path.join(temp_dir, "20240102_000000")
+        os.makedirs(old)
+        os.makedirs(new)
+
+        latest = ensure_latest_symlink(temp_dir)
+        assert os.path.realpath(latest) == os.path.realpath(new)
+
+        ensure_latest_symlink(temp_dir, target_dir=old)
+        assert os.path.realpath(latest) == os.path.realpath(old)
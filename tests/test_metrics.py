@@ -28,3 +28,59 @@ def test_perfect_classification():
     assert metrics["precision"] == 1.0
     assert metrics["recall"] == 1.0
     assert metrics["f1"] == 1.0
+
+def test_metrics_match_sklearn():
+    """
+    Test the confusion-matrix based metrics and ROC-AUC against sklearn.
+    """
+    from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score, confusion_matrix
+    from src.metrics import confusion_counts
+
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 2, 5000)
+    y_score = np.round(np.clip(y_true * 0.3 + rng.random(5000) * 0.7, 0, 1), 2)
+    y_pred = (y_score > 0.5).astype(int)
+
+    metrics = classification_metrics(y_true, y_pred, y_score)
+
+    assert (confusion_counts(y_true, y_pred) == confusion_matrix(y_true, y_pred)).all()
+    assert np.isclose(metrics["accuracy"], accuracy_score(y_true, y_pred))
+    assert np.isclose(metrics["precision"], precision_score(y_true, y_pred))
+    assert np.isclose(metrics["recall"], recall_score(y_true, y_pred))
+    assert np.isclose(metrics["f1"], f1_score(y_true, y_pred))
+    assert np.isclose(metrics["roc_auc"], roc_auc_score(y_true, y_score))
+
+def test_confusion_counts_encodes_any_labels():
+    """
+    Test labels outside {0, 1} against sklearn, and that batches keep a summable binary layout.
+    """
+    import pytest
+    from sklearn.metrics import confusion_matrix, f1_score
+    from src.metrics import confusion_counts, binary_counts
+
+    rng = np.random.default_rng(1)
+    for labels in ([-1, 1], [1, 2], [0.0, 1.0], [3, 7, 9]):
+        y_true, y_pred = rng.choice(labels, 200), rng.choice(labels, 200)
+        assert (confusion_counts(y_true, y_pred) == confusion_matrix(y_true, y_pred)).all()
+
+    y_true, y_pred = rng.choice([-1, 1], 200), rng.choice([-1, 1], 200)
+    assert np.isclose(classification_metrics(y_true, y_pred)["f1"], f1_score(y_true, y_pred))
+    assert (binary_counts(y_true[:100], y_pred[:100]) + binary_counts(y_true[100:], y_pred[100:])
+            == binary_counts(y_true, y_pred)).all()
+    assert binary_counts([1, 1], [1, 1]).tolist() == [[0, 0], [0, 2]]
+
+    with pytest.raises(ValueError):
+        confusion_counts([0, 1], [0, 2], labels=[0, 1])
+    with pytest.raises(ValueError):
+        classification_metrics([0, 1, 2], [0, 1, 2])
+
+def test_summarize_folds():
+    """
+    Test mean/std aggregation of per-fold metrics.
+    """
+    from src.metrics import summarize_folds
+
+    summary = summarize_folds([{"f1": 0.5}, {"f1": 0.7}])
+
+    assert np.isclose(summary["f1_mean"], 0.6)
+    assert np.isclose(summary["f1_std"], 0.1)
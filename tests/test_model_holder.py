@@ -0,0 +1,58 @@
+import os
+import tempfile
+from sklearn.linear_model import LogisticRegression
+from src.io_utils import save_model, ensure_latest_symlink
+from src.model_holder import ModelHolder
+
+
+def _save_version(base_dir, name, C):
+    path = os.path.join(base_dir, name)
+    os.makedirs(path)
+    model = LogisticRegression(C=C).fit([[0.0], [1.0], [2.0], [3.0]], [0, 0, 1, 1])
+    save_model(model, os.path.join(path, "model.joblib"))
+    return path
+
+
+def test_holder_swaps_when_latest_moves():
+    """
+    Test that moving the `latest` symlink swaps the served model.
+    """
+    with tempfile.TemporaryDirectory() as base_dir:
+        first = _save_version(base_dir, "20240101_000000", C=1.0)
+        second = _save_version(base_dir, "20240102_000000", C=0.5)
+        ensure_latest_symlink(base_dir, target_dir=first)
+
+        holder = ModelHolder(os.path.join(base_dir, "latest", "model.joblib"))
+        in_flight = holder.get()
+        assert holder.check() is False
+
+        ensure_latest_symlink(base_dir, target_dir=second)
+        assert holder.check() is True
+        assert holder.get().C == 0.5
+        model, version = holder.get_with_version()
+        assert model.C == 0.5 and version == os.path.realpath(os.path.join(second, "model.joblib"))
+        assert in_flight.C == 1.0
+        assert holder.stats()["swaps"] == 1
+        assert holder.stats()["last_swap_latency_ms"] is not None
+
+
+def test_holder_keeps_current_model_on_failed_load():
+    """
+    Test that a broken artifact is rejected and the previous model keeps serving.
+    """
+    with tempfile.TemporaryDirectory() as base_dir:
+        good = _save_version(base_dir, "20240101_000000", C=1.0)
+        broken = os.path.join(base_dir, "20240102_000000")
+        os.makedirs(broken)
+        with open(os.path.join(broken, "model.joblib"), "wb") as f:
+            f.write(b"not a model")
+        ensure_latest_symlink(base_dir, target_dir=good)
+
+        holder = ModelHolder(os.path.join(base_dir, "latest", "model.joblib"))
+        ensure_latest_symlink(base_dir)
+
+        assert holder.check() is False
+        assert holder.check() is False
+        assert holder.get().C == 1.0
+        assert holder.stats()["failed_loads"] == 1
+        assert holder.version == os.path.realpath(os.path.join(good, "model.joblib"))
@@ -38,3 +38,89 @@ def test_model_training_and_prediction():
     assert trained_model is not None
     assert len(predictions) == len(X_test)
     assert all(pred in [0, 1] for pred in predictions)
+
+def test_preprocessed_model_matches_sklearn_pipeline():
+    """
+    Test that the saved scaler+classifier artifact scores raw frames like an sklearn pipeline.
+    """
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.linear_model import LogisticRegression
+    from src.data import FittedScaler
+    from src.modeling import PreprocessedModel
+
+    rng = np.random.default_rng(0)
+    X_train = pd.DataFrame(rng.normal(5, 3, size=(60, 3)), columns=["a", "b", "c"])
+    y_train = pd.Series((X_train["a"] + rng.normal(0, 1, 60) > 5).astype(int))
+    X_new = X_train.sample(10, random_state=1).assign(extra=1.0)[["extra", "c", "a", "b"]]
+
+    scaler = FittedScaler.fit(X_train)
+    builder = ModelBuilder(random_state=42, params={"max_iter": 1000})
+    builder.train_model(scaler.transform(X_train), y_train.to_numpy())
+    artifact = PreprocessedModel(builder.model, scaler)
+
+    reference = make_pipeline(StandardScaler(), LogisticRegression(random_state=42, max_iter=1000))
+    reference.fit(X_train, y_train)
+
+    assert list(artifact.predict(X_new)) == list(reference.predict(X_new[["a", "b", "c"]]))
+    assert np.allclose(artifact.predict_proba(X_new), reference.predict_proba(X_new[["a", "b", "c"]]))
+
+def test_incremental_training_from_disk():
+    """
+    Test out-of-core training on chunks streamed from the sample CSV.
+    """
+    from src.data import SAMPLE_CSV, iter_xy_chunks, streaming_target_threshold, load_data
+    from src.modeling import PreprocessedModel
+
+    threshold = streaming_target_threshold(SAMPLE_CSV, chunksize=100)
+    builder = ModelBuilder(random_state=42, params={"alpha": 0.001}, mode="incremental")
+    artifact = builder.train_incremental(lambda: iter_xy_chunks(SAMPLE_CSV, 64, threshold), epochs=5)
+
+    X, y = load_data(source="csv")
+    assert isinstance(artifact, PreprocessedModel)
+    assert artifact.feature_names == list(X.columns)
+    assert (artifact.predict(X) == y.to_numpy()).mean() > 0.75
+    assert artifact.predict_proba(X.head()).shape == (5, 2)
+
+    try:
+        ModelBuilder(random_state=42, params={}).train_incremental(lambda: [], epochs=1)
+        assert False, "Should raise ValueError"
+    except ValueError:
+        pass
+
+def test_warm_start_from_previous_artifact():
+    """
+    Test warm starting maps the previous model onto the new scaler, converges in fewer iterations and
+    falls back to a cold fit when the solver, features or hyperparameters changed.
+    """
+    from src.data import FittedScaler
+    from src.modeling import PreprocessedModel
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(5, 3, size=(2000, 4)), columns=["a", "b", "c", "d"])
+    y = ((X["a"] - X["b"] + rng.normal(0, 2, 2000)) > 0).astype(int).to_numpy()
+    params = {"max_iter": 1000, "solver": "lbfgs", "tol": 1e-8}
+
+    old_scaler = FittedScaler.fit(X[:1500])
+    old = ModelBuilder(random_state=42, params=params)
+    old.train_model(old_scaler.transform(X[:1500]), y[:1500])
+    previous = PreprocessedModel(old.model, old_scaler)
+
+    scaler = FittedScaler.fit(X)
+    warm = ModelBuilder(random_state=42, params=params)
+    assert warm.warm_start_from(previous, scaler, y) is None
+    assert np.allclose(warm.model.decision_function(scaler.transform(X)), previous.model.decision_function(
+        old_scaler.transform(X)))
+    warm.train_model(scaler.transform(X), y)
+    cold = ModelBuilder(random_state=42, params=params)
+    cold.train_model(scaler.transform(X), y)
+
+    assert warm.model.n_iter_[0] < cold.model.n_iter_[0]
+    assert np.allclose(warm.model.coef_, cold.model.coef_, atol=1e-3)
+
+    liblinear = ModelBuilder(random_state=42, params={**params, "solver": "liblinear"})
+    assert "liblinear" in liblinear.warm_start_from(previous, scaler, y)
+    assert "C" in ModelBuilder(random_state=42, params={**params, "C": 0.1}).warm_start_from(previous, scaler, y)
+    renamed = FittedScaler(["a", "b", "c", "e"], scaler.mean_, scaler.scale_)
+    assert ModelBuilder(random_state=42, params=params).warm_start_from(previous, renamed, y) is not None
+    assert ModelBuilder(random_state=42, params={**params, "max_iter": 50}).warm_start_from(previous, scaler, y) is None
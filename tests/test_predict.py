@@ -1,5 +1,7 @@
 import os
+import json
 import tempfile
+import numpy as np
 import pandas as pd
 from sklearn.linear_model import LogisticRegression
 from unittest.mock import patch, MagicMock
@@ -35,6 +37,7 @@ def test_predict_main_with_model():
                 # Check that predictions file was created
                 pred_file = os.path.join(temp_dir, "predictions.csv")
                 assert os.path.exists(pred_file)
+                assert list(pd.read_csv(pred_file).columns) == ["prediction"]
 
 def test_predict_with_sample_data():
     """
@@ -57,3 +60,201 @@ def test_predict_with_sample_data():
     
     assert len(default_data) == 2
     assert len(default_data.columns) == 13
+
+def test_predict_main_streaming_chunks(toy_model):
+    """
+    Test chunked streaming inference keeps row order and ids.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model = toy_model
+        model_path = os.path.join(temp_dir, "model.joblib")
+        save_model(model, model_path)
+
+        samples = pd.DataFrame({"id": range(100, 110),
+                                "a": [0.1 * i for i in range(10)],
+                                "b": [i % 2 for i in range(10)]})
+        samples_path = os.path.join(temp_dir, "samples.csv")
+        samples.to_csv(samples_path, index=False)
+        output_path = os.path.join(temp_dir, "predictions.csv")
+
+        test_args = ["predict.py", "--model_path", model_path, "--samples_file", samples_path,
+                     "--output_csv", output_path, "--chunksize", "3", "--id_column", "id"]
+        with patch('sys.argv', test_args):
+            with patch('builtins.print'):
+                from src.predict import main
+                main()
+
+        out = pd.read_csv(output_path)
+        assert list(out.columns) == ["id", "prediction"]
+        assert list(out["id"]) == list(range(100, 110))
+        assert list(out["prediction"]) == list(model.predict(samples[["a", "b"]]))
+
+def test_predict_parallel_keeps_input_order(toy_model):
+    """
+    Test multi-process scoring reassembles predictions in input order.
+    """
+    from src.predict import predict_parallel
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model = toy_model
+        model_path = os.path.join(temp_dir, "model.joblib")
+        save_model(model, model_path)
+
+        samples = pd.DataFrame({"a": [0.15 * i for i in range(25)], "b": [i % 2 for i in range(25)]})
+        samples_path = os.path.join(temp_dir, "samples.csv")
+        samples.to_csv(samples_path, index=False)
+        output_path = os.path.join(temp_dir, "predictions.csv")
+
+        with patch('builtins.print'):
+            n_rows = predict_parallel(model_path, samples_path, output_path, chunksize=4, workers=2)
+
+        out = pd.read_csv(output_path)
+        assert n_rows == 25
+        assert list(out["row_id"]) == list(range(25))
+        assert list(out["prediction"]) == list(model.predict(samples))
+
+        from src.predict import main
+        test_args = ["predict.py", "--model_path", model_path, "--samples_file", samples_path,
+                     "--output_csv", output_path, "--workers", "2", "--cache"]
+        with patch('sys.argv', test_args):
+            try:
+                main()
+                assert False, "Expected ValueError"
+            except ValueError as e:
+                assert "--cache" in str(e)
+
+def test_predict_streaming_parquet_output(toy_model):
+    """
+    Test streaming inference to Parquet with ids and class probabilities.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model = toy_model
+        model_path = os.path.join(temp_dir, "model.joblib")
+        save_model(model, model_path)
+
+        samples = pd.DataFrame({"a": [0.3 * i for i in range(10)], "b": [i % 2 for i in range(10)]})
+        samples_path = os.path.join(temp_dir, "samples.csv")
+        samples.to_csv(samples_path, index=False)
+
+        test_args = ["predict.py", "--model_path", model_path, "--samples_file", samples_path,
+                     "--output_csv", os.path.join(temp_dir, "predictions.csv"), "--chunksize", "4",
+                     "--output_format", "parquet"]
+        with patch('sys.argv', test_args):
+            with patch('builtins.print'):
+                from src.predict import main
+                main()
+
+        out = pd.read_parquet(os.path.join(temp_dir, "predictions.parquet"))
+        assert list(out["row_id"]) == list(range(10))
+        assert list(out["prediction"]) == list(model.predict(samples))
+        assert np.allclose(out[["proba_0", "proba_1"]].to_numpy(), model.predict_proba(samples))
+
+def test_predict_champion_challenger_single_pass():
+    """
+    Test scoring several models in one pass writes their predictions side by side with an agreement summary,
+    monitors drift in the same pass and rejects options it cannot honour.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from src.drift import DriftReference, reference_path
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        X_train = pd.DataFrame({"a": [0.0, 1.0, 2.0, 3.0, 4.0, 5.0], "b": [1.0, 0.0, 1.0, 0.0, 1.0, 0.0]})
+        y_train = [0, 0, 0, 1, 1, 1]
+        models = {"latest": LogisticRegression(random_state=42).fit(X_train, y_train),
+                  "20240101-000000": LogisticRegression(C=0.01).fit(X_train, y_train),
+                  "forest": RandomForestClassifier(n_estimators=5, random_state=0).fit(X_train, y_train)}
+        paths = []
+        for name, model in models.items():
+            os.makedirs(os.path.join(temp_dir, name))
+            paths.append(os.path.join(temp_dir, name, "model.joblib"))
+            save_model(model, paths[-1])
+
+        DriftReference.from_frame(X_train).save(reference_path(paths[0]))
+
+        samples = pd.DataFrame({"a": [0.5 * i for i in range(12)], "b": [i % 2 for i in range(12)]})
+        samples_path = os.path.join(temp_dir, "samples.csv")
+        samples.to_csv(samples_path, index=False)
+        report_path = os.path.join(temp_dir, "compare.json")
+        drift_path = os.path.join(temp_dir, "drift.json")
+
+        test_args = ["predict.py", "--model_path", paths[0], "--challengers", *paths[1:],
+                     "--samples_file", samples_path, "--output_csv", os.path.join(temp_dir, "predictions.csv"),
+                     "--chunksize", "5", "--compare_report", report_path, "--drift_report", drift_path]
+        from src.predict import main
+        with patch('sys.argv', test_args):
+            with patch('builtins.print'):
+                main()
+
+        out = pd.read_csv(os.path.join(temp_dir, "predictions.csv"))
+        with open(report_path) as f:
+            summary = json.load(f)
+        with open(drift_path) as f:
+            drift = json.load(f)
+
+        with patch('sys.argv', test_args + ["--workers", "2"]):
+            try:
+                main()
+                assert False, "Expected ValueError"
+            except ValueError as e:
+                assert "--workers" in str(e)
+
+    assert drift["features"]["a"]["n"] == 12
+    assert list(out["row_id"]) == list(range(12))
+    for name, model in models.items():
+        assert list(out[f"prediction_{name}"]) == list(model.predict(samples))
+        assert np.allclose(out[[f"proba_0_{name}", f"proba_1_{name}"]].to_numpy(), model.predict_proba(samples))
+        expected = (model.predict(samples) == models["latest"].predict(samples)).mean()
+        assert np.isclose(summary[name]["agreement"], expected)
+    assert summary["latest"]["agreement"] == 1.0 and summary["latest"]["proba_mae"] == 0.0
+    assert summary["20240101-000000"]["stacked"] and not summary["forest"]["stacked"]
+
+def test_predict_quarantines_rows_outside_schema(toy_frame, toy_model):
+    """
+    Test rows breaking the feature schema are quarantined instead of failing the batch, in every mode.
+    """
+    from src.schema import FeatureSchema, schema_path
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model = toy_model
+        model_path = os.path.join(temp_dir, "model.joblib")
+        save_model(model, model_path)
+        FeatureSchema.from_frame(toy_frame).save(schema_path(model_path))
+
+        samples = pd.DataFrame({"id": range(10), "B": [i % 2 for i in range(10)],
+                                "a": [0.3 * i for i in range(10)]}).astype(object)
+        samples.loc[2, "a"] = "abc"
+        samples.loc[5, "a"] = 50.0
+        samples_path = os.path.join(temp_dir, "samples.csv")
+        samples.to_csv(samples_path, index=False)
+
+        for extra in [[], ["--chunksize", "3"], ["--chunksize", "3", "--workers", "2"]]:
+            output_path = os.path.join(temp_dir, "predictions.csv")
+            test_args = ["predict.py", "--model_path", model_path, "--samples_file", samples_path,
+                         "--output_csv", output_path, "--id_column", "id", *extra]
+            with patch('sys.argv', test_args):
+                with patch('builtins.print'):
+                    from src.predict import main
+                    main()
+
+            out = pd.read_csv(output_path)
+            quarantined = pd.read_csv(os.path.join(temp_dir, "predictions.quarantine.csv"))
+            assert list(quarantined["id"]) == [2, 5]
+            assert list(quarantined["quarantine_reason"]) == ["a", "a"]
+            assert list(out.columns) == ["id", "prediction"]
+            assert len(out) == 8 and 2 not in set(out["id"])
+
+def test_compare_chunks_scores_unnamed_models_individually(toy_frame, toy_model):
+    """
+    Test a bare estimator fitted on arrays is left out of the stacked scorer instead of failing on made-up column names.
+    """
+    from src.predict import compare_chunks
+
+    bare = LogisticRegression(random_state=42).fit(toy_frame.to_numpy(), [0, 0, 1, 1])
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = os.path.join(temp_dir, "predictions.csv")
+        summary = compare_chunks({"named": toy_model, "bare": bare}, [toy_frame], output_path)
+        out = pd.read_csv(output_path)
+
+    assert summary["named"]["stacked"] and not summary["bare"]["stacked"]
+    assert list(out["prediction_bare"]) == list(bare.predict(toy_frame.to_numpy()))
+    assert summary["bare"]["agreement"] == 1.0
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from src.io_utils import save_model
+from src.prediction_cache import PredictionCache, CachedModel, model_checksum
+
+
+class CountingModel:
+    def __init__(self, model):
+        self.model = model
+        self.classes_ = model.classes_
+        self.feature_names_in_ = model.feature_names_in_
+        self.rows = 0
+
+    def predict(self, X):
+        self.rows += len(X)
+        return self.model.predict(X)
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(X)
+
+
+def make_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"b": rng.integers(0, 2, n).astype(float), "a": rng.integers(0, 4, n) * 0.5})
+
+
+def test_cache_dedups_batch_and_matches_model(toy_model):
+    """
+    Test that a batch is scored once per distinct row, repeated batches hit the cache and results match the model.
+    """
+    base = toy_model
+    model = CountingModel(base)
+    cache = PredictionCache("v1")
+    X = make_rows(1000)
+    X.loc[0, "a"] = -0.0
+    X.loc[1, "a"] = 0.0
+
+    preds, proba = CachedModel(model, cache).predict_with_proba(X)
+    np.testing.assert_array_equal(preds, base.predict(X[["a", "b"]]))
+    np.testing.assert_allclose(proba, base.predict_proba(X[["a", "b"]]))
+    assert preds.dtype == base.classes_.dtype
+    assert model.rows == len(X.drop_duplicates()) == 8
+
+    X_next = make_rows(500, seed=1)
+    preds, proba = CachedModel(model, cache).predict_with_proba(X_next)
+    np.testing.assert_array_equal(preds, base.predict(X_next[["a", "b"]]))
+    np.testing.assert_allclose(proba, base.predict_proba(X_next[["a", "b"]]))
+    report = cache.report()
+    assert report["rows"] == 1500 and report["unique_rows"] == 16
+    assert report["misses"] == model.rows == 8
+    assert report["memory_hits"] == 8 and report["skipped_calls"] == 1
+
+
+def test_cache_lru_disk_tier_and_invalidation(toy_model):
+    """
+    Test that the LRU stays bounded, the SQLite tier survives a restart and a new model checksum drops old entries.
+    """
+    base = toy_model
+    X = pd.DataFrame({"a": np.arange(20, dtype=float), "b": np.zeros(20)})
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model_path = os.path.join(temp_dir, "model.joblib")
+        save_model(base, model_path)
+        checksum = model_checksum(model_path)
+        db_path = os.path.join(temp_dir, "cache.sqlite")
+
+        cache = PredictionCache(checksum, max_entries=5, db_path=db_path)
+        cache.score(base, X)
+        assert len(cache._memory) == 5
+        cache.close()
+
+        model = CountingModel(base)
+        cache = PredictionCache(checksum, max_entries=5, db_path=db_path)
+        preds, proba = cache.score(model, X)
+        np.testing.assert_array_equal(preds, base.predict(X))
+        np.testing.assert_allclose(proba, base.predict_proba(X))
+        assert model.rows == 0 and cache.report()["disk_hits"] == 20
+
+        cache.ensure_model("other")
+        assert not cache._memory
+        cache.score(model, X.head(3))
+        assert model.rows == 3
+        cache.close()
+
+        cache = PredictionCache(checksum, db_path=db_path)
+        cache.score(model, X)
+        assert model.rows == 23
+        cache.close()
@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from src.profiling import Profiler
+
+def test_nested_spans_and_trace():
+    """
+    Test that nested spans record timing and memory and export to metrics and a Chrome trace.
+    """
+    with Profiler(trace_memory=True) as profiler:
+        @profiler.wrap("fit")
+        def fit():
+            time.sleep(0.01)
+            return bytearray(2 * 1024**2)
+
+        with profiler.span("train"):
+            fit()
+            with profiler.span("metrics"):
+                sum(range(1000))
+    assert not tracemalloc.is_tracing()
+
+    spans = {s["name"]: s for s in profiler.spans}
+    assert set(spans) == {"train", "fit", "metrics"}
+    assert spans["fit"]["depth"] == 1 and spans["train"]["depth"] == 0
+    assert spans["fit"]["wall_s"] >= 0.01
+    assert spans["train"]["wall_s"] >= spans["fit"]["wall_s"]
+    assert spans["fit"]["traced_peak_mb"] >= 2
+    assert spans["train"]["traced_peak_mb"] >= spans["fit"]["traced_peak_mb"]
+    assert profiler.metrics()["span.fit.wall_s"] == spans["fit"]["wall_s"]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "trace.json")
+        profiler.write_trace(path)
+        with open(path) as f:
+            events = json.load(f)["traceEvents"]
+
+    assert [e["name"] for e in events] == ["train", "fit", "metrics"]
+    assert all(e["ph"] == "X" and e["dur"] > 0 for e in events)
+
+def test_disabled_profiler_records_nothing():
+    """
+    Test that a disabled profiler hands out a no-op context and keeps no spans.
+    """
+    profiler = Profiler(enabled=False)
+
+    with profiler.span("fit"):
+        pass
+
+    assert profiler.span("a") is profiler.span("b")
+    assert profiler.spans == [] and profiler.metrics() == {}
+
+def test_profiler_without_resource_module():
+    """
+    Test that spans still record time and the tracemalloc peak where `resource` is missing (Windows).
+    """
+    from unittest.mock import patch
+
+    with patch("src.profiling.resource", None), Profiler(trace_memory=True) as profiler:
+        with profiler.span("fit"):
+            bytearray(2 * 1024**2)
+
+    span = profiler.spans[0]
+    assert span["peak_rss_delta_mb"] == 0.0 and span["traced_peak_mb"] >= 2
+
+def test_profiler_leaves_foreign_tracing_running():
+    """
+    Test that closing a profiler only stops tracemalloc when the profiler itself started it.
+    """
+    tracemalloc.start()
+    try:
+        Profiler(trace_memory=True).close()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
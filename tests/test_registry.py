@@ -0,0 +1,59 @@
+import os
+import tempfile
+from unittest.mock import patch
+from sklearn.linear_model import LogisticRegression
+from src.io_utils import save_model
+from src.registry import ArtifactRegistry, apply_retention
+
+def _add_artifact(registry, f1, created_at):
+    path = registry.allocate_dir()
+    save_model(LogisticRegression().fit([[0.0], [1.0]], [0, 1]), os.path.join(path, "model.joblib"))
+    registry.register(path, run_id=f"run-{created_at}", metrics={"f1": f1}, created_at=created_at)
+    return path
+
+def test_registry_allocates_unique_dirs_and_queries_index():
+    """
+    Test same-second allocations never collide and lookups by metric and time use the index.
+    """
+    with tempfile.TemporaryDirectory() as base_dir, ArtifactRegistry(base_dir) as registry:
+        with patch("time.strftime", return_value="20240101_000000"):
+            paths = [_add_artifact(registry, f1, t) for t, f1 in enumerate([0.5, 0.9, 0.7, 0.6])]
+        assert len(set(paths)) == 4
+        assert [os.path.basename(p) for p in paths[:2]] == ["20240101_000000", "20240101_000000_01"]
+
+        assert registry.best("f1")[0]["path"] == os.path.realpath(paths[1])
+        assert [r["metrics"]["f1"] for r in registry.best("f1", k=2, since=2)] == [0.7, 0.6]
+        assert registry.latest()["path"] == os.path.realpath(paths[3])
+        assert registry.latest()["sha256"] and registry.latest()["size_bytes"] > 0
+        assert [r["run_id"] for r in registry.find(until=1)] == ["run-1", "run-0"]
+
+        latest = registry.promote(paths[0])
+        assert os.path.realpath(latest) == os.path.realpath(paths[0])
+
+        path = registry.allocate_dir()
+        registry.register(path, metrics={"f1": 0.8, "roc_auc": float("nan"), "fit_n_iter": float("inf")})
+        assert registry.get(path)["metrics"] == {"f1": 0.8}
+
+def test_registry_retention_keeps_top_last_and_latest():
+    """
+    Test GC removes only artifacts outside top-K, last-N and `latest`, and `sync` indexes old directories.
+    """
+    with tempfile.TemporaryDirectory() as base_dir:
+        with ArtifactRegistry(base_dir) as registry:
+            paths = [_add_artifact(registry, f1, t) for t, f1 in enumerate([0.9, 0.1, 0.2, 0.3, 0.4, 0.5])]
+            registry.promote(paths[1])
+
+            preview = registry.gc(keep_top_k=1, keep_last=2, dry_run=True)
+            assert all(os.path.exists(p) for p in paths)
+            report = apply_retention(registry, {"enabled": True, "metric": "f1", "keep_top_k": 1, "keep_last": 2})
+
+        assert sorted(report["removed"]) == sorted(preview["removed"])
+        assert sorted(report["removed"]) == sorted(os.path.realpath(p) for p in paths[2:4])
+        assert report["reclaimed_bytes"] > 0
+        assert [os.path.exists(p) for p in paths] == [True, True, False, False, True, True]
+        assert apply_retention(ArtifactRegistry(base_dir), {}) is None
+
+        os.remove(os.path.join(base_dir, "registry.sqlite"))
+        with ArtifactRegistry(base_dir) as registry:
+            assert registry.sync() == 4
+            assert registry.sync() == 0
@@ -0,0 +1,77 @@
+import io
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from src.schema import FeatureSchema, QUARANTINE_COLUMN, schema_path
+
+def make_schema():
+    X = pd.DataFrame({"CRIM": [0.0, 1.0, 4.0], "CHAS": [0, 1, 1], "RM": [4.0, 6.0, 8.0]})
+    return FeatureSchema.from_frame(X, aliases={"rooms": "RM"})
+
+def test_schema_reads_aliases_and_quarantines_bad_rows():
+    """
+    Test headers are matched by alias and case, extra columns are dropped and invalid rows are quarantined.
+    """
+    schema = make_schema()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = schema_path(os.path.join(temp_dir, "model.joblib"))
+        schema.save(path)
+        schema = FeatureSchema.load(path)
+
+    text = ("id,medv,rooms,crim, chas \n"
+            "1,20,6.5,0.5,0\n"
+            "2,21,,0.5,1\n"
+            "3,22,6.0,100.0,0\n"
+            "4,23,6.0,0.5,0.5\n"
+            "5,24,7.0,-0.1,1\n")
+    df = schema.read_csv(io.StringIO(text), keep=["id"])
+    assert list(df.columns) == ["id", "CRIM", "CHAS", "RM"]
+    assert all(df[c].dtype == np.float64 for c in schema.names)
+
+    valid, quarantined = schema.split(df)
+    assert list(valid["id"]) == [1]
+    assert list(quarantined["id"]) == [2, 3, 4, 5]
+    assert list(quarantined[QUARANTINE_COLUMN]) == ["RM", "CRIM", "CHAS", "CRIM"]
+
+    try:
+        schema.read_csv(io.StringIO("CRIM,CHAS\n1,0\n"))
+        assert False, "Expected ValueError"
+    except ValueError as e:
+        assert "RM" in str(e)
+
+def test_schema_chunks_coerce_non_numeric_text():
+    """
+    Test non-numeric values become quarantined rows, keeping source row numbers across chunks.
+    """
+    schema = make_schema()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "samples.csv")
+        rows = [{"CRIM": 0.5, "CHAS": i % 2, "RM": 6.0} for i in range(10)]
+        rows[7]["RM"] = "n/a"
+        pd.DataFrame(rows).to_csv(path, index=False)
+
+        chunks = list(schema.iter_csv(path, chunksize=3))
+        df = pd.concat(chunks)
+        assert list(df.index) == list(range(10))
+        assert df["RM"].dtype == np.float64
+
+        _, quarantined = schema.split(df)
+        assert list(quarantined.index) == [7]
+        assert list(schema.read_csv(path).index) == list(range(10))
+
+def test_schema_from_chunks_matches_whole_frame():
+    """
+    Test the streamed schema equals the one built from the concatenated chunks, and always-missing features stay unbounded.
+    """
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({"x": rng.normal(0, 1, 300), "k": rng.integers(0, 5, 300)})
+    X.loc[7, "x"] = np.nan
+    chunks = [X[i:i + 100] for i in range(0, 300, 100)]
+    assert FeatureSchema.from_chunks(chunks).features == FeatureSchema.from_frame(X).features
+
+    schema = FeatureSchema.from_chunks([X.assign(gap=np.nan)], aliases={"GAP_OLD": "gap"})
+    gap = schema.features[-1]
+    assert gap["min"] is None and gap["max"] is None and gap["nullable"]
+    assert not schema.validate(X.assign(gap=1e9)).any()
+    assert list(schema.resolve_columns(["x", "k", "gap_old"]).values()) == ["x", "k", "gap"]
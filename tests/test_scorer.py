@@ -0,0 +1,61 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from src.data import FittedScaler
+from src.modeling import PreprocessedModel
+from src.scorer import LinearScorer, StackedLinearScorer, export_scorer, load_scorer
+
+
+def _fit_artifact(n_classes=2):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(10, 4, size=(200, 5)), columns=list("abcde"))
+    signal = X["a"] + X["b"] + rng.normal(0, 2, 200)
+    y = np.digitize(signal, np.quantile(signal, np.linspace(0, 1, n_classes + 1)[1:-1]))
+    scaler = FittedScaler.fit(X)
+    clf = LogisticRegression(max_iter=1000).fit(scaler.transform(X), y)
+    return PreprocessedModel(clf, scaler), X
+
+
+def test_scorer_parity_with_sklearn_binary():
+    """
+    Test the exported NumPy scorer reproduces the sklearn artifact on raw features.
+    """
+    artifact, X = _fit_artifact()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "scorer.npz")
+        export_scorer(artifact, path)
+        scorer = load_scorer(path)
+
+    assert scorer.weights.flags["C_CONTIGUOUS"]
+    assert np.allclose(scorer.predict_proba(X.to_numpy()), artifact.predict_proba(X), atol=1e-12)
+    assert list(scorer.predict(X)) == list(artifact.predict(X))
+
+
+def test_scorer_parity_multiclass_and_float32():
+    """
+    Test softmax scoring for multiclass models and the float32 export.
+    """
+    artifact, X = _fit_artifact(n_classes=3)
+    scorer = LinearScorer.from_model(artifact, dtype=np.float32)
+
+    assert scorer.weights.dtype == np.float32
+    assert np.allclose(scorer.predict_proba(X), artifact.predict_proba(X), atol=1e-4)
+    assert (scorer.predict(X) == artifact.predict(X)).mean() > 0.99
+
+
+def test_stacked_scorer_matches_each_model():
+    """
+    Test one stacked matrix multiply reproduces every model, including models over different features.
+    """
+    binary, X = _fit_artifact()
+    multiclass, _ = _fit_artifact(n_classes=3)
+    subset = LinearScorer.from_model(LogisticRegression().fit(X[["c", "a"]], binary.predict(X)))
+    scorers = [LinearScorer.from_model(binary), LinearScorer.from_model(multiclass), subset]
+    stacked = StackedLinearScorer(scorers)
+
+    assert stacked.weights.shape == (5, 1 + 3 + 1)
+    for scorer, (preds, proba) in zip(scorers, stacked.score(X)):
+        assert np.array_equal(preds, scorer.predict(X))
+        assert np.allclose(proba, scorer.predict_proba(X), atol=1e-12)
@@ -0,0 +1,40 @@
+import pytest
+import numpy as np
+from src.search import expand_search_space, run_search, best_result, refit_candidate
+
+
+def test_expand_grid_and_random_space():
+    """
+    Test grid and random expansion of the search space.
+    """
+    grid = expand_search_space({"strategy": "grid", "space": {"C": [0.1, 1.0, 10.0], "penalty": ["l1", "l2"]}})
+    assert len(grid) == 6
+    assert {"C": 0.1, "penalty": "l1"} in grid
+
+    sampled = expand_search_space({"strategy": "random", "n_iter": 5,
+                                   "space": {"C": {"low": 0.001, "high": 100, "log": True}, "penalty": ["l2"]}}, seed=0)
+    assert len(sampled) == 5
+    assert all(0.001 <= c["C"] <= 100 for c in sampled)
+
+    with pytest.raises(ValueError):
+        expand_search_space({"strategy": "bayes", "space": {"C": [1.0]}})
+
+
+def test_run_search_in_parallel():
+    """
+    Test that candidates are cross-validated on a pool, keep their order and failures are reported, not raised.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4))
+    y = (X[:, 0] + 0.5 * rng.normal(size=300) > 0).astype(int)
+    candidates = [{"C": 1e-6, "penalty": "l1"}, {"C": 1.0}, {"C": -1.0}]
+
+    results = run_search(candidates, {"solver": "liblinear"}, 42, X, y, n_splits=3, n_jobs=2)
+
+    assert [r["params"] for r in results] == candidates
+    assert results[2]["error"] is not None
+    assert {"accuracy_mean", "accuracy_std", "roc_auc_mean"} <= set(results[1]["metrics"])
+    best = best_result(results, metric="accuracy")
+    assert best["params"] == {"C": 1.0}
+    model = refit_candidate(best["params"], {"solver": "liblinear"}, 42, X, y)
+    assert model.predict(X[:5]).shape == (5,)
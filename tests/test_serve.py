@@ -0,0 +1,160 @@
+import os
+import json
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from src.io_utils import save_model
+from src.model_holder import ModelHolder
+from src.prediction_cache import PredictionCache
+from src.serve import MicroBatcher, ServingStats, serve
+
+
+def test_micro_batcher_groups_concurrent_requests(toy_model):
+    """
+    Test that concurrent submissions are scored in fewer model calls and split back correctly.
+    """
+    model = toy_model
+    batcher = MicroBatcher(model, max_batch_size=100, max_wait_ms=200).start()
+    try:
+        rows = [[{"a": 0.3 * i, "b": i % 2}] for i in range(10)]
+        futures = [batcher.submit(r) for r in rows]
+        results = [f.result(timeout=5) for f in futures]
+    finally:
+        batcher.stop()
+
+    expected = model.predict(pd.DataFrame([r[0] for r in rows]))
+    assert [r["predictions"][0] for r in results] == list(expected)
+    assert all(len(r["probabilities"][0]) == 2 for r in results)
+    assert batcher.stats.batches < 10
+
+
+def test_micro_batcher_isolates_bad_requests(toy_model):
+    """
+    Test that a malformed request fails alone instead of failing the whole batch.
+    """
+    batcher = MicroBatcher(toy_model, max_batch_size=100, max_wait_ms=200).start()
+    try:
+        good = batcher.submit([{"a": 1.0, "b": 0.0}])
+        bad = batcher.submit([{"c": 1.0}])
+        assert len(good.result(timeout=5)["predictions"]) == 1
+        assert bad.exception(timeout=5) is not None
+    finally:
+        batcher.stop()
+
+
+def test_micro_batcher_survives_cache_switch_errors(toy_model, monkeypatch):
+    """
+    Test that a failing checksum or cache switch bypasses the cache instead of killing the batching thread.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model_path = os.path.join(temp_dir, "model.joblib")
+        save_model(toy_model, model_path)
+        cache = PredictionCache("otro", 100)
+        batcher = MicroBatcher(ModelHolder(model_path, poll_interval=0), max_wait_ms=1, cache=cache).start()
+        try:
+            def missing(path):
+                raise FileNotFoundError(path)
+
+            monkeypatch.setattr("src.serve.model_checksum", missing)
+            assert len(batcher.submit([{"a": 1.0, "b": 0.0}]).result(timeout=5)["predictions"]) == 1
+            assert cache.checksum.startswith("version:")
+
+            def fail(checksum):
+                raise RuntimeError("disco lleno")
+
+            batcher._cache_version = None
+            monkeypatch.setattr(cache, "ensure_model", fail)
+            assert len(batcher.submit([{"a": 2.0, "b": 0.0}]).result(timeout=5)["predictions"]) == 1
+            assert batcher._thread.is_alive()
+        finally:
+            batcher.stop()
+
+
+def test_serving_stats_snapshot():
+    """
+    Test percentile and histogram reporting.
+    """
+    stats = ServingStats()
+    for ms in range(1, 101):
+        stats.record_request(ms / 1000)
+    for n in [1, 3, 3, 64]:
+        stats.record_batch(n)
+
+    snapshot = stats.snapshot()
+    assert snapshot["requests"] == 100
+    assert 49 <= snapshot["latency_ms"]["p50"] <= 51
+    assert snapshot["batch_size_histogram"] == {"<=1": 1, "<=4": 2, "<=64": 1}
+
+
+def test_http_server_predict_and_stats(toy_model):
+    """
+    Test the HTTP endpoints on localhost.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model_path = os.path.join(temp_dir, "model.joblib")
+        save_model(toy_model, model_path)
+        server = serve(model_path, port=0, max_batch_size=8, max_wait_ms=20)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_port}"
+
+        def post(i):
+            body = json.dumps({"rows": [{"a": 0.5 * i, "b": 1.0}]}).encode()
+            request = urllib.request.Request(f"{url}/predict", data=body, headers={"Content-Type": "application/json"})
+            with urllib.request.urlopen(request) as response:
+                return json.loads(response.read())
+
+        try:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(pool.map(post, range(8)))
+            with urllib.request.urlopen(f"{url}/stats") as response:
+                stats = json.loads(response.read())
+        finally:
+            server.shutdown()
+            server.server_close()
+            server.batcher.stop()
+            server.batcher.model.stop()
+
+        assert all(len(r["predictions"]) == 1 for r in results)
+        assert stats["requests"] == 8
+        assert stats["latency_ms"]["p99"] is not None
+
+
+def test_http_server_reports_stalled_batcher(toy_model):
+    """
+    Test that a slow batch answers 504 and a dead batching thread turns `/health` into 503.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model_path = os.path.join(temp_dir, "model.joblib")
+        save_model(toy_model, model_path)
+        server = serve(model_path, port=0, reload_interval=0, request_timeout=0.2)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_port}"
+        release = threading.Event()
+        process = server.batcher._process
+        server.batcher._process = lambda batch: (release.wait(5), process(batch))
+
+        def status(request):
+            try:
+                with urllib.request.urlopen(request) as response:
+                    return response.status
+            except urllib.error.HTTPError as e:
+                return e.code
+
+        try:
+            body = json.dumps({"rows": [{"a": 1.0, "b": 0.0}]}).encode()
+            assert status(urllib.request.Request(f"{url}/predict", data=body)) == 504
+            assert status(f"{url}/health") == 200
+            release.set()
+            server.batcher.stop()
+            assert status(f"{url}/health") == 503
+            assert status(urllib.request.Request(f"{url}/predict", data=body)) == 503
+        finally:
+            release.set()
+            server.shutdown()
+            server.server_close()
+            server.batcher.stop()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from src.data import train_test_split_xy, remove_outliers
+from src.stage_cache import StageCache, frame_digest
+
+
+def _data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(200, 3)), columns=["a", "b", "c"])
+    y = pd.Series(rng.integers(0, 2, 200), name="MEDV")
+    return X, y
+
+
+def test_stage_cache_hit_miss_and_params():
+    """
+    Test that unchanged stages are loaded from disk and parameter changes recompute them.
+    """
+    X, y = _data()
+    with tempfile.TemporaryDirectory() as root:
+        cache = StageCache(root)
+        data_key = frame_digest(X, y)
+        first, key = cache.run("split", train_test_split_xy, (X, y), {"test_size": 0.25, "seed": 1}, [data_key])
+        assert cache.report["split"] == "miss"
+
+        second, same_key = cache.run("split", train_test_split_xy, (X, y), {"test_size": 0.25, "seed": 1}, [data_key])
+        assert cache.report["split"] == "hit"
+        assert same_key == key
+        for a, b in zip(first, second):
+            assert list(a.index) == list(b.index)
+            assert np.array_equal(a.to_numpy(), b.to_numpy())
+        assert second[2].name == "MEDV"
+
+        cache.run("split", train_test_split_xy, (X, y), {"test_size": 0.3, "seed": 1}, [data_key])
+        assert cache.report["split"] == "miss"
+
+        disabled = StageCache(root, enabled=False)
+        disabled.run("outliers", remove_outliers, (X, y), {"contamination": 0.1}, [data_key])
+        assert disabled.report["outliers"] == "disabled"
+
+
+def test_stage_cache_lru_eviction():
+    """
+    Test that the least recently used entries are evicted beyond the size bound.
+    """
+    X, y = _data()
+    with tempfile.TemporaryDirectory() as root:
+        cache = StageCache(root, max_bytes=10**9)
+        for seed in range(3):
+            cache.run("split", train_test_split_xy, (X, y), {"test_size": 0.25, "seed": seed}, ["k"])
+        entry_size = sum(os.path.getsize(os.path.join(r, f)) for r, _, fs in os.walk(root) for f in fs) // 3
+
+        cache.run("split", train_test_split_xy, (X, y), {"test_size": 0.25, "seed": 0}, ["k"])
+        cache.max_bytes = int(entry_size * 2.5)
+        assert cache.evict() == 1
+
+        cache.run("split", train_test_split_xy, (X, y), {"test_size": 0.25, "seed": 0}, ["k"])
+        assert cache.report["split"] == "hit"
+        cache.run("split", train_test_split_xy, (X, y), {"test_size": 0.25, "seed": 1}, ["k"])
+        assert cache.report["split"] == "miss"
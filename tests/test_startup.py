@@ -0,0 +1,33 @@
+import os
+import sys
+import tempfile
+import subprocess
+from benchmarks.bench_startup import check_budget, ROOT_DIR
+
+
+def test_entry_points_within_startup_budget():
+    """
+    Test that the CLI entry points import within budget and without heavy dependencies.
+    """
+    assert check_budget() == []
+
+
+def test_loading_artifact_does_not_import_training_stack(toy_frame, toy_model):
+    """
+    Test that unpickling a saved model does not pull in mlflow or sklearn's dataset/outlier modules.
+    """
+    from src.data import FittedScaler
+    from src.modeling import PreprocessedModel
+    from src.io_utils import save_model
+
+    artifact = PreprocessedModel(toy_model, FittedScaler.fit(toy_frame))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model_path = os.path.join(temp_dir, "model.joblib")
+        save_model(artifact, model_path)
+        code = ("import sys; from src.io_utils import load_model; "
+                f"load_model({model_path!r}); "
+                "print(','.join(m for m in ['mlflow', 'sklearn.datasets', 'sklearn.covariance'] if m in sys.modules))")
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ""
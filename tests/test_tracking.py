@@ -0,0 +1,87 @@
+import os
+import tempfile
+import threading
+import pytest
+import mlflow
+from mlflow.tracking import MlflowClient
+from src.tracking import RunLogger, logged_run
+
+class RecordingClient:
+    """
+    Fake tracking client that records the requests it receives.
+    """
+    def __init__(self, fail_artifacts=False):
+        self.calls = []
+        self.threads = set()
+        self.fail_artifacts = fail_artifacts
+
+    def log_batch(self, run_id, metrics=(), params=(), tags=()):
+        self.threads.add(threading.current_thread().name)
+        self.calls.append(("batch", [m.key for m in metrics], [p.key for p in params], [t.key for t in tags]))
+
+    def log_artifact(self, run_id, local_path, artifact_path=None):
+        if self.fail_artifacts:
+            raise IOError("upload failed")
+        self.calls.append(("artifact", os.path.basename(local_path)))
+
+def test_run_logger_batches_in_order():
+    """
+    Test that buffered values are batched and sent in logging order, within the API limits.
+    """
+    client = RecordingClient()
+    logger = RunLogger("run", client=client)
+    logger.log_params({f"p{i}": i for i in range(150)})
+    logger.log_metric("m0", 1.0)
+    logger.log_artifact("/tmp/model.joblib")
+    logger.set_tag("t", "x")
+    logger.close()
+
+    assert [c[0] for c in client.calls] == ["batch", "batch", "artifact", "batch"]
+    assert len(client.calls[0][2]) == 100 and client.calls[0][1] == ["m0"]
+    assert client.calls[1][2] == [f"p{i}" for i in range(100, 150)]
+    assert client.calls[3][3] == ["t"]
+    assert all(name.startswith("mlflow-logger") for name in client.threads)
+
+def test_run_logger_raises_failed_uploads():
+    """
+    Test that a failed background upload is reported on close.
+    """
+    logger = RunLogger("run", client=RecordingClient(fail_artifacts=True))
+    logger.log_artifact("/tmp/model.joblib")
+    with pytest.raises(IOError):
+        logger.close()
+
+def test_logged_run_flushes_to_file_store(monkeypatch):
+    """
+    Test that everything reaches a local file store, also when the run body fails.
+    """
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        mlflow.set_tracking_uri(f"file:{temp_dir}/mlruns")
+        try:
+            mlflow.set_experiment("test_tracking")
+            artifact = os.path.join(temp_dir, "model.txt")
+            with open(artifact, "w") as f:
+                f.write("model")
+
+            with logged_run("ok") as logger:
+                logger.log_params({"C": 1.0})
+                logger.log_metrics({"f1": 0.5})
+                logger.log_artifact(artifact, artifact_path="model")
+                ok_id = logger.run_id
+
+            with pytest.raises(RuntimeError):
+                with logged_run("failed") as logger:
+                    logger.log_metrics({"accuracy": 0.25})
+                    failed_id = logger.run_id
+                    raise RuntimeError("boom")
+
+            client = MlflowClient()
+            ok = client.get_run(ok_id)
+            failed = client.get_run(failed_id)
+            assert ok.data.params == {"C": "1.0"} and ok.data.metrics == {"f1": 0.5}
+            assert [a.path for a in client.list_artifacts(ok_id, "model")] == ["model/model.txt"]
+            assert failed.data.metrics == {"accuracy": 0.25}
+            assert failed.info.status == "FAILED"
+        finally:
+            mlflow.set_tracking_uri("")
@@ -0,0 +1,17 @@
+import numpy as np
+from src.data import load_data
+from src.validation import cross_validate
+
+
+def test_cross_validate_reports_mean_and_std():
+    """
+    Test parallel k-fold cross-validation of the training pipeline.
+    """
+    X, y = load_data()
+
+    fold_metrics, summary = cross_validate(X, y, {"max_iter": 1000, "solver": "liblinear"}, n_splits=3, n_jobs=2)
+
+    assert len(fold_metrics) == 3
+    assert set(summary) == {f"{m}_{s}" for m in ["accuracy", "precision", "recall", "f1", "roc_auc"] for s in ["mean", "std"]}
+    assert 0.7 < summary["accuracy_mean"] <= 1
+    assert np.isclose(summary["roc_auc_mean"], np.mean([m["roc_auc"] for m in fold_metrics]))